@@ -0,0 +1,82 @@
+"""Oluşturulan planlar için vektörel adalet analizleri.
+
+Tüm hesaplar PlanTable'ın kod dizileri üzerinde NumPy ile yapılır; Python
+döngüsü yalnızca katılımcı / sektör sayısı kadardır, hücre sayısı kadar değil.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from roster_table import EMPTY, PlanTable
+
+
+@dataclass
+class PlanAnalytics:
+    """Plan analizi sonuçları.
+
+    per_participant: katılımcı başına Görev / Ardışık / Boşluk sütunları
+    coverage: katılımcı x sektör görev sayıları
+    """
+    per_participant: pd.DataFrame
+    coverage: pd.DataFrame
+    gini: float
+    load_variance: float
+    coverage_variance: float
+
+
+def gini_coefficient(values):
+    """Negatif olmayan değerler için Gini katsayısı (0 = tam eşit dağılım)."""
+    x = np.sort(np.asarray(values, dtype=np.float64))
+    n = len(x)
+    total = x.sum()
+    if n == 0 or total == 0:
+        return 0.0
+    ranks = np.arange(1, n + 1)
+    return float(2.0 * np.dot(ranks, x) / (n * total) - (n + 1.0) / n)
+
+
+def presence_matrix(table: PlanTable):
+    """gün x zaman x katılımcı boyutlu bool dizi: katılımcı o gün o saatte görevli mi.
+
+    Zaman aralıkları tablodaki kategori sırasını izler (PlanTable.from_rows'a
+    timeslots verildiyse arayüzdeki sıra).
+    """
+    n_days, n_slots, n_parts = len(table.days), len(table.slots), len(table.participants)
+    presence = np.zeros(n_days * n_slots * n_parts, dtype=bool)
+    mask = table.assignments != EMPTY
+    row_idx = np.nonzero(mask)[0]
+    cell_base = (table.day_codes.astype(np.int64) * n_slots + table.slot_codes) * n_parts
+    presence[cell_base[row_idx] + table.assignments[mask]] = True
+    return presence.reshape(n_days, n_slots, n_parts)
+
+
+def plan_analytics(table: PlanTable) -> PlanAnalytics:
+    """Katılımcı yükü, sektör kapsama matrisi, Gini / varyans, ardışık görev ve boşluk sayıları."""
+    counts = table.board_counts()
+    load = counts.sum(axis=1)
+
+    presence = presence_matrix(table)
+    # Aynı gün arka arkaya iki zaman aralığında görev
+    back_to_back = (presence[:, 1:, :] & presence[:, :-1, :]).sum(axis=(0, 1))
+
+    # Gün içinde ilk ve son görev arasındaki boş zaman aralıkları
+    n_slots = presence.shape[1]
+    worked = presence.sum(axis=1)
+    first = presence.argmax(axis=1)
+    last = n_slots - 1 - presence[:, ::-1, :].argmax(axis=1)
+    idle_gaps = np.where(worked > 0, last - first + 1 - worked, 0).sum(axis=0)
+
+    per_participant = pd.DataFrame(
+        {"Görev": load, "Ardışık": back_to_back, "Boşluk": idle_gaps},
+        index=pd.Index(table.participants, name="Katılımcı"),
+    )
+    coverage = pd.DataFrame(counts, index=pd.Index(table.participants, name="Katılımcı"),
+                            columns=table.boards)
+    return PlanAnalytics(
+        per_participant=per_participant,
+        coverage=coverage,
+        gini=gini_coefficient(load),
+        load_variance=float(np.var(load)) if len(load) else 0.0,
+        coverage_variance=float(np.var(counts)) if counts.size else 0.0,
+    )
@@ -0,0 +1,235 @@
+"""Atama yöntemleri, senaryo genişletme ve Excel dışa aktarma için kıyaslama (benchmark) aracı.
+
+Sentetik roster yapılandırmalarını (katılımcı x sektör x senaryo) bir boyut
+ızgarası üzerinde üretir; her ölçüm için süre, en yüksek bellek kullanımı ve
+adalet hedefini (fairness_objective) kaydeder. Sonuçlar JSON olarak yazılır;
+kayıtlı bir temel ölçüme (baseline) göre yavaşlayan ölçümler işaretlenir.
+Ölçümden önce küçük doğruluk denetimleri (check_horizon) çalışır; biri
+başarısız olursa çıkış kodu 1'dir. Streamlit gerektirmez.
+
+Kullanım::
+
+    python roster_bench.py -o bench.json
+    python roster_bench.py --quick --baseline bench_baseline.json
+    python roster_bench.py --baseline bench_baseline.json --update-baseline
+"""
+import argparse
+import itertools
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from io import BytesIO
+
+import numpy as np
+
+from roster_engine import (ASSIGNMENT_METHODS, PlanConfig, RosterError, count_matrix, expand_scenarios,
+                           fairness_objective, objective_from_counts, plan_horizon)
+from roster_export import write_roster_workbook
+
+DAYS = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar"]
+TIMESLOTS = ["09:00-10:00", "10:30-11:30", "13:00-14:00", "14:30-15:30"]
+
+# (katılımcı, sektör, senaryo satırı) boyut ızgaraları
+DEFAULT_GRID = ([20, 100, 300], [9, 50, 200], [28, 200])
+QUICK_GRID = ([12, 40], [9, 20], [28])
+
+# Bu süreden kısa ölçümler gürültü sayılır ve gerileme olarak işaretlenmez (sn)
+MIN_REGRESSION_SECONDS = 0.005
+
+
+def synthetic_config(n_parts, n_boards, n_rows, seed=0):
+    """Sentetik yapılandırma: (katılımcılar, sektörler, senaryolar); senaryolar toplam n_rows satıra genişler."""
+    rng = random.Random(seed)
+    participants = [f"ATC{i}" for i in range(1, n_parts + 1)]
+    boards = [f"S{i:03d}" for i in range(n_boards)]
+    scenarios = []
+    remaining = n_rows
+    while remaining > 0:
+        rep = min(remaining, rng.randint(1, 4))
+        scenarios.append([f"Senaryo {len(scenarios) % 12}", rng.choice(DAYS), rng.choice(TIMESLOTS), rep])
+        remaining -= rep
+    return participants, boards, scenarios
+
+
+def measure(func, repeat):
+    """func'ı çalıştırır; (sonuç, en iyi süre, en yüksek bellek baytı) döndürür.
+
+    Süre, tracemalloc kapalıyken yapılan repeat çalıştırmanın en kısasıdır;
+    bellek ayrı bir çalıştırmada tracemalloc ile ölçülür.
+    """
+    best = float("inf")
+    result = None
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result, best, peak
+
+
+def run_grid(grid, repeat=1, methods=None, export=True):
+    """Izgaradaki her boyut için tüm ölçümleri yapar; sonuç kayıtlarının listesini döndürür."""
+    methods = methods or list(ASSIGNMENT_METHODS)
+    results = []
+    for n_parts, n_boards, n_rows in itertools.product(*grid):
+        participants, boards, scenarios = synthetic_config(n_parts, n_boards, n_rows)
+        size = {"participants": n_parts, "boards": n_boards, "scenarios": n_rows}
+
+        expanded, seconds, peak = measure(lambda: expand_scenarios(scenarios, DAYS, TIMESLOTS), repeat)
+        results.append({"bench": "expand_sort", **size, "seconds": seconds, "peak_bytes": peak})
+
+        plan_rows = None
+        for method in methods:
+            assign = ASSIGNMENT_METHODS[method]
+
+            def run():
+                random.seed(0)
+                return assign(expanded, participants, boards)
+
+            record = {"bench": f"assign:{method}", **size}
+            try:
+                rows, seconds, peak = measure(run, repeat)
+            except RosterError as exc:
+                record["error"] = str(exc)
+            else:
+                record.update(seconds=seconds, peak_bytes=peak,
+                              fairness=fairness_objective(rows, participants, boards))
+                plan_rows = plan_rows or rows
+            results.append(record)
+            print(_format_record(record), file=sys.stderr)
+
+        if export and plan_rows is not None:
+            _, seconds, peak = measure(
+                lambda: write_roster_workbook(BytesIO(), plan_rows, boards, participants), repeat)
+            record = {"bench": "export_xlsx", **size, "seconds": seconds, "peak_bytes": peak}
+            results.append(record)
+            print(_format_record(record), file=sys.stderr)
+    return results
+
+
+def _record_key(record):
+    return (record["bench"], record["participants"], record["boards"], record["scenarios"])
+
+
+def _format_record(record):
+    size = f"P={record['participants']} B={record['boards']} S={record['scenarios']}"
+    if "error" in record:
+        return f"{record['bench']:<36} {size:<24} atlandı: {record['error']}"
+    fairness = f" fairness={record['fairness']:.3f}" if "fairness" in record else ""
+    return (f"{record['bench']:<36} {size:<24} {record['seconds'] * 1000:9.1f} ms "
+            f"{record['peak_bytes'] / 1e6:8.2f} MB{fairness}")
+
+
+def find_regressions(results, baseline, tolerance):
+    """Temel ölçüme göre süresi (1 + tolerance) katından fazla artan kayıtları döndürür."""
+    base_index = {_record_key(r): r for r in baseline if "seconds" in r}
+    regressions = []
+    for record in results:
+        base = base_index.get(_record_key(record))
+        if base is None or "seconds" not in record:
+            continue
+        slower = record["seconds"] > base["seconds"] * (1 + tolerance)
+        if slower and record["seconds"] - base["seconds"] > MIN_REGRESSION_SECONDS:
+            regressions.append({**record, "baseline_seconds": base["seconds"],
+                                "ratio": record["seconds"] / base["seconds"]})
+    return regressions
+
+
+def check_horizon(methods=("Balanced", "Optimal"), weeks=4):
+    """Geçmiş sayaçlı yöntemlerde çok haftalık planın doğruluk denetimi; hata mesajları listesi döndürür.
+
+    Tek sektörlü ve çok sektörlü yapılandırmalarda, haftaların bildirdiği
+    kümülatif adalet hedefi satırlardan yeniden hesaplanan değerle
+    karşılaştırılır ve başlangıç history matrisinin değişmediği denetlenir.
+    (Tek sektörde sayaç dizileri history'nin görünümü olursa atamalar
+    history'yi şişirir ve sonraki haftalar yanlış planlanır.)
+    """
+    failures = []
+    for method, n_boards in itertools.product(methods, (1, 3)):
+        participants = [f"ATC{i}" for i in range(1, 4)]
+        boards = [f"S{i:03d}" for i in range(n_boards)]
+        config = PlanConfig(participants=participants, boards=boards,
+                            scenarios=[["Senaryo 0", DAYS[0], TIMESLOTS[0], 2]],
+                            days_of_week=DAYS, timeslots=TIMESLOTS, method=method)
+        history = np.zeros((len(participants), n_boards), dtype=np.int64)
+        counts = history.copy()
+        for result in plan_horizon(config, weeks, history=history):
+            counts += count_matrix(result.rows, participants, boards)
+            expected = objective_from_counts(counts)
+            if abs(result.objective - expected) > 1e-9:
+                failures.append(f"{method}, {n_boards} sektör, hafta {result.week + 1}: hedef "
+                                f"{result.objective:.3f}, beklenen {expected:.3f}")
+                break
+        if history.any():
+            failures.append(f"{method}, {n_boards} sektör: başlangıç history matrisi değişti")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Roster atama yöntemleri ve dışa aktarma kıyaslaması.")
+    parser.add_argument("-o", "--output", help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--quick", action="store_true", help="Küçük boyut ızgarası kullan")
+    parser.add_argument("--participants", type=int, nargs="+", help="Katılımcı sayıları")
+    parser.add_argument("--boards", type=int, nargs="+", help="Sektör sayıları")
+    parser.add_argument("--scenarios", type=int, nargs="+", help="Senaryo satırı sayıları")
+    parser.add_argument("--methods", nargs="+", choices=list(ASSIGNMENT_METHODS), help="Ölçülecek yöntemler")
+    parser.add_argument("--repeat", type=int, default=3, help="Süre ölçümü tekrar sayısı (en iyisi alınır)")
+    parser.add_argument("--no-export", action="store_true", help="Excel dışa aktarmayı ölçme")
+    parser.add_argument("--baseline", help="Karşılaştırılacak temel ölçüm JSON dosyası")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Gerileme eşiği (0.25 = %%25 daha yavaş)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Sonuçları --baseline dosyasına temel ölçüm olarak yaz")
+    args = parser.parse_args(argv)
+
+    failures = check_horizon()
+    for failure in failures:
+        print(f"DENETİM: {failure}", file=sys.stderr)
+
+    grid = QUICK_GRID if args.quick else DEFAULT_GRID
+    grid = (args.participants or grid[0], args.boards or grid[1], args.scenarios or grid[2])
+    results = run_grid(grid, repeat=args.repeat, methods=args.methods, export=not args.no_export)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+        "check_failures": failures,
+    }
+
+    regressions = []
+    if args.baseline and not args.update_baseline:
+        try:
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)["results"]
+        except (OSError, ValueError, KeyError) as exc:
+            print(f"Temel ölçüm okunamadı: {exc}", file=sys.stderr)
+            return 2
+        regressions = find_regressions(results, baseline, args.tolerance)
+        report["regressions"] = regressions
+        for r in regressions:
+            print(f"GERİLEME: {_format_record(r)} (temel: {r['baseline_seconds'] * 1000:.1f} ms, "
+                  f"x{r['ratio']:.2f})", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.baseline and args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    return 1 if regressions or failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
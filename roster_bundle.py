@@ -0,0 +1,196 @@
+"""Katılımcı başına kişisel program dosyaları ve bunların tek bir zip paketine akıtılması.
+
+Her katılımcı için planındaki görevlerden bir Excel (veya CSV) dosyası ve
+gün / zaman aralığı metinlerinden üretilen bir iCalendar (.ics) dosyası
+oluşturulur. Dosyalar bir süreç havuzunda paralel üretilir ve hazır oldukça
+zip arşivine yazılır; süreçler arası yalnızca katılımcının kendi görevleri
+ve üretilen baytlar taşınır.
+"""
+import csv
+import hashlib
+import io
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import openpyxl
+
+from roster_table import PlanTable
+
+ZIP_MIME = "application/zip"
+BUNDLE_FORMATS = ("xlsx", "csv")
+
+SCHEDULE_HEADERS = ["Tarih", "Gün", "Zaman", "Senaryo", "Sektör"]
+
+# "09:00-10:00", "9.00 - 10.30", "0900-1000" gibi zaman aralıkları
+TIMESLOT_PATTERN = re.compile(r"^\s*(\d{1,2})[:.]?(\d{2})\s*[-–]\s*(\d{1,2})[:.]?(\d{2})\s*$")
+
+# Bu sayıdan az katılımcı için süreç havuzu açılmaz
+MIN_PARALLEL_PARTICIPANTS = 32
+
+
+def parse_timeslot(slot):
+    """"HH:MM-HH:MM" biçimindeki zaman aralığını ((saat, dakika), (saat, dakika)) olarak döndürür.
+
+    Çözümlenemeyen metinlerde None döner.
+    """
+    match = TIMESLOT_PATTERN.match(str(slot))
+    if not match:
+        return None
+    h1, m1, h2, m2 = (int(g) for g in match.groups())
+    if h1 > 23 or h2 > 24 or m1 > 59 or m2 > 59:
+        return None
+    return (h1, m1), (h2, m2)
+
+
+def participant_schedules(plan_data, boards, participants):
+    """Plan satırlarını katılımcılara göre gruplar: {katılımcı: [(gün, zaman, senaryo, sektör), ...]}.
+
+    Listede olmayan katılımcılar ve boş hücreler atlanır; görevler plan
+    sırasını korur.
+    """
+    schedules = {p: [] for p in participants}
+    if isinstance(plan_data, PlanTable):
+        boards = plan_data.boards
+    for (day, slot, sc_name, assigned) in plan_data:
+        for b_name, p in zip(boards, assigned):
+            entries = schedules.get(p)
+            if entries is not None:
+                entries.append((day, slot, sc_name, b_name))
+    return schedules
+
+
+def _entry_date(day, week_start, day_index):
+    offset = day_index.get(day)
+    return None if offset is None else week_start + timedelta(days=offset)
+
+
+def schedule_csv(entries, week_start, days_of_week):
+    """Kişisel programı CSV baytları olarak döndürür (Excel için UTF-8 BOM'lu)."""
+    day_index = {d: i for i, d in enumerate(days_of_week)}
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(SCHEDULE_HEADERS)
+    for day, slot, sc_name, board in entries:
+        entry_date = _entry_date(day, week_start, day_index)
+        writer.writerow([entry_date.isoformat() if entry_date else "", day, slot, sc_name, board])
+    return buffer.getvalue().encode("utf-8-sig")
+
+
+def schedule_xlsx(entries, week_start, days_of_week):
+    """Kişisel programı yalnızca-yazma kipindeki bir çalışma kitabı olarak döndürür."""
+    day_index = {d: i for i, d in enumerate(days_of_week)}
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Program")
+    ws.append(SCHEDULE_HEADERS)
+    for day, slot, sc_name, board in entries:
+        ws.append([_entry_date(day, week_start, day_index), day, slot, sc_name, board])
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+def _ical_escape(text):
+    return (str(text).replace("\\", "\\\\").replace(";", "\\;")
+            .replace(",", "\\,").replace("\n", "\\n"))
+
+
+def schedule_ical(participant, entries, week_start, days_of_week, stamp=None):
+    """Kişisel programı iCalendar (RFC 5545) metni olarak döndürür.
+
+    Günün tarihi week_start + days_of_week içindeki sırasıdır. Zaman aralığı
+    çözümlenemeyen görevler tüm gün etkinliği olur, gece yarısını aşan
+    aralıklar ertesi gün biter. Listede olmayan günlerdeki görevler
+    takvime eklenmez. Saatler yerel (floating) saattir; DTSTAMP ise RFC 5545
+    gereği UTC'dir (stamp saat dilimsizse yerel saat kabul edilip çevrilir).
+    """
+    day_index = {d: i for i, d in enumerate(days_of_week)}
+    stamp = (stamp or datetime.now()).astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//Roster Planlama//TR", "CALSCALE:GREGORIAN",
+             f"X-WR-CALNAME:{_ical_escape(participant)}"]
+    for seq, (day, slot, sc_name, board) in enumerate(entries):
+        entry_date = _entry_date(day, week_start, day_index)
+        if entry_date is None:
+            continue
+        uid_source = f"{participant}|{entry_date.isoformat()}|{slot}|{sc_name}|{board}|{seq}"
+        uid = hashlib.blake2b(uid_source.encode("utf-8"), digest_size=12).hexdigest()
+        lines += ["BEGIN:VEVENT", f"UID:{uid}@roster", f"DTSTAMP:{stamp}",
+                  f"SUMMARY:{_ical_escape(f'{board} - {sc_name}')}",
+                  f"DESCRIPTION:{_ical_escape(f'{day} {slot}')}"]
+        times = parse_timeslot(slot)
+        if times is None:
+            lines += [f"DTSTART;VALUE=DATE:{entry_date:%Y%m%d}",
+                      f"DTEND;VALUE=DATE:{entry_date + timedelta(days=1):%Y%m%d}"]
+        else:
+            (h1, m1), (h2, m2) = times
+            start = datetime.combine(entry_date, datetime.min.time()) + timedelta(hours=h1, minutes=m1)
+            end = datetime.combine(entry_date, datetime.min.time()) + timedelta(hours=h2, minutes=m2)
+            if end <= start:
+                end += timedelta(days=1)
+            lines += [f"DTSTART:{start:%Y%m%dT%H%M%S}", f"DTEND:{end:%Y%m%dT%H%M%S}"]
+        lines.append("END:VEVENT")
+    lines.append("END:VCALENDAR")
+    return ("\r\n".join(lines) + "\r\n").encode("utf-8")
+
+
+def safe_filename(name):
+    """Katılımcı adını dosya adında kullanılabilir hale getirir."""
+    cleaned = re.sub(r"[^\w.-]+", "_", str(name), flags=re.UNICODE).strip("._")
+    return cleaned or "katilimci"
+
+
+def render_participant(job):
+    """Tek bir katılımcının dosyalarını üretir; [(zip içi yol, baytlar), ...] döndürür.
+
+    Süreç havuzunda çalıştığı için modül düzeyinde tanımlıdır.
+    """
+    participant, base_name, entries, week_start, days_of_week, fmt, include_ical = job
+    if fmt == "csv":
+        files = [(f"{base_name}/{base_name}.csv", schedule_csv(entries, week_start, days_of_week))]
+    else:
+        files = [(f"{base_name}/{base_name}.xlsx", schedule_xlsx(entries, week_start, days_of_week))]
+    if include_ical:
+        files.append((f"{base_name}/{base_name}.ics",
+                      schedule_ical(participant, entries, week_start, days_of_week)))
+    return files
+
+
+def write_participant_bundle(stream, plan_data, boards, participants, week_start, days_of_week,
+                             fmt="xlsx", include_ical=True, workers=None):
+    """Her katılımcı için kişisel program dosyalarını zip arşivi olarak stream'e yazar.
+
+    Dosyalar bir süreç havuzunda üretilir ve sırayla geldikçe arşive eklenir;
+    katılımcı sayısı MIN_PARALLEL_PARTICIPANTS'tan azsa veya workers=1 ise
+    ana süreçte üretilir. Aynı dosya adına düşen katılımcılara sıra numarası
+    eklenir. Arşive yazılan katılımcı sayısını döndürür.
+    """
+    if fmt not in BUNDLE_FORMATS:
+        raise ValueError(f"Bilinmeyen biçim: {fmt}")
+    schedules = participant_schedules(plan_data, boards, participants)
+
+    used_names = set()
+    jobs = []
+    for p, entries in schedules.items():
+        base_name = safe_filename(p)
+        if base_name in used_names:
+            base_name = f"{base_name}_{len(jobs) + 1}"
+        used_names.add(base_name)
+        jobs.append((p, base_name, entries, week_start, list(days_of_week), fmt, include_ical))
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs) or 1))
+    with zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        if workers == 1 or len(jobs) < MIN_PARALLEL_PARTICIPANTS:
+            _write_files(archive, map(render_participant, jobs))
+        else:
+            chunksize = max(1, len(jobs) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                _write_files(archive, pool.map(render_participant, jobs, chunksize=chunksize))
+    return len(jobs)
+
+
+def _write_files(archive, results):
+    for files in results:
+        for path, data in files:
+            archive.writestr(path, data)
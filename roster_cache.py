@@ -0,0 +1,175 @@
+"""Plan sonuçları için yapılandırma özetine dayalı, boyutu sınırlı LRU önbellek.
+
+Anahtar, yapılandırmanın (katılımcılar, sektörler, senaryolar, günler,
+zaman aralıkları, yöntem, tohum, ...) kanonik JSON gösteriminin özetidir.
+Tohumsuz Random planlarda tohum yapılandırma özetinden türetilir; böylece
+aynı yapılandırma her zaman aynı planı verir. Önbellek isteğe bağlı olarak
+bir dizinde JSON dosyaları halinde kalıcı tutulur ve süreç yeniden
+başladığında oradan okunur. Streamlit'e bağlı değildir; arayüz tek bir
+örneği tüm oturumlarla paylaşır.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, replace
+
+from roster_engine import PlanConfig, PlanResult, build_plan
+
+# Atama algoritmaları değiştiğinde artırılır; eski disk kayıtları kullanılmaz
+CACHE_VERSION = 1
+
+DEFAULT_MAX_ENTRIES = 64
+DEFAULT_MAX_DISK_ENTRIES = 1000
+
+
+def canonical_config(config: PlanConfig):
+    """Sonucu etkilemeyen alanları sabitlenmiş yapılandırma sözlüğü.
+
+    Tohum yalnızca Random yönteminde ve yerel arama iyileştirmesinde,
+    deneme sayısı yalnızca Random yönteminde sonucu etkiler.
+    """
+    data = asdict(config)
+    if config.method != "Random":
+        data["random_trials"] = 1
+        if config.improve_seconds <= 0:
+            data["seed"] = None
+    data["scenarios"] = [list(sc) for sc in config.scenarios]
+    if config.constraints is not None:
+        data["constraints"] = config.constraints.to_dict()
+    return data
+
+
+def config_key(config: PlanConfig):
+    """Yapılandırmanın kanonik özeti (hex); önbellek anahtarıdır."""
+    payload = json.dumps([CACHE_VERSION, canonical_config(config)], ensure_ascii=False,
+                         sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def deterministic_config(config: PlanConfig):
+    """Tohumsuz Random yapılandırmasına, yapılandırma özetinden türetilen bir tohum verir."""
+    if config.method != "Random" or config.seed is not None:
+        return config
+    return replace(config, seed=int(config_key(config)[:8], 16))
+
+
+class PlanCache:
+    """build_plan sonuçları için iş parçacığı güvenli LRU önbellek.
+
+    max_entries bellekte tutulan en fazla plan sayısıdır; en uzun süredir
+    kullanılmayan plan çıkarılır. directory verilirse planlar ayrıca
+    <anahtar>.json dosyalarına yazılır; dosya sayısı max_disk_entries'i
+    aşınca en eski dosyalar silinir. Döndürülen PlanResult nesneleri
+    paylaşılır ve değiştirilmemelidir.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, directory=None, max_disk_entries=DEFAULT_MAX_DISK_ENTRIES):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.max_disk_entries = max_disk_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Önbellekteki planı döndürür (bellekte yoksa diskten okur); yoksa None."""
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                return result
+        result = self._read_disk(key)
+        if result is not None:
+            self._remember(key, result)
+        return result
+
+    def put(self, key, result: PlanResult):
+        self._remember(key, result)
+        self._write_disk(key, result)
+
+    def get_or_build(self, config: PlanConfig, profiler=None, **build_kwargs):
+        """Planı önbellekten döndürür veya oluşturup önbelleğe ekler; (PlanResult, önbellekten_mi) döndürür.
+
+        build_kwargs build_plan'a iletilir (ör. on_row). RosterError ve
+        PlanCancelled önbelleğe alınmaz, çağırana iletilir.
+        """
+        config = deterministic_config(config)
+        key = config_key(config)
+        result = self.get(key)
+        if result is not None:
+            self.hits += 1
+            if profiler is not None:
+                profiler.count("plan_cache.hit")
+            return result, True
+
+        self.misses += 1
+        if profiler is not None:
+            profiler.count("plan_cache.miss")
+        result = build_plan(config, profiler=profiler, **build_kwargs)
+        self.put(key, result)
+        return result, False
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.directory:
+            for name in os.listdir(self.directory):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(self.directory, name))
+
+    def _remember(self, key, result):
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    # --- disk ---
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _read_disk(self, key):
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            # Budama en eski kullanılanı silsin diye erişim zamanı güncellenir
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        rows = [(day, slot, sc_name, list(assigned)) for (day, slot, sc_name, assigned) in data["rows"]]
+        return PlanResult(method=data["method"], rows=rows, objective=data["objective"], seed=data["seed"])
+
+    def _write_disk(self, key, result):
+        if not self.directory:
+            return
+        data = {"method": result.method, "rows": result.rows, "objective": result.objective,
+                "seed": result.seed}
+        # Önce geçici dosyaya yazılır; yarım dosya okunmaz
+        tmp_path = f"{self._path(key)}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, self._path(key))
+        self._prune_disk()
+
+    def _prune_disk(self):
+        paths = [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                 if name.endswith(".json")]
+        if len(paths) <= self.max_disk_entries:
+            return
+        paths.sort(key=os.path.getmtime)
+        for path in paths[:len(paths) - self.max_disk_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
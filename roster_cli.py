@@ -0,0 +1,149 @@
+"""Toplu roster planlama komut satırı aracı.
+
+Bir JSON yapılandırma dosyasındaki birden çok bağımsız rosteri, Streamlit
+arayüzünü başlatmadan, bir süreç havuzunda paralel olarak planlar.
+
+Yapılandırma biçimi::
+
+    {
+      "defaults": {"days_of_week": [...], "timeslots": [...], "method": "Balanced"},
+      "rosters": [
+        {"name": "birim-a", "participants": [...], "boards": [...],
+         "scenarios": [["Kuzey Doğu Peak", "Pazartesi", "09:00-10:00", 1], ...]},
+        ...
+      ]
+    }
+
+Her roster için çıktı dizinine ``<name>.csv`` (veya ``--format xlsx`` ile
+``<name>.xlsx``) yazılır. ``--weeks N`` ile her roster art arda N hafta
+için, sayaçlar haftadan haftaya devredilerek planlanır ve haftalar dosyaya
+akıtılır (bkz. roster_engine.plan_horizon). ``--decompose`` ile (veya
+rosterde ``"decompose": true``) sektörler bölgelere ayrılıp paralel çözülür;
+rosterde ``"qualifications": {"katılımcı": ["SW", ...]}`` ile katılımcıların
+yetkin olduğu bölgeler verilebilir (bkz. roster_engine.partition_plan).
+
+Kullanım::
+
+    python roster_cli.py config.json -o plans/ --workers 4
+    python roster_cli.py config.json -o plans/ -f xlsx --weeks 52
+    python roster_cli.py centre.json -o plans/ --decompose
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+
+from roster_engine import PlanConfig, RosterError, build_plan, plan_horizon
+from roster_export import write_horizon_workbook, write_roster_workbook
+
+
+def load_roster_configs(path):
+    """Yapılandırma dosyasını okur; (ad, PlanConfig) listesi döndürür."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    defaults = data.get("defaults", {})
+    configs = []
+    for i, roster in enumerate(data.get("rosters", []), start=1):
+        merged = {**defaults, **roster}
+        name = str(merged.pop("name", f"roster{i}"))
+        configs.append((name, PlanConfig.from_dict(merged)))
+    return configs
+
+
+def write_plan_csv(path, boards, rows):
+    """Plan satırlarını arayüzdeki tablo düzeninde CSV olarak yazar."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Gün", "Zaman", "Senaryo"] + list(boards))
+        for (day, slot, sc_name, assigned) in rows:
+            writer.writerow([day, slot, sc_name] + list(assigned))
+
+
+def write_horizon_csv(path, boards, weeks):
+    """plan_horizon çıktısını hafta sütunuyla CSV olarak akıtarak yazar."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Hafta", "Gün", "Zaman", "Senaryo"] + list(boards))
+        for result in weeks:
+            for (day, slot, sc_name, assigned) in result.rows:
+                writer.writerow([result.week + 1, day, slot, sc_name] + list(assigned))
+
+
+def plan_one(job):
+    """Tek bir rosteri planlayıp yazar; (ad, hata_mesajı veya None) döndürür.
+
+    Süreç havuzunda çalıştığı için modül düzeyinde tanımlıdır.
+    """
+    name, config, output_dir, fmt, weeks = job
+    path = os.path.join(output_dir, f"{name}.{fmt}")
+    if weeks > 1:
+        return name, _plan_horizon_one(config, path, fmt, weeks)
+    try:
+        result = build_plan(config)
+    except RosterError as exc:
+        return name, str(exc)
+    if fmt == "xlsx":
+        with open(path, "wb") as f:
+            write_roster_workbook(f, result.rows, config.boards, config.participants)
+    else:
+        write_plan_csv(path, config.boards, result.rows)
+    return name, None
+
+
+def _plan_horizon_one(config, path, fmt, weeks):
+    try:
+        if fmt == "xlsx":
+            with open(path, "wb") as f:
+                write_horizon_workbook(f, plan_horizon(config, weeks), config.boards, config.participants)
+        else:
+            write_horizon_csv(path, config.boards, plan_horizon(config, weeks))
+    except RosterError as exc:
+        # Haftalar akıtılırken oluşan yarım dosya bırakılmaz
+        if os.path.exists(path):
+            os.remove(path)
+        return str(exc)
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Birden çok rosteri toplu olarak planlar.")
+    parser.add_argument("config", help="JSON yapılandırma dosyası")
+    parser.add_argument("-o", "--output-dir", default=".", help="Çıktıların yazılacağı dizin")
+    parser.add_argument("-f", "--format", choices=["csv", "xlsx"], default="csv", help="Çıktı biçimi")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="Süreç sayısı (varsayılan: işlemci sayısı)")
+    parser.add_argument("--weeks", type=int, default=1,
+                        help="Art arda planlanacak hafta sayısı (sayaçlar devreder)")
+    parser.add_argument("--decompose", action="store_true",
+                        help="Sektörleri bölgelere ayırıp her bölgeyi ayrı süreçte çöz")
+    args = parser.parse_args(argv)
+
+    try:
+        configs = load_roster_configs(args.config)
+    except (OSError, ValueError) as exc:
+        print(f"Yapılandırma okunamadı: {exc}", file=sys.stderr)
+        return 2
+
+    if args.decompose:
+        configs = [(name, replace(config, decompose=True)) for name, config in configs]
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    jobs = [(name, config, args.output_dir, args.format, args.weeks) for name, config in configs]
+
+    failed = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for name, error in pool.map(plan_one, jobs):
+            if error is None:
+                print(f"{name}: tamamlandı")
+            else:
+                failed += 1
+                print(f"{name}: HATA - {error}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""Katılımcı uygunluğu ve görev kuralları (kısıt modeli).
+
+Uygunluk, katılımcı x gün x zaman aralığı boyutlu bir bool matristir
+(True = uygun). Günlük görev sayısı, aynı satırda çift atama ve aynı gün
+iki görev arasındaki en az dinlenme kuralları atama sırasında
+ConstraintTracker ile izlenir: katılımcının her gün çalıştığı zaman
+aralıkları bir bit kümesinde (uint64) tutulur, böylece her uygunluk
+denetimi O(1), bir hücre için tüm katılımcıların denetimi tek bir vektörel
+işlemdir.
+"""
+from dataclasses import dataclass, field, replace
+from typing import List, Optional
+
+import numpy as np
+
+# Dinlenme kuralı için zaman aralığı bit kümesinin genişliği
+MAX_REST_SLOTS = 63
+
+
+@dataclass
+class Constraints:
+    """Plan kısıtları.
+
+    availability: katılımcı x gün x zaman aralığı bool matrisi; eksen
+    sıraları participants / days / slots listeleridir. Bu listelerde olmayan
+    gün ve zaman aralıkları herkes için uygun sayılır.
+    max_per_day: bir katılımcının aynı gün alabileceği en fazla görev (0 = sınırsız).
+    no_double_booking: aynı satırda (senaryoda) bir katılımcı yalnızca bir sektör alır.
+    min_rest_slots: aynı gün farklı zaman aralıklarındaki iki görev arasında en az
+    bu kadar boş zaman aralığı (0 = kapalı). Aynı zaman aralığındaki satırlar
+    bu kurala değil max_per_day'e tabidir.
+    """
+    participants: List[str] = field(default_factory=list)
+    days: List[str] = field(default_factory=list)
+    slots: List[str] = field(default_factory=list)
+    availability: Optional[np.ndarray] = None
+    max_per_day: int = 0
+    no_double_booking: bool = False
+    min_rest_slots: int = 0
+
+    @classmethod
+    def from_dict(cls, data, participants, days, slots):
+        """JSON/dict biçiminden kısıtları oluşturur.
+
+        data["unavailable"]: [[katılımcı, gün, zaman], ...]; zaman boşsa o gün
+        tamamen uygun değildir. Listede olmayan katılımcı / gün / zaman
+        aralıklarına ait kayıtlar yok sayılır.
+        """
+        p_index = {p: i for i, p in enumerate(participants)}
+        d_index = {d: i for i, d in enumerate(days)}
+        s_index = {s: i for i, s in enumerate(slots)}
+        availability = np.ones((len(participants), len(days), len(slots)), dtype=bool)
+        for entry in data.get("unavailable", []):
+            p_name, day = entry[0], entry[1]
+            slot = entry[2] if len(entry) > 2 else ""
+            p_idx, d_idx = p_index.get(p_name), d_index.get(day)
+            if p_idx is None or d_idx is None:
+                continue
+            if slot:
+                s_idx = s_index.get(slot)
+                if s_idx is not None:
+                    availability[p_idx, d_idx, s_idx] = False
+            else:
+                availability[p_idx, d_idx, :] = False
+        return cls(
+            participants=list(participants),
+            days=list(days),
+            slots=list(slots),
+            availability=availability,
+            max_per_day=int(data.get("max_per_day", 0) or 0),
+            no_double_booking=bool(data.get("no_double_booking", False)),
+            min_rest_slots=int(data.get("min_rest_slots", 0) or 0),
+        )
+
+    def to_dict(self):
+        """from_dict ile geri okunabilen JSON/dict gösterimi (uygunluk seyrek liste olarak)."""
+        unavailable = []
+        if self.availability is not None:
+            for p_idx, d_idx in np.argwhere(~self.availability.any(axis=2)):
+                unavailable.append([self.participants[p_idx], self.days[d_idx], ""])
+            partial = self.availability.any(axis=2)
+            for p_idx, d_idx, s_idx in np.argwhere(~self.availability):
+                if partial[p_idx, d_idx]:
+                    unavailable.append([self.participants[p_idx], self.days[d_idx], self.slots[s_idx]])
+        return {
+            "unavailable": unavailable,
+            "max_per_day": self.max_per_day,
+            "no_double_booking": self.no_double_booking,
+            "min_rest_slots": self.min_rest_slots,
+        }
+
+    def for_participants(self, indices):
+        """Yalnızca participants listesindeki verilen sıralardaki katılımcıların kısıtları."""
+        indices = list(indices)
+        availability = None if self.availability is None else self.availability[indices]
+        return replace(self, participants=[self.participants[i] for i in indices], availability=availability)
+
+    @property
+    def is_empty(self):
+        """Hiçbir kural yoksa True."""
+        return (not self.max_per_day and not self.no_double_booking and not self.min_rest_slots
+                and (self.availability is None or self.availability.all()))
+
+
+class ConstraintTracker:
+    """Atama sırasında kısıt durumunu izler; hücre başına O(1) uygunluk denetimi yapar.
+
+    Satırların gün / zaman kodları day_code / slot_code ile bulunur;
+    kısıtların gün ve zaman listelerinde olmayanlar sona eklenir ve uygun
+    sayılır. Aynı satırdaki çift atama denetimi satırı dolduran yönteme aittir.
+    """
+
+    def __init__(self, constraints: Constraints, n_parts):
+        self.constraints = constraints
+        self._day_index = {d: i for i, d in enumerate(constraints.days)}
+        self._slot_index = {s: i for i, s in enumerate(constraints.slots)}
+        self.n_parts = n_parts
+        self.max_per_day = constraints.max_per_day
+        self.rest = constraints.min_rest_slots
+        if self.rest and len(constraints.slots) > MAX_REST_SLOTS:
+            raise ValueError(f"Dinlenme kuralı en fazla {MAX_REST_SLOTS} zaman aralığıyla kullanılabilir.")
+
+        availability = constraints.availability
+        if availability is not None and availability.shape[0] != n_parts:
+            raise ValueError("Uygunluk matrisi katılımcı sayısıyla uyuşmuyor.")
+        self.availability = availability
+        # Gün sayısı, listede olmayan günler eklendikçe büyür
+        self.day_count = np.zeros((n_parts, len(constraints.days) + 1), dtype=np.int64)
+        self.day_mask = np.zeros((n_parts, len(constraints.days) + 1), dtype=np.uint64)
+        # (katılımcı, gün, zaman) -> o zaman aralığındaki görev sayısı; bit kümesinden çıkarmak için
+        self._slot_count = {}
+
+    def day_code(self, day):
+        code = self._day_index.get(day)
+        if code is None:
+            code = self._day_index[day] = len(self._day_index)
+            if code >= self.day_count.shape[1]:
+                pad = ((0, 0), (0, code + 1 - self.day_count.shape[1]))
+                self.day_count = np.pad(self.day_count, pad)
+                self.day_mask = np.pad(self.day_mask, pad)
+        return code
+
+    def slot_code(self, slot):
+        code = self._slot_index.get(slot)
+        if code is None:
+            code = self._slot_index[slot] = len(self._slot_index)
+        return code
+
+    def _available(self, d, s):
+        availability = self.availability
+        if availability is None or d >= availability.shape[1] or s >= availability.shape[2]:
+            return None
+        return availability[:, d, s]
+
+    def _rest_window(self, s):
+        """s zaman aralığının dinlenme penceresindeki (s - rest .. s + rest, s hariç) bitler."""
+        if s >= MAX_REST_SLOTS:
+            return np.uint64(0)
+        low = max(0, s - self.rest)
+        high = min(MAX_REST_SLOTS - 1, s + self.rest)
+        return np.uint64((((1 << (high - low + 1)) - 1) << low) & ~(1 << s))
+
+    def feasible(self, p, d, s):
+        """p katılımcısı d günü s zaman aralığında görev alabilir mi (O(1))."""
+        available = self._available(d, s)
+        if available is not None and not available[p]:
+            return False
+        if self.max_per_day and self.day_count[p, d] >= self.max_per_day:
+            return False
+        if self.rest and self.day_mask[p, d] & self._rest_window(s):
+            return False
+        return True
+
+    def feasible_mask(self, d, s):
+        """Tüm katılımcılar için feasible(p, d, s) değerleri (bool dizi)."""
+        mask = np.ones(self.n_parts, dtype=bool)
+        available = self._available(d, s)
+        if available is not None:
+            mask &= available
+        if self.max_per_day:
+            mask &= self.day_count[:, d] < self.max_per_day
+        if self.rest:
+            mask &= (self.day_mask[:, d] & self._rest_window(s)) == 0
+        return mask
+
+    def add(self, p, d, s):
+        self.day_count[p, d] += 1
+        key = (p, d, s)
+        self._slot_count[key] = self._slot_count.get(key, 0) + 1
+        if s < MAX_REST_SLOTS:
+            self.day_mask[p, d] |= np.uint64(1 << s)
+
+    def remove(self, p, d, s):
+        self.day_count[p, d] -= 1
+        key = (p, d, s)
+        remaining = self._slot_count[key] - 1
+        if remaining:
+            self._slot_count[key] = remaining
+            return
+        del self._slot_count[key]
+        if s < MAX_REST_SLOTS:
+            self.day_mask[p, d] &= ~np.uint64(1 << s)
@@ -0,0 +1,1094 @@
+"""Streamlit'ten bağımsız roster planlama motoru.
+
+Senaryo genişletme, sıralama ve atama yöntemleri burada bulunur; hem
+Streamlit arayüzü (rosterstreamlit.py) hem de toplu komut satırı aracı
+(roster_cli.py) bu modülü kullanır. Hatalar arayüz çağrısı yerine
+RosterError olarak fırlatılır.
+"""
+import itertools
+import math
+import os
+import random
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from roster_constraints import Constraints, ConstraintTracker
+from roster_profile import phase
+from roster_table import EMPTY, PlanTable, encode_categories
+
+# Sektör bölgesini belirleyen önek uzunluğu (bkz. board_group)
+BOARD_GROUP_PREFIX = 2
+
+# (gün, zaman, senaryo_adı)
+ScenarioSlot = Tuple[str, str, str]
+# (gün, zaman, senaryo_adı, [sektör sırasına göre katılımcılar])
+PlanRow = Tuple[str, str, str, List[str]]
+
+
+class RosterError(ValueError):
+    """Plan oluşturulamadığında fırlatılır; mesaj kullanıcıya gösterilebilir."""
+
+
+class PlanCancelled(Exception):
+    """Plan oluşturma, ilerleme geri çağrısından iptal edildiğinde fırlatılır (bkz. roster_jobs)."""
+
+
+@dataclass
+class PlanConfig:
+    """Tek bir roster planı için gereken tüm girdiler."""
+    participants: List[str]
+    boards: List[str]
+    # [senaryo_adı, gün, zaman, tekrar]
+    scenarios: List[list]
+    days_of_week: List[str] = field(default_factory=list)
+    timeslots: List[str] = field(default_factory=list)
+    method: str = "Round Robin"
+    # >0 ise plan, yerel aramayla bu kadar saniye iyileştirilir (bkz. improve_plan)
+    improve_seconds: float = 0.0
+    # Random yöntemi için tohum ve denenecek tohum sayısı (bkz. best_random_plan)
+    seed: Optional[int] = None
+    random_trials: int = 1
+    # Uygunluk ve görev kuralları (bkz. roster_constraints)
+    constraints: Optional[Constraints] = None
+    # True ise sektörler bağımsız bölgelere ayrılıp paralel çözülür (bkz. partition_plan);
+    # qualifications: {katılımcı: [bölge veya sektör adları]}
+    decompose: bool = False
+    qualifications: Dict[str, List[str]] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data):
+        """JSON/dict yapılandırmasından PlanConfig oluşturur."""
+        try:
+            config = cls(
+                participants=list(data["participants"]),
+                boards=list(data["boards"]),
+                scenarios=[list(sc) for sc in data["scenarios"]],
+                days_of_week=list(data.get("days_of_week", [])),
+                timeslots=list(data.get("timeslots", [])),
+                method=data.get("method", "Round Robin"),
+                improve_seconds=float(data.get("improve_seconds", 0.0)),
+                seed=data.get("seed"),
+                random_trials=int(data.get("random_trials", 1)),
+                decompose=bool(data.get("decompose", False)),
+                qualifications={p: list(names) for p, names in (data.get("qualifications") or {}).items()},
+            )
+        except KeyError as exc:
+            raise RosterError(f"Yapılandırmada eksik alan: {exc.args[0]}") from None
+        if data.get("constraints"):
+            config.constraints = Constraints.from_dict(data["constraints"], config.participants,
+                                                       config.days_of_week, config.timeslots)
+        return config
+
+
+@dataclass
+class PlanResult:
+    """Oluşturulan plan, kullanılan yöntem ve ulaşılan adalet hedefi (bkz. fairness_objective).
+
+    seed, Random yönteminde planı birebir yeniden üretmek için kullanılan tohumdur.
+    """
+    method: str
+    rows: List[PlanRow]
+    objective: float = 0.0
+    seed: Optional[int] = None
+    # Çok haftalık planlamada haftanın sırası (0 tabanlı, bkz. plan_horizon)
+    week: Optional[int] = None
+
+
+# -------------------------------------------------------------------------
+# Senaryo Genişletme ve Sıralama
+# -------------------------------------------------------------------------
+def expand_scenarios(scenarios, days_of_week, timeslots) -> List[ScenarioSlot]:
+    """Tekrarlı senaryoları genişletir ve gün / zaman / ad sırasına dizer.
+
+    Listede olmayan gün veya zaman aralıkları en sona yerleşir.
+    """
+    expanded = []
+    for (sc_name, sc_day, sc_slot, sc_rep) in scenarios:
+        for _ in range(int(sc_rep)):
+            expanded.append((sc_day, sc_slot, sc_name))
+
+    day_index = {d: i for i, d in enumerate(days_of_week)}
+    slot_index = {s: i for i, s in enumerate(timeslots)}
+    expanded.sort(key=lambda x: (day_index.get(x[0], 9999), slot_index.get(x[1], 9999), x[2]))
+    return expanded
+
+
+# -------------------------------------------------------------------------
+# Atama Yöntemleri
+# -------------------------------------------------------------------------
+def assign_random(scenario_list, participants, boards, rng=None, constraints=None, on_row=None) -> List[PlanRow]:
+    """Her satırda katılımcıları karıştırıp sırayla dağıtır.
+
+    rng (random.Random) verilirse sonuç tohuma bağlı olarak tekrarlanabilir;
+    verilmezse global random modülü kullanılır. constraints verilirse karışık
+    sırada kısıtlara uyan ilk katılımcı seçilir.
+    """
+    shuffle = (rng or random).shuffle
+    tracker = _tracker(constraints, len(participants))
+    if tracker is not None:
+        def shuffled_rows():
+            order = list(range(len(participants)))
+            for _ in scenario_list:
+                shuffle(order)
+                yield order, 0
+        return _assign_cyclic_constrained(scenario_list, participants, boards, tracker, shuffled_rows(), on_row)
+
+    plan_data = []
+    p_copy = participants[:]
+    for (day, slot, sc_name) in scenario_list:
+        shuffle(p_copy)
+        assignment = []
+        for b_i in range(len(boards)):
+            assignment.append(p_copy[b_i % len(p_copy)])
+        plan_data.append((day, slot, sc_name, assignment))
+        if on_row is not None:
+            on_row(plan_data[-1])
+    return plan_data
+
+
+def assign_round_robin(scenario_list, participants, boards, start_row=0, constraints=None,
+                       on_row=None) -> List[PlanRow]:
+    """Her satırda katılımcı listesini bir kaydırarak sektörlere dağıtır.
+
+    start_row, önceki haftalardan devam ederken döngünün kaldığı satırdır.
+    constraints verilirse sıradaki katılımcı uygun değilse döngüde bir sonraki denenir.
+    """
+    tracker = _tracker(constraints, len(participants))
+    if tracker is not None:
+        order = list(range(len(participants)))
+        rows = ((order, row) for row in itertools.count(start_row))
+        return _assign_cyclic_constrained(scenario_list, participants, boards, tracker, rows, on_row)
+
+    plan_data = []
+    p_count = len(participants)
+    for s_idx, (day, slot, sc_name) in enumerate(scenario_list, start=start_row):
+        assignment = []
+        for b_i in range(len(boards)):
+            idx = (b_i + s_idx) % p_count
+            assignment.append(participants[idx])
+        plan_data.append((day, slot, sc_name, assignment))
+        if on_row is not None:
+            on_row(plan_data[-1])
+    return plan_data
+
+
+def assign_balanced(scenario_list, participants, boards, history=None, constraints=None,
+                    on_row=None) -> List[PlanRow]:
+    """Her sektöre, (toplam görev + o sektördeki görev) sayısı en düşük katılımcıyı atar.
+
+    Sayaçlar NumPy tamsayı dizilerinde (sektör x katılımcı) tutulur;
+    eşitlikte np.argmin ilk indeksi döndürdüğü için, listedeki ilk katılımcı
+    seçilir (eski min(...) davranışıyla aynı). history (katılımcı x sektör
+    görev sayıları, bkz. count_matrix) verilirse sayaçlar buradan başlar.
+    constraints verilirse yalnızca kısıtlara uyan katılımcılar arasından seçilir.
+    """
+    tracker = _tracker(constraints, len(participants))
+    if tracker is not None:
+        return _assign_balanced_constrained(scenario_list, participants, boards, history, tracker, on_row)
+
+    plan_data = []
+    n_boards = len(boards)
+    participant_count, participant_board_count = _initial_counters(history, len(participants), n_boards)
+
+    for (day, slot, sc_name) in scenario_list:
+        assignment = []
+        for b_i in range(n_boards):
+            board_row = participant_board_count[b_i]
+            best_idx = int(np.argmin(participant_count + board_row))
+            assignment.append(participants[best_idx])
+            participant_count[best_idx] += 1
+            board_row[best_idx] += 1
+        plan_data.append((day, slot, sc_name, assignment))
+        if on_row is not None:
+            on_row(plan_data[-1])
+    return plan_data
+
+
+def _assign_balanced_constrained(scenario_list, participants, boards, history, tracker, on_row=None):
+    n_boards = len(boards)
+    participant_count, participant_board_count = _initial_counters(history, len(participants), n_boards)
+    no_double = tracker.constraints.no_double_booking
+    blocked = np.iinfo(np.int64).max
+    plan_data = []
+    for (day, slot, sc_name) in scenario_list:
+        d, s = tracker.day_code(day), tracker.slot_code(slot)
+        used = []
+        assignment = []
+        for b_i in range(n_boards):
+            mask = tracker.feasible_mask(d, s)
+            if no_double:
+                mask[used] = False
+            if not mask.any():
+                raise _infeasible(day, slot, sc_name, boards[b_i])
+            board_row = participant_board_count[b_i]
+            best_idx = int(np.argmin(np.where(mask, participant_count + board_row, blocked)))
+            assignment.append(participants[best_idx])
+            participant_count[best_idx] += 1
+            board_row[best_idx] += 1
+            used.append(best_idx)
+            tracker.add(best_idx, d, s)
+        plan_data.append((day, slot, sc_name, assignment))
+        if on_row is not None:
+            on_row(plan_data[-1])
+    return plan_data
+
+
+def _tracker(constraints, n_parts):
+    """Kısıt yoksa None, varsa yeni bir ConstraintTracker."""
+    if constraints is None or constraints.is_empty:
+        return None
+    try:
+        return ConstraintTracker(constraints, n_parts)
+    except ValueError as exc:
+        raise RosterError(str(exc)) from None
+
+
+def _infeasible(day, slot, sc_name, board):
+    return RosterError(f"{day} {slot} '{sc_name}' satırında {board} sektörüne kısıtlara uyan katılımcı yok.")
+
+
+def _assign_cyclic_constrained(scenario_list, participants, boards, tracker, row_orders, on_row=None):
+    """Döngüsel yöntemlerin kısıtlı sürümü.
+
+    row_orders her satır için (katılımcı indeks sırası, başlangıç) verir;
+    kısıtsız yöntem b. sektöre sıra[(başlangıç + b) % n] atar. Bu katılımcı
+    uygun değilse döngüde sonraki ilk uygun katılımcı seçilir; arama, hücrenin
+    uygunluk maskesi üzerinde searchsorted ile yapılır.
+    """
+    n_parts = len(participants)
+    no_double = tracker.constraints.no_double_booking
+    plan_data = []
+    for (day, slot, sc_name), (order, start) in zip(scenario_list, row_orders):
+        d, s = tracker.day_code(day), tracker.slot_code(slot)
+        order = np.asarray(order)
+        used = []
+        assignment = []
+        for b_i, b_name in enumerate(boards):
+            mask = tracker.feasible_mask(d, s)
+            if no_double:
+                mask[used] = False
+            # Sıradaki konumlara göre uygun olanlar
+            positions = np.flatnonzero(mask[order])
+            if not len(positions):
+                raise _infeasible(day, slot, sc_name, b_name)
+            wanted = (start + b_i) % n_parts
+            k = np.searchsorted(positions, wanted)
+            p_idx = int(order[positions[k] if k < len(positions) else positions[0]])
+            used.append(p_idx)
+            tracker.add(p_idx, d, s)
+            assignment.append(participants[p_idx])
+        plan_data.append((day, slot, sc_name, assignment))
+        if on_row is not None:
+            on_row(plan_data[-1])
+    return plan_data
+
+
+def _initial_counters(history, n_parts, n_boards):
+    """Geçmiş sayaçlardan (katılımcı x sektör) toplam ve sektör x katılımcı başlangıç dizileri.
+
+    Dönen diziler her zaman kopyadır; atama sırasında artırılmaları çağıranın
+    history matrisini değiştirmez (tek sektörde / tek katılımcıda history.T
+    zaten bitişik olduğundan ascontiguousarray görünüm döndürürdü).
+    """
+    if history is None:
+        return (np.zeros(n_parts, dtype=np.int64),
+                np.zeros((n_boards, n_parts), dtype=np.int64))
+    history = np.asarray(history, dtype=np.int64)
+    return history.sum(axis=1), history.T.copy()
+
+
+def latin_rectangle_offset(row, n_parts, n_boards):
+    """Genelleştirilmiş Latin dikdörtgeninde satırın ilk sektörüne düşen katılımcı indeksi.
+
+    Ardışık satırlar n_boards kaydırılır, böylece art arda gelen satırlar
+    mümkün olduğunca farklı katılımcılar kullanır. Her n_parts / g satırda
+    (g = ebob(n_parts, n_boards)) bir ek kaydırma yapılır; bu sayede her
+    n_parts satırlık döngüde tüm başlangıç noktaları tam bir kez kullanılır
+    ve her katılımcı her sektörde tam bir kez görev alır. Katılımcı ve
+    sektör sayısı eşitse klasik Latin kare (row + col) elde edilir.
+    """
+    block = n_parts // math.gcd(n_parts, n_boards)
+    return (row * n_boards + row // block) % n_parts
+
+
+def assign_constraint_latin(scenario_list, participants, boards, start_row=0, constraints=None,
+                            on_row=None) -> List[PlanRow]:
+    """Döngüsel Latin dikdörtgeniyle atama; her hücre kapalı formda O(1) hesaplanır.
+
+    Katılımcı sayısının sektör sayısından az olmaması yeterlidir; rastgelelik
+    ve yeniden deneme yoktur. Her n_parts satırda herkes her sektörü bir kez alır.
+    start_row, önceki haftalardan devam ederken döngünün kaldığı satırdır.
+    constraints verilirse uygun olmayan hücrelerde döngüde sonraki uygun katılımcı seçilir.
+    """
+    n_boards = len(boards)
+    n_parts = len(participants)
+
+    # Bir satırda aynı katılımcı iki sektöre düşmemeli
+    if n_parts < n_boards:
+        raise RosterError("Hata: Constraint (Latin Square) için '#participants >= #boards' olmalı.")
+
+    tracker = _tracker(constraints, n_parts)
+    if tracker is not None:
+        order = list(range(n_parts))
+        rows = ((order, latin_rectangle_offset(row, n_parts, n_boards)) for row in itertools.count(start_row))
+        return _assign_cyclic_constrained(scenario_list, participants, boards, tracker, rows, on_row)
+
+    plan_data = []
+    for row, (day, slot, sc_name) in enumerate(scenario_list, start=start_row):
+        offset = latin_rectangle_offset(row, n_parts, n_boards)
+        assignment = [participants[(offset + col) % n_parts] for col in range(n_boards)]
+        plan_data.append((day, slot, sc_name, assignment))
+        if on_row is not None:
+            on_row(plan_data[-1])
+    return plan_data
+
+
+def linear_assignment(cost):
+    """Dikdörtgen maliyet matrisi (n satır <= m sütun) için en düşük toplam maliyetli eşleşme.
+
+    Potansiyelli en kısa artırım yolu (Macar / Hungarian) algoritmasıdır,
+    O(n^2 m); iç döngü sütunlar üzerinde vektörleştirilmiştir. Eşit maliyetli
+    sütunlardan boşta olan tercih edilir, bu da artırım yollarını kısa tutar.
+    Her satıra atanan sütun indekslerini döndürür.
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    n, m = cost.shape
+    if n > m:
+        raise ValueError("linear_assignment: satır sayısı sütun sayısından büyük olamaz.")
+
+    # 1 tabanlı indeksler; p[j] = j sütununa atanmış satır (0 = boş)
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    p = np.zeros(m + 1, dtype=np.int64)
+    way = np.zeros(m + 1, dtype=np.int64)
+
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            cur = cost[i0 - 1] - u[i0] - v[1:]
+            free = ~used[1:]
+            better = free & (cur < minv[1:])
+            minv[1:][better] = cur[better]
+            way[1:][better] = j0
+
+            masked = np.where(free, minv[1:], np.inf)
+            delta = masked.min()
+            ties = masked == delta
+            open_ties = ties & (p[1:] == 0)
+            j1 = int(np.argmax(open_ties if open_ties.any() else ties)) + 1
+
+            u[p[used]] += delta
+            v[used] -= delta
+            minv[~used] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+
+        # Artırım yolu boyunca eşleşmeyi güncelle
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    result = np.empty(n, dtype=np.int64)
+    cols = np.nonzero(p[1:])[0]
+    result[p[1:][cols] - 1] = cols
+    return result
+
+
+def assign_optimal(scenario_list, participants, boards, history=None, constraints=None,
+                   on_row=None) -> List[PlanRow]:
+    """Her senaryo satırını ağırlıklı iki parçalı eşleşme olarak en iyi şekilde çözer.
+
+    Maliyet, katılımcının toplam ve sektör bazlı görev sayılarının kareler
+    toplamına eklediği artıştır; böylece her satırda, açgözlü yöntemlerden
+    farklı olarak tüm sektörler birlikte düşünülerek fairness_objective'teki
+    artış en aza indirilir. Katılımcı sayısı sektör sayısından azsa katılımcılar
+    aynı satırda artan maliyetle tekrar kullanılabilir. history verilirse
+    sayaçlar buradan başlar (bkz. assign_balanced). constraints verilirse
+    uygun olmayan eşleşmeler yasaklanır.
+    """
+    plan_data = []
+    n_parts = len(participants)
+    n_boards = len(boards)
+    tracker = _tracker(constraints, n_parts)
+    no_double = tracker is not None and tracker.constraints.no_double_booking
+    copies = 1 if no_double else -(-n_boards // n_parts)
+    if copies * n_parts < n_boards:
+        raise RosterError("Çift atama yasakken katılımcı sayısı sektör sayısından az olamaz.")
+    participant_count, participant_board_count = _initial_counters(history, n_parts, n_boards)
+    # Sütun = kopya * n_parts + katılımcı; aynı satırdaki c. kopya 2c ek maliyet taşır
+    copy_offset = np.repeat(2 * np.arange(copies), n_parts)
+    board_idx = np.arange(n_boards)
+
+    for (day, slot, sc_name) in scenario_list:
+        cost = np.tile(2 * participant_count + 2 * participant_board_count + 2, copies) + copy_offset
+        if tracker is None:
+            chosen = linear_assignment(cost) % n_parts
+        else:
+            chosen = _solve_constrained_row(cost, tracker, day, slot, sc_name, boards, copies)
+        np.add.at(participant_count, chosen, 1)
+        participant_board_count[board_idx, chosen] += 1
+        plan_data.append((day, slot, sc_name, [participants[i] for i in chosen]))
+        if on_row is not None:
+            on_row(plan_data[-1])
+    return plan_data
+
+
+def _solve_constrained_row(cost, tracker, day, slot, sc_name, boards, copies):
+    """assign_optimal satırını, uygun olmayan sütunları yasaklayarak çözer; katılımcı indekslerini döndürür."""
+    n_parts = tracker.n_parts
+    d, s = tracker.day_code(day), tracker.slot_code(slot)
+    feasible = tracker.feasible_mask(d, s)
+    allowed = []
+    for c in range(copies):
+        # c. kopya, katılımcının bu satırdaki c+1. görevidir
+        copy_ok = feasible.copy()
+        if tracker.max_per_day:
+            copy_ok &= tracker.day_count[:, d] + c < tracker.max_per_day
+        allowed.append(copy_ok)
+    allowed = np.concatenate(allowed)
+    if allowed.sum() < len(boards):
+        raise _infeasible(day, slot, sc_name, boards[0])
+    big = float(cost.max()) * len(boards) + 1.0
+    cost = np.where(allowed, cost, big)
+    columns = linear_assignment(cost)
+    blocked = np.nonzero(~allowed[columns])[0]
+    if len(blocked):
+        raise _infeasible(day, slot, sc_name, boards[blocked[0]])
+    chosen = columns % n_parts
+    for p_idx in chosen.tolist():
+        tracker.add(p_idx, d, s)
+    return chosen
+
+
+# Yöntem adı -> atama fonksiyonu (arayüzdeki sırayla). Tüm yöntemler, her satır
+# tamamlandığında o satırla çağrılan on_row geri çağrısını kabul eder; ilerleme
+# bildirmek ve (PlanCancelled fırlatarak) işi durdurmak için kullanılır.
+ASSIGNMENT_METHODS: Dict[str, Callable[[Sequence[ScenarioSlot], List[str], List[str]], List[PlanRow]]] = {
+    "Random": assign_random,
+    "Round Robin": assign_round_robin,
+    "Balanced": assign_balanced,
+    "Constraint (Latin Square)": assign_constraint_latin,
+    "Optimal": assign_optimal,
+}
+
+
+def count_matrix(plan_data, participants, boards):
+    """Katılımcı x sektör görev sayıları (int64); listede olmayan katılımcılar sayılmaz."""
+    n_parts = len(participants)
+    n_boards = len(boards)
+    p_index = {p: i for i, p in enumerate(participants)}
+    cells = [p_index[p] * n_boards + b_idx
+             for (_, _, _, assigned) in plan_data
+             for b_idx, p in enumerate(assigned)
+             if p in p_index and b_idx < n_boards]
+    counts = np.bincount(np.asarray(cells, dtype=np.int64), minlength=n_parts * n_boards)
+    return counts.reshape(n_parts, n_boards)
+
+
+def objective_from_counts(counts) -> float:
+    """count_matrix çıktısı için fairness_objective değeri."""
+    if not counts.size:
+        return 0.0
+    return float(np.var(counts.sum(axis=1)) + np.var(counts))
+
+
+def fairness_objective(plan_data, participants, boards) -> float:
+    """Planın adalet hedefi: toplam görev ve sektör bazlı görev sayılarının varyans toplamı.
+
+    0, herkesin eşit sayıda ve her sektörde eşit sayıda görev aldığı anlamına
+    gelir; değer ne kadar düşükse dağılım o kadar adildir. Listede olmayan
+    katılımcılar hesaba katılmaz.
+    """
+    if not participants or not boards:
+        return 0.0
+    return objective_from_counts(count_matrix(plan_data, participants, boards))
+
+
+# -------------------------------------------------------------------------
+# Çok Tohumlu Random Arama
+# -------------------------------------------------------------------------
+def _random_trials(job):
+    """Bir tohum aralığını dener; (en iyi hedef, tohum) döndürür.
+
+    Süreç havuzunda çalıştığı için modül düzeyindedir ve süreçler arası
+    yalnızca iki sayı taşır; planın kendisi ana süreçte yeniden üretilir.
+    """
+    scenario_list, participants, boards, seeds, constraints = job
+    best = None
+    for seed in seeds:
+        try:
+            rows = assign_random(scenario_list, participants, boards, rng=random.Random(seed),
+                                 constraints=constraints)
+        except RosterError:
+            continue
+        score = (fairness_objective(rows, participants, boards), seed)
+        if best is None or score < best:
+            best = score
+    return best
+
+
+def best_random_plan(scenario_list, participants, boards, trials, base_seed=0, workers=None, constraints=None):
+    """Random yöntemini base_seed, base_seed+1, ... tohumlarıyla trials kez çalıştırır.
+
+    Denemeler işlemci sayısı kadar parçaya bölünüp bir süreç havuzunda
+    yürütülür. En düşük fairness_objective'e sahip plan (eşitlikte en küçük
+    tohum) seçilir; (satırlar, tohum, hedef) döndürür. constraints verilirse
+    kısıtlara uyan plan bulunamayan tohumlar atlanır.
+    """
+    seeds = list(range(base_seed, base_seed + max(1, trials)))
+    workers = max(1, min(workers or os.cpu_count() or 1, len(seeds)))
+    chunks = [seeds[i::workers] for i in range(workers)]
+    jobs = [(scenario_list, participants, boards, chunk, constraints) for chunk in chunks]
+
+    if workers == 1:
+        results = [_random_trials(jobs[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_random_trials, jobs))
+
+    results = [r for r in results if r is not None]
+    if not results:
+        # Hiçbir tohum kısıtlara uymadı; ilk tohumun hatası kullanıcıya iletilir
+        assign_random(scenario_list, participants, boards, rng=random.Random(seeds[0]), constraints=constraints)
+    objective, seed = min(results)
+    rows = assign_random(scenario_list, participants, boards, rng=random.Random(seed), constraints=constraints)
+    return rows, seed, objective
+
+
+# -------------------------------------------------------------------------
+# Yerel Arama ile İyileştirme
+# -------------------------------------------------------------------------
+def improve_plan(plan_data, participants, boards, time_budget=1.0, seed=0, max_iters=None, history=None,
+                 constraints=None, on_tick=None):
+    """Herhangi bir atama yönteminin planını benzetimli tavlama (simulated annealing) ile iyileştirir.
+
+    Komşuluklar: bir hücredeki katılımcıyı o satırda olmayan biriyle
+    değiştirme (move) ve aynı satırdaki iki hücrenin yer değiştirmesi (swap).
+    Amaç fonksiyonu (fairness_objective) her hamlede katılımcı ve sektör
+    sayaçlarından artımlı olarak güncellenir; plan baştan puanlanmaz.
+    time_budget saniye dolduğunda (veya max_iters hamleden sonra) durur.
+    Satırda yeni çift atama oluşturan hamleler denenmez. history (katılımcı x
+    sektör geçmiş sayaçları) verilirse hedef, geçmiş dahil toplam sayaçlar
+    üzerinden hesaplanır. constraints verilirse move hamleleri yalnızca
+    kısıtlara uyan katılımcılarla yapılır (swap satır içinde kaldığı için
+    kısıtları her zaman korur). on_tick verilirse birkaç yüz hamlede bir
+    geçen sürenin bütçeye oranıyla (0-1) çağrılır. (satırlar, hedef) döndürür.
+    """
+    n_parts = len(participants)
+    n_boards = len(boards)
+    rows = [(day, slot, sc_name, list(assigned)) for (day, slot, sc_name, assigned) in plan_data]
+    if not rows or not n_parts or not n_boards:
+        return rows, _plan_objective(rows, participants, boards, history)
+
+    p_index = {p: i for i, p in enumerate(participants)}
+    # Satır x sektör kodları; -1 = listede olmayan (sabit) katılımcı
+    grid = [[p_index.get(p, -1) for p in assigned[:n_boards]] for (_, _, _, assigned) in rows]
+    if history is None:
+        total = [0] * n_parts
+        board_count = [[0] * n_boards for _ in range(n_parts)]
+    else:
+        history = np.asarray(history, dtype=np.int64)
+        total = history.sum(axis=1).tolist()
+        board_count = history.tolist()
+    row_members = []
+    for codes in grid:
+        members = {}
+        for b_idx, p_idx in enumerate(codes):
+            if p_idx >= 0:
+                total[p_idx] += 1
+                board_count[p_idx][b_idx] += 1
+                members[p_idx] = members.get(p_idx, 0) + 1
+        row_members.append(members)
+
+    tracker = _tracker(constraints, n_parts)
+    if tracker is not None:
+        row_cells = [(tracker.day_code(day), tracker.slot_code(slot)) for (day, slot, _, _) in rows]
+        for (d, s), codes in zip(row_cells, grid):
+            for p_idx in codes:
+                if p_idx >= 0:
+                    tracker.add(p_idx, d, s)
+
+    # fairness_objective = var(toplam) + var(sektör sayıları); kareler toplamının ağırlıkları
+    w_total = 1.0 / n_parts
+    w_board = 1.0 / (n_parts * n_boards)
+
+    rng = random.Random(seed)
+    n_rows = len(grid)
+    start = time.perf_counter()
+    deadline = start + time_budget
+    temperature0 = 2.0 * (w_total + w_board)
+    current = _plan_objective(rows, participants, boards, history)
+    best = current
+    # En iyi durumdan bu yana yapılan hücre değişiklikleri (geri almak için)
+    undo_log = []
+
+    iteration = 0
+    temperature = temperature0
+    while max_iters is None or iteration < max_iters:
+        if iteration % 256 == 0:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            temperature = temperature0 * max(0.0, 1.0 - (now - start) / time_budget) + 1e-12
+            if on_tick is not None:
+                on_tick(min(1.0, (now - start) / time_budget))
+        iteration += 1
+
+        r = rng.randrange(n_rows)
+        codes = grid[r]
+        b1 = rng.randrange(n_boards)
+        p = codes[b1]
+        if p < 0:
+            continue
+
+        if n_boards > 1 and rng.random() < 0.5:
+            # swap: aynı satırda iki sektörün katılımcıları yer değiştirir
+            b2 = rng.randrange(n_boards)
+            q = codes[b2]
+            if q < 0 or q == p:
+                continue
+            bc_p, bc_q = board_count[p], board_count[q]
+            delta = 2 * (bc_p[b2] - bc_p[b1] + bc_q[b1] - bc_q[b2] + 2) * w_board
+            if delta > 0 and rng.random() >= math.exp(-delta / temperature):
+                continue
+            bc_p[b1] -= 1
+            bc_p[b2] += 1
+            bc_q[b2] -= 1
+            bc_q[b1] += 1
+            codes[b1], codes[b2] = q, p
+            undo_log.append((r, b1, p))
+            undo_log.append((r, b2, q))
+        else:
+            # move: hücreye satırda bulunmayan başka bir katılımcı atanır
+            q = rng.randrange(n_parts)
+            members = row_members[r]
+            if q in members:
+                continue
+            if tracker is not None and not tracker.feasible(q, *row_cells[r]):
+                continue
+            delta = (2 * (total[q] - total[p] + 1) * w_total
+                     + 2 * (board_count[q][b1] - board_count[p][b1] + 1) * w_board)
+            if delta > 0 and rng.random() >= math.exp(-delta / temperature):
+                continue
+            total[p] -= 1
+            total[q] += 1
+            board_count[p][b1] -= 1
+            board_count[q][b1] += 1
+            if members[p] == 1:
+                del members[p]
+            else:
+                members[p] -= 1
+            members[q] = 1
+            codes[b1] = q
+            if tracker is not None:
+                tracker.remove(p, *row_cells[r])
+                tracker.add(q, *row_cells[r])
+            undo_log.append((r, b1, p))
+
+        current += delta
+        if current < best - 1e-12:
+            best = current
+            undo_log.clear()
+            if best <= 1e-12:
+                # Tam eşit dağılım; daha iyisi yok
+                break
+
+    # Son durum en iyi durumdan kötüyse en iyi duruma geri dön
+    for r, b_idx, p_idx in reversed(undo_log):
+        grid[r][b_idx] = p_idx
+
+    improved = []
+    for (day, slot, sc_name, assigned), codes in zip(rows, grid):
+        new_assigned = [participants[p_idx] if p_idx >= 0 else old
+                        for p_idx, old in zip(codes, assigned)]
+        improved.append((day, slot, sc_name, new_assigned + assigned[n_boards:]))
+    return improved, _plan_objective(improved, participants, boards, history)
+
+
+def _plan_objective(rows, participants, boards, history=None):
+    """fairness_objective; history verilirse geçmiş sayaçlar da dahil edilir."""
+    if history is None:
+        return fairness_objective(rows, participants, boards)
+    return objective_from_counts(np.asarray(history, dtype=np.int64) + count_matrix(rows, participants, boards))
+
+
+# -------------------------------------------------------------------------
+# Artımlı Onarım
+# -------------------------------------------------------------------------
+@dataclass
+class RepairResult:
+    """Onarılmış plan ve yeniden atanan hücre sayısı."""
+    table: PlanTable
+    repaired_cells: int
+
+
+def repair_plan(table: PlanTable, participants, boards, scenario_slots=None, board_renames=None,
+                constraints: Optional[Constraints] = None) -> RepairResult:
+    """Mevcut planı yeni yapılandırmaya göre onarır; yalnızca geçersiz hale gelen hücreler yeniden atanır.
+
+    - Listeden çıkarılan katılımcıların hücreleri boşaltılıp yeniden atanır.
+    - Silinen sektörlerin sütunları düşer, yeni sektörlerin sütunları doldurulur;
+      board_renames ({eski_ad: yeni_ad}) ile yeniden adlandırılan sektörler korunur.
+    - scenario_slots (expand_scenarios çıktısı) verilirse satırlar (gün, zaman,
+      senaryo) anahtarıyla eşleştirilir: eşleşen satırlar aynen kalır, artık
+      olmayanlar düşer, yeni satırlar doldurulur.
+    - constraints (roster_constraints.Constraints) verilirse, o gün / zaman
+      aralığında uygun olmayan katılımcıların korunan hücreleri de boşaltılır;
+      boş hücreler yalnızca kısıtlara uyan katılımcılardan doldurulur (uygun
+      katılımcı yoksa RosterError).
+    Diğer tüm atamalar değişmez. Geçerli hücreler vektörel olarak taşınır;
+    katılımcı seçimi (Balanced ile aynı ölçüt: toplam + sektör görev sayısı,
+    aynı satırda olmayanlar arasından) yalnızca boş hücreler için yapılır.
+    """
+    if not participants:
+        raise RosterError("En az bir katılımcı olmalı.")
+    if not boards:
+        raise RosterError("En az bir sektör (Board) olmalı.")
+    n_parts = len(participants)
+    n_boards = len(boards)
+
+    # Sütun eşleme: yeni sektör -> eski sütun (-1 = yeni sektör)
+    renames = board_renames or {}
+    old_b_index = {renames.get(b, b): i for i, b in enumerate(table.boards)}
+    col_src = np.array([old_b_index.get(b, -1) for b in boards], dtype=np.int64)
+
+    # Satır eşleme: yeni satır -> eski satır (-1 = yeni satır)
+    days, slots, scenario_names = list(table.days), list(table.slots), list(table.scenario_names)
+    if scenario_slots is None:
+        row_src = np.arange(len(table), dtype=np.int64)
+        day_codes, slot_codes, scenario_codes = table.day_codes, table.slot_codes, table.scenario_codes
+    else:
+        old_rows = {}
+        for i, key in enumerate(zip(table.day_codes.tolist(), table.slot_codes.tolist(),
+                                    table.scenario_codes.tolist())):
+            old_rows.setdefault(key, []).append(i)
+        for queue in old_rows.values():
+            queue.reverse()
+        day_codes = encode_categories([sc[0] for sc in scenario_slots], days)
+        slot_codes = encode_categories([sc[1] for sc in scenario_slots], slots)
+        scenario_codes = encode_categories([sc[2] for sc in scenario_slots], scenario_names)
+        row_src = np.array([
+            queue.pop() if (queue := old_rows.get(key)) else -1
+            for key in zip(day_codes.tolist(), slot_codes.tolist(), scenario_codes.tolist())
+        ], dtype=np.int64)
+
+    # Eski katılımcı kodu -> yeni kod (listede yoksa EMPTY); son eleman EMPTY (-1) kodları içindir
+    p_index = {p: i for i, p in enumerate(participants)}
+    remap = np.array([p_index.get(p, EMPTY) for p in table.participants] + [EMPTY], dtype=np.int32)
+
+    assignments = np.full((len(row_src), n_boards), EMPTY, dtype=np.int32)
+    kept_rows = np.nonzero(row_src >= 0)[0]
+    kept_cols = np.nonzero(col_src >= 0)[0]
+    assignments[np.ix_(kept_rows, kept_cols)] = remap[table.assignments[np.ix_(row_src[kept_rows],
+                                                                                col_src[kept_cols])]]
+
+    tracker = _tracker(constraints, n_parts)
+    if tracker is not None:
+        # Satırların kısıt eksenlerindeki gün / zaman kodları
+        row_d = np.array([tracker.day_code(d) for d in days], dtype=np.int64)[day_codes]
+        row_s = np.array([tracker.slot_code(s) for s in slots], dtype=np.int64)[slot_codes]
+        availability = tracker.availability
+        if availability is not None:
+            f_rows, f_cols = np.nonzero(assignments != EMPTY)
+            d, s = row_d[f_rows], row_s[f_rows]
+            inside = (d < availability.shape[1]) & (s < availability.shape[2])
+            blocked = np.zeros(len(f_rows), dtype=bool)
+            blocked[inside] = ~availability[assignments[f_rows, f_cols][inside], d[inside], s[inside]]
+            assignments[f_rows[blocked], f_cols[blocked]] = EMPTY
+        for r, b_i in np.argwhere(assignments != EMPTY):
+            tracker.add(int(assignments[r, b_i]), int(row_d[r]), int(row_s[r]))
+    no_double = tracker is not None and tracker.constraints.no_double_booking
+
+    # Sayaçlar korunan hücrelerden; yalnızca boş hücreler için seçim yapılır
+    filled = assignments != EMPTY
+    counts = np.bincount(assignments[filled].astype(np.int64) * n_boards + np.nonzero(filled)[1],
+                         minlength=n_parts * n_boards).reshape(n_parts, n_boards)
+    participant_count = counts.sum(axis=1)
+    board_count = np.ascontiguousarray(counts.T)
+    blocked_load = np.iinfo(participant_count.dtype).max
+    holes = np.argwhere(~filled)
+    for r, b_i in holes:
+        row = assignments[r]
+        if tracker is not None:
+            mask = tracker.feasible_mask(int(row_d[r]), int(row_s[r]))
+        else:
+            mask = np.ones(n_parts, dtype=bool)
+        # Aynı satırda olmayanlar tercih edilir; no_double_booking varsa zorunludur
+        free = mask.copy()
+        free[row[row != EMPTY]] = False
+        if free.any():
+            mask = free
+        elif no_double or not mask.any():
+            raise _infeasible(days[day_codes[r]], slots[slot_codes[r]], scenario_names[scenario_codes[r]],
+                              boards[b_i])
+        best_idx = int(np.argmin(np.where(mask, participant_count + board_count[b_i], blocked_load)))
+        row[b_i] = best_idx
+        participant_count[best_idx] += 1
+        board_count[b_i, best_idx] += 1
+        if tracker is not None:
+            tracker.add(best_idx, int(row_d[r]), int(row_s[r]))
+
+    repaired = PlanTable(days, slots, scenario_names, list(participants), list(boards),
+                         day_codes, slot_codes, scenario_codes, assignments)
+    return RepairResult(table=repaired, repaired_cells=len(holes))
+
+
+# -------------------------------------------------------------------------
+# Bölgelere Ayrıştırılmış Paralel Çözüm
+# -------------------------------------------------------------------------
+@dataclass
+class PlanPartition:
+    """Bağımsız çözülebilen sektör / katılımcı grubu; indeksler özgün listelerdeki sıralardır."""
+    name: str
+    board_indices: List[int]
+    participant_indices: List[int]
+
+    @property
+    def size(self):
+        return len(self.board_indices) * len(self.participant_indices)
+
+
+def board_group(board, prefix=BOARD_GROUP_PREFIX) -> str:
+    """Sektörün bölgesi: baştaki rakam olmayan kısmın ilk prefix karakteri (ör. "SWN", "SW12" -> "SW").
+
+    Rakamla başlayan sektörler kendi başına bir bölgedir.
+    """
+    letters = re.match(r"\D*", str(board)).group().strip(" -_.").upper()
+    return letters[:prefix] or str(board)
+
+
+def partition_plan(participants, boards, qualifications=None) -> List[PlanPartition]:
+    """Sektörleri ve katılımcıları birbirinden bağımsız gruplara ayırır.
+
+    Sektörler önce öneklerine göre bölgelere ayrılır (bkz. board_group).
+    qualifications'ta birden çok bölgeye yetkin görünen katılımcılar bu
+    bölgeleri birleştirir (union-find); yetkinliği verilmeyen katılımcılar,
+    sektör başına düşen katılımcı sayısı en düşük gruba sırayla dağıtılır.
+    Bir grup içinde katılımcılar grubun tüm sektörlerine atanabilir. Gruplar
+    ilk sektörlerinin sırasıyla, indeksler özgün sırayla döner.
+    """
+    groups = list(dict.fromkeys(board_group(b) for b in boards))
+    g_index = {g: i for i, g in enumerate(groups)}
+    parent = list(range(len(groups)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    home = {}
+    for p_idx, p in enumerate(participants):
+        names = (qualifications or {}).get(p)
+        if not names:
+            continue
+        g_ids = sorted({g_index[g] for g in map(board_group, names) if g in g_index})
+        if not g_ids:
+            raise RosterError(f"'{p}' katılımcısının yetkinlikleri hiçbir sektörle eşleşmiyor.")
+        for g in g_ids[1:]:
+            parent[find(g)] = find(g_ids[0])
+        home[p_idx] = g_ids[0]
+
+    partitions = {}
+    for b_idx, b in enumerate(boards):
+        root = find(g_index[board_group(b)])
+        if root not in partitions:
+            partitions[root] = PlanPartition(groups[root], [], [])
+        partitions[root].board_indices.append(b_idx)
+    for p_idx, g in home.items():
+        partitions[find(g)].participant_indices.append(p_idx)
+    pool = [p_idx for p_idx in range(len(participants)) if p_idx not in home]
+    for p_idx in pool:
+        target = min(partitions.values(), key=lambda part: len(part.participant_indices) / len(part.board_indices))
+        target.participant_indices.append(p_idx)
+
+    result = list(partitions.values())
+    for part in result:
+        if not part.participant_indices:
+            raise RosterError(f"'{part.name}' bölgesindeki sektörlere atanabilecek katılımcı yok.")
+        part.participant_indices.sort()
+    return result
+
+
+def _partition_config(config: PlanConfig, part: PlanPartition) -> PlanConfig:
+    constraints = config.constraints
+    if constraints is not None:
+        constraints = constraints.for_participants(part.participant_indices)
+    return replace(config,
+                   participants=[config.participants[i] for i in part.participant_indices],
+                   boards=[config.boards[i] for i in part.board_indices],
+                   constraints=constraints, decompose=False, qualifications={})
+
+
+def _solve_partition(job):
+    """Tek bir grubu planlar; (satırlar, tohum) döndürür.
+
+    Süreç havuzunda çalıştığı için modül düzeyindedir.
+    """
+    config, history, start_row, seed_offset = job
+    result = build_plan(config, history=history, start_row=start_row, seed_offset=seed_offset)
+    return result.rows, result.seed
+
+
+def solve_decomposed(config: PlanConfig, history=None, start_row=0, seed_offset=0, workers=None):
+    """Yapılandırmayı partition_plan gruplarına böler, grupları bir süreç havuzunda çözer.
+
+    Gruplar ayrık katılımcılarla çalıştığından kısıtlar ve iyileştirme grup
+    içinde kalır; süre tüm merkeze değil en büyük gruba bağlıdır. Büyük
+    gruplar havuza önce verilir. Satırlar özgün sektör sırasıyla
+    birleştirilir; (satırlar, tohum) döndürür. Gruplar farklı Random
+    tohumlarıyla sonuçlanırsa tohum None'dır.
+    """
+    partitions = partition_plan(config.participants, config.boards, config.qualifications)
+    jobs = []
+    for part in partitions:
+        sub_history = None
+        if history is not None:
+            sub_history = np.asarray(history, dtype=np.int64)[np.ix_(part.participant_indices, part.board_indices)]
+        jobs.append((_partition_config(config, part), sub_history, start_row, seed_offset))
+    order = sorted(range(len(jobs)), key=lambda i: -partitions[i].size)
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+    if workers == 1:
+        solved = [_solve_partition(jobs[i]) for i in order]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            solved = list(pool.map(_solve_partition, [jobs[i] for i in order]))
+    results = [None] * len(jobs)
+    for i, item in zip(order, solved):
+        results[i] = item
+
+    rows = []
+    for row_parts in zip(*(part_rows for part_rows, _ in results)):
+        day, slot, sc_name, _ = row_parts[0]
+        assigned = [None] * len(config.boards)
+        for part, (_, _, _, part_assigned) in zip(partitions, row_parts):
+            for b_idx, p in zip(part.board_indices, part_assigned):
+                assigned[b_idx] = p
+        rows.append((day, slot, sc_name, assigned))
+    seeds = {seed for _, seed in results}
+    return rows, (seeds.pop() if len(seeds) == 1 else None)
+
+
+# -------------------------------------------------------------------------
+# Plan Oluşturma
+# -------------------------------------------------------------------------
+def build_plan(config: PlanConfig, profiler=None, history=None, start_row=0, seed_offset=0,
+               on_row=None, on_tick=None) -> PlanResult:
+    """Yapılandırmadan planı oluşturur; geçersiz girdide RosterError fırlatır.
+
+    profiler (roster_profile.Profiler) verilirse genişletme/sıralama, atama,
+    iyileştirme ve puanlama aşamalarının süreleri kaydedilir.
+    history / start_row / seed_offset önceki haftalardan devreden durumdur
+    (bkz. plan_horizon): Balanced ve Optimal sayaçlarını history'den,
+    Round Robin ve Latin döngülerini start_row'dan sürdürür; Random tohumları
+    seed_offset kadar kaydırılır. history verilirse hedef geçmiş dahil hesaplanır.
+    on_row / on_tick, atama satırları ve iyileştirme için ilerleme geri
+    çağrılarıdır (bkz. ASSIGNMENT_METHODS, improve_plan). config.decompose
+    ise plan solve_decomposed ile çözülür; gruplar ayrı süreçlerde
+    çalıştığından on_row satırları gruplar birleştikten sonra bildirilir ve
+    on_tick çağrılmaz.
+    """
+    if not config.boards:
+        raise RosterError("En az bir sektör (Board) olmalı.")
+    if not config.participants:
+        raise RosterError("En az bir katılımcı olmalı.")
+    if not config.scenarios:
+        raise RosterError("En az bir senaryo satırı olmalı.")
+
+    if config.decompose:
+        with phase(profiler, "plan.decompose"):
+            rows, seed = solve_decomposed(config, history=history, start_row=start_row, seed_offset=seed_offset)
+        if on_row is not None:
+            for row in rows:
+                on_row(row)
+        with phase(profiler, "plan.objective"):
+            objective = _plan_objective(rows, config.participants, config.boards, history)
+        if profiler is not None:
+            profiler.count("plan.cells", len(rows) * len(config.boards))
+        return PlanResult(method=config.method, rows=rows, objective=objective, seed=seed)
+
+    with phase(profiler, "plan.expand_sort"):
+        expanded_scenarios = expand_scenarios(config.scenarios, config.days_of_week, config.timeslots)
+
+    # Bilinmeyen yöntemlerde Random kullanılır
+    assign = ASSIGNMENT_METHODS.get(config.method, assign_random)
+    seed = None
+    constraints = config.constraints
+    with phase(profiler, "plan.assign"):
+        if assign is assign_random and config.random_trials > 1:
+            rows, seed, _ = best_random_plan(expanded_scenarios, config.participants, config.boards,
+                                             config.random_trials,
+                                             base_seed=(config.seed or 0) + seed_offset * config.random_trials,
+                                             constraints=constraints)
+            # Denemeler ayrı süreçlerde çalışır; satırlar seçilen planla bildirilir
+            if on_row is not None:
+                for row in rows:
+                    on_row(row)
+        elif assign is assign_random and config.seed is not None:
+            seed = config.seed + seed_offset
+            rows = assign_random(expanded_scenarios, config.participants, config.boards,
+                                 rng=random.Random(seed), constraints=constraints, on_row=on_row)
+        elif assign in (assign_balanced, assign_optimal):
+            rows = assign(expanded_scenarios, config.participants, config.boards, history=history,
+                          constraints=constraints, on_row=on_row)
+        elif assign in (assign_round_robin, assign_constraint_latin):
+            rows = assign(expanded_scenarios, config.participants, config.boards, start_row=start_row,
+                          constraints=constraints, on_row=on_row)
+        else:
+            rows = assign(expanded_scenarios, config.participants, config.boards, constraints=constraints,
+                          on_row=on_row)
+
+    if config.improve_seconds > 0:
+        with phase(profiler, "plan.improve"):
+            rows, objective = improve_plan(rows, config.participants, config.boards,
+                                           time_budget=config.improve_seconds,
+                                           seed=(config.seed or 0) + seed_offset, history=history,
+                                           constraints=constraints, on_tick=on_tick)
+    else:
+        with phase(profiler, "plan.objective"):
+            objective = _plan_objective(rows, config.participants, config.boards, history)
+    if profiler is not None:
+        profiler.count("plan.cells", len(rows) * len(config.boards))
+    return PlanResult(method=config.method, rows=rows, objective=objective, seed=seed)
+
+
+def plan_horizon(config: PlanConfig, weeks, history=None, profiler=None) -> Iterator[PlanResult]:
+    """Art arda weeks haftayı planlar; her haftanın PlanResult'unu (week alanı dolu) sırayla üretir.
+
+    Her haftanın katılımcı x sektör sayaçları bir sonraki haftaya devreder;
+    böylece Balanced / Optimal yöntemleri ve iyileştirme aylar boyunca aynı
+    kişileri aynı sektörlere yığmaz. Round Robin ve Latin döngüleri kaldığı
+    satırdan sürer, Random tohumları haftaya göre kaydırılır. objective,
+    o haftaya kadarki toplam sayaçlar üzerinden hesaplanır.
+
+    Üreteçtir: yalnızca sayaç matrisi ve o haftanın satırları bellekte
+    tutulur, bu yüzden bir yıllık plan da tüketiciye (ör.
+    roster_export.write_horizon_workbook) akıtılabilir. history (katılımcı x
+    sektör, ör. önceki planlardan) başlangıç sayaçlarıdır ve değiştirilmez.
+    """
+    if weeks < 1:
+        raise RosterError("Hafta sayısı en az 1 olmalı.")
+    counts = np.zeros((len(config.participants), len(config.boards)), dtype=np.int64)
+    if history is not None:
+        counts += np.asarray(history, dtype=np.int64)
+    start_row = 0
+    for week in range(weeks):
+        result = build_plan(config, profiler=profiler, history=counts, start_row=start_row,
+                            seed_offset=week)
+        counts += count_matrix(result.rows, config.participants, config.boards)
+        start_row += len(result.rows)
+        result.week = week
+        yield result
@@ -0,0 +1,184 @@
+"""Plan verilerinin Excel dosyasına aktarılması.
+
+Çalışma kitabı openpyxl'in yalnızca-yazma (write-only) kipiyle satır satır
+akıtılarak oluşturulur; böylece bellek kullanımı plan büyüdükçe artmaz.
+Her katılımcı için tek bir adlandırılmış stil (NamedStyle) kaydedilir ve
+hücrelere adıyla atanır; böylece stil tablosu katılımcı sayısıyla sınırlı
+kalır ve hücre başına dolgu nesnesi oluşturulmaz. Sürüm farkı verilirse
+değişen hücreler, katılımcı stilinin kalın kırmızı kenarlıklı eşiyle
+işaretlenir ve değişiklikler ayrı bir sayfada listelenir.
+"""
+import hashlib
+import json
+
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Border, Font, NamedStyle, PatternFill, Side
+
+from roster_table import PlanTable
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+PARTICIPANT_COLORS = [
+    "FFB6C1", "87CEFA", "98FB98", "FFA07A", "DDA0DD", "F0E68C",
+    "FFA500", "B0E0E6", "FFD700", "90EE90", "FF69B4", "6495ED"
+]
+DEFAULT_COLOR = "FFFFFF"
+DEFAULT_STYLE = "roster_default"
+# Sürüm farkında değişen hücrelerin stil adı eki ve kenarlık rengi
+CHANGED_SUFFIX = "_changed"
+CHANGED_COLOR = "C00000"
+
+
+def plan_digest(plan_data, boards, participants):
+    """Plan, sektörler ve katılımcılar için içerik özeti (hash) döndürür.
+
+    Aynı içerik her zaman aynı özeti verir; dışa aktarma önbelleğinde anahtar
+    olarak kullanılır.
+    """
+    if isinstance(plan_data, PlanTable):
+        payload = json.dumps([list(boards), list(participants), plan_data.digest()], ensure_ascii=False)
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+    payload = json.dumps([list(boards), list(participants), list(plan_data)],
+                         ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _solid_style(name, color, changed=False):
+    fill = PatternFill(start_color=color, end_color=color, fill_type="solid")
+    if not changed:
+        return NamedStyle(name=name, fill=fill)
+    side = Side(style="thick", color=CHANGED_COLOR)
+    return NamedStyle(name=name + CHANGED_SUFFIX, fill=fill, font=Font(bold=True),
+                      border=Border(left=side, right=side, top=side, bottom=side))
+
+
+def register_participant_styles(wb, participants, changed=False):
+    """Her katılımcıya paletten bir renk verir ve katılımcı başına bir NamedStyle kaydeder.
+
+    Katılımcı -> stil adı sözlüğü döndürür. changed=True ise her stilin
+    değişen hücreler için CHANGED_SUFFIX ekli eşi de kaydedilir.
+    """
+    def add(name, color):
+        wb.add_named_style(_solid_style(name, color))
+        if changed:
+            wb.add_named_style(_solid_style(name, color, changed=True))
+
+    add(DEFAULT_STYLE, DEFAULT_COLOR)
+    style_names = {}
+    for i, p in enumerate(participants):
+        if p in style_names:
+            continue
+        name = f"roster_p{i}"
+        add(name, PARTICIPANT_COLORS[i % len(PARTICIPANT_COLORS)])
+        style_names[p] = name
+    return style_names
+
+
+def write_roster_workbook(stream, plan_data, boards, participants, write_only=True, diff=None):
+    """Planı, "Roster Plan" ve "Summary" sayfalarıyla çalışma kitabı olarak stream'e yazar.
+
+    plan_data yalnızca bir kez dolaşılır, bu yüzden üreteç (generator) de
+    olabilir; özet sayımları plan satırları yazılırken toplanır. PlanTable
+    verilirse sayımlar tek bir vektörel bincount ile hesaplanır.
+    write_only=False verilirse klasik (bellekte tutulan) çalışma kitabı kullanılır.
+    diff (roster_versions.PlanDiff, yeni sürümü plan_data olan) verilirse
+    değişen hücreler vurgulanır ve "Changes" sayfası eklenir.
+    """
+    counts = plan_data.counts_for(participants, boards).tolist() if isinstance(plan_data, PlanTable) else None
+    labelled_rows = (([day, slot, sc_name], assigned) for (day, slot, sc_name, assigned) in plan_data)
+    highlight, extra_sheets = None, None
+    if diff is not None:
+        highlight = diff.cell_mask
+
+        def extra_sheets(wb):
+            ws_changes = wb.create_sheet("Changes")
+            ws_changes.append(list(diff.changes.columns))
+            for values in diff.changes.itertuples(index=False):
+                ws_changes.append([None if isinstance(v, float) and v != v else v for v in values])
+
+    _write_workbook(stream, labelled_rows, ["Gün", "Zaman", "Senaryo"], boards, participants,
+                    counts=counts, write_only=write_only, extra_sheets=extra_sheets, highlight=highlight)
+
+
+def write_horizon_workbook(stream, weeks, boards, participants):
+    """Çok haftalık planı "Hafta" sütunlu tek bir "Roster Plan" sayfası olarak akıtarak yazar.
+
+    weeks, PlanResult üretecidir (bkz. roster_engine.plan_horizon); her hafta
+    yazıldıktan sonra bırakılır, böylece bir yıllık plan da bellekte
+    biriktirilmeden yazılır. "Summary" tüm haftaların toplamıdır, "Weeks"
+    sayfası her haftanın (kümülatif) adalet hedefini listeler.
+    """
+    objectives = []
+
+    def labelled_rows():
+        for result in weeks:
+            label = f"{result.week + 1}. Hafta"
+            objectives.append((label, result.objective))
+            for (day, slot, sc_name, assigned) in result.rows:
+                yield [label, day, slot, sc_name], assigned
+
+    def write_weeks(wb):
+        ws_weeks = wb.create_sheet("Weeks")
+        ws_weeks.append(["Hafta", "Adalet hedefi (kümülatif)"])
+        for label, objective in objectives:
+            ws_weeks.append([label, objective])
+
+    _write_workbook(stream, labelled_rows(), ["Hafta", "Gün", "Zaman", "Senaryo"], boards, participants,
+                    extra_sheets=write_weeks)
+
+
+def _write_workbook(stream, labelled_rows, headers, boards, participants, counts=None, write_only=True,
+                    extra_sheets=None, highlight=None):
+    """Ortak yazıcı: labelled_rows ([etiketler], [katılımcılar]) çiftlerini tek geçişte yazar.
+
+    counts (katılımcı x sektör) verilmezse satırlar yazılırken toplanır.
+    extra_sheets(wb), Summary'den sonra ek sayfalar yazmak için çağrılır.
+    highlight (satır x sektör bool matris) True olan hücreler değişmiş stille yazılır.
+    """
+    wb = openpyxl.Workbook(write_only=write_only)
+    if write_only:
+        ws_plan = wb.create_sheet("Roster Plan")
+    else:
+        ws_plan = wb.active
+        ws_plan.title = "Roster Plan"
+
+    style_names = register_participant_styles(wb, participants, changed=highlight is not None)
+
+    def styled(ws, value, style_name):
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = style_name
+        return cell
+
+    # Başlıklar
+    ws_plan.append(list(headers) + list(boards))
+
+    count_rows = counts is None
+    p_index = {p: i for i, p in enumerate(participants)}
+    n_boards = len(boards)
+    if count_rows:
+        counts = [[0] * n_boards for _ in participants]
+
+    for row_idx, (labels, assigned) in enumerate(labelled_rows):
+        row = list(labels)
+        marked = highlight[row_idx] if highlight is not None and row_idx < len(highlight) else ()
+        for b_idx, p in enumerate(assigned):
+            style_name = style_names.get(p, DEFAULT_STYLE)
+            if b_idx < len(marked) and marked[b_idx]:
+                style_name += CHANGED_SUFFIX
+            row.append(styled(ws_plan, p, style_name))
+            # Listeden çıkarılmış katılımcılar özete dahil edilmez
+            p_idx = p_index.get(p) if count_rows else None
+            if p_idx is not None and b_idx < n_boards:
+                counts[p_idx][b_idx] += 1
+        ws_plan.append(row)
+
+    # Summary sayfası
+    ws_summary = wb.create_sheet("Summary")
+    ws_summary.append(["Katılımcı"] + list(boards) + ["Toplam"])
+    for p, p_counts in zip(participants, counts):
+        ws_summary.append([styled(ws_summary, p, style_names[p])] + p_counts + [sum(p_counts)])
+
+    if extra_sheets is not None:
+        extra_sheets(wb)
+    wb.save(stream)
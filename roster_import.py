@@ -0,0 +1,185 @@
+"""Katılımcı, sektör, gün, zaman aralığı ve senaryoların Excel / CSV'den toplu içe aktarılması.
+
+Excel dosyaları openpyxl'in salt-okunur (read-only) kipiyle satır satır
+akıtılır; CSV dosyaları da satır satır okunur. Tüm satırlar tek seferde
+doğrulanır ve sonuç tek bir ImportResult olarak döner; arayüz bunu oturuma
+tek bir güncellemeyle uygular.
+
+Excel çalışma kitabında sayfa adları (büyük/küçük harf duyarsız) şunlardan
+biri olmalıdır: Katılımcılar / Participants, Sektörler / Boards,
+Günler / Days, Zaman Aralıkları / Timeslots, Standart Senaryolar /
+Standard Scenarios, Senaryolar / Scenarios. Liste sayfalarında ilk sütun
+okunur; Senaryolar sayfası Senaryo, Gün, Zaman, Tekrar sütunlarından oluşur.
+İlk satır bir başlık satırıysa atlanır.
+"""
+import csv
+import io
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import openpyxl
+
+# Oturumdaki liste adı -> kabul edilen sayfa adları
+IMPORT_KINDS = {
+    "participants": ("katılımcılar", "participants"),
+    "boards": ("sektörler", "boards"),
+    "days_of_week": ("günler", "days"),
+    "timeslots": ("zaman aralıkları", "timeslots"),
+    "standard_scenarios": ("standart senaryolar", "standard scenarios"),
+    "scenarios": ("senaryolar", "scenarios"),
+}
+
+HEADER_WORDS = {
+    "katılımcı", "katılımcılar", "participant", "participants", "ad", "name",
+    "sektör", "sektörler", "board", "boards", "gün", "günler", "day", "days",
+    "zaman", "zaman aralığı", "timeslot", "timeslots", "senaryo", "senaryo adı", "scenario",
+}
+
+# Arayüzdeki Tekrar sınırları
+MIN_REPEAT = 1
+MAX_REPEAT = 20
+
+
+@dataclass
+class ImportResult:
+    """İçe aktarılan listeler ({oturum_anahtarı: değerler}) ve doğrulama mesajları."""
+    data: Dict[str, list] = field(default_factory=dict)
+    errors: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+
+    @property
+    def row_count(self):
+        return sum(len(values) for values in self.data.values())
+
+
+def _clean(value):
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _is_header(row):
+    return bool(row) and _clean(row[0]).lower() in HEADER_WORDS
+
+
+def _collect(kind, rows, result, source):
+    """Bir türün satırlarını doğrular ve result.data[kind] listesine ekler."""
+    values = result.data.setdefault(kind, [])
+    seen = set(map(tuple, values)) if kind == "scenarios" else set(values)
+    for line_no, row in enumerate(rows, start=1):
+        row = list(row or ())
+        if line_no == 1 and _is_header(row):
+            continue
+        if not any(_clean(v) for v in row):
+            continue
+
+        if kind != "scenarios":
+            name = _clean(row[0])
+            if not name:
+                result.errors.append(f"{source} satır {line_no}: ilk sütun boş.")
+            elif name in seen:
+                result.warnings.append(f"{source} satır {line_no}: '{name}' tekrar ediyor, atlandı.")
+            else:
+                seen.add(name)
+                values.append(name)
+            continue
+
+        cells = [_clean(v) for v in row[:4]] + [""] * (4 - len(row[:4]))
+        sc_name, sc_day, sc_slot, sc_rep = cells
+        if not (sc_name and sc_day and sc_slot):
+            result.errors.append(f"{source} satır {line_no}: Senaryo, Gün ve Zaman dolu olmalı.")
+            continue
+        try:
+            rep = int(sc_rep) if sc_rep else 1
+        except ValueError:
+            result.errors.append(f"{source} satır {line_no}: Tekrar sayı olmalı ('{sc_rep}').")
+            continue
+        if not MIN_REPEAT <= rep <= MAX_REPEAT:
+            result.errors.append(f"{source} satır {line_no}: Tekrar {MIN_REPEAT}-{MAX_REPEAT} arasında olmalı.")
+            continue
+        values.append([sc_name, sc_day, sc_slot, rep])
+
+
+def kind_for_sheet(sheet_name):
+    """Sayfa adına karşılık gelen oturum anahtarı; tanınmıyorsa None."""
+    key = sheet_name.strip().lower()
+    for kind, names in IMPORT_KINDS.items():
+        if key in names:
+            return kind
+    return None
+
+
+def read_workbook(stream):
+    """Excel çalışma kitabını salt-okunur kipte akıtarak okur."""
+    result = ImportResult()
+    wb = openpyxl.load_workbook(stream, read_only=True, data_only=True)
+    try:
+        for ws in wb.worksheets:
+            kind = kind_for_sheet(ws.title)
+            if kind is None:
+                result.warnings.append(f"'{ws.title}' sayfası tanınmadı, atlandı.")
+                continue
+            _collect(kind, ws.iter_rows(values_only=True), result, ws.title)
+    finally:
+        wb.close()
+    return result
+
+
+def read_csv(stream, kind, encoding="utf-8-sig"):
+    """Tek bir türe ait CSV dosyasını satır satır okur; stream ikili (binary) olabilir."""
+    if kind not in IMPORT_KINDS:
+        raise ValueError(f"Bilinmeyen içe aktarma türü: {kind}")
+    result = ImportResult()
+    is_binary = not isinstance(stream, io.TextIOBase)
+    text = io.TextIOWrapper(stream, encoding=encoding, newline="") if is_binary else stream
+    try:
+        first_line = text.readline()
+        # Excel'in Türkçe yerel ayarı CSV'yi noktalı virgülle kaydeder
+        delimiter = ";" if first_line.count(";") > first_line.count(",") else ","
+        lines = _chain_first(first_line, text)
+        _collect(kind, csv.reader(lines, delimiter=delimiter), result, "CSV")
+    finally:
+        if is_binary:
+            text.detach()
+    return result
+
+
+def _chain_first(first_line, rest):
+    if first_line:
+        yield first_line
+    yield from rest
+
+
+def merge_lists(current, result, replace=False):
+    """İçe aktarılan listeleri mevcut listelerle birleştirir; {anahtar: yeni liste} döndürür.
+
+    replace=True ise içe aktarılan türler mevcut listelerin yerine geçer,
+    aksi halde yalnızca yeni değerler sona eklenir. Senaryolarda bilinmeyen
+    senaryo / gün / zaman adları result.warnings'e eklenir.
+    """
+    merged = {}
+    for kind, values in result.data.items():
+        if replace:
+            merged[kind] = list(values)
+        elif kind == "scenarios":
+            merged[kind] = list(current.get(kind, [])) + list(values)
+        else:
+            existing = list(current.get(kind, []))
+            known = set(existing)
+            merged[kind] = existing + [v for v in values if v not in known]
+
+    imported = result.data.get("scenarios", [])
+    if imported:
+        checks = [
+            (0, "standard_scenarios", "Standart senaryolar arasında olmayan senaryolar"),
+            (1, "days_of_week", "Gün listesinde olmayan günler (sona sıralanır)"),
+            (2, "timeslots", "Zaman aralıkları arasında olmayan zamanlar (sona sıralanır)"),
+        ]
+        for col, kind, message in checks:
+            known = set(merged.get(kind, current.get(kind, [])))
+            unknown = sorted({sc[col] for sc in imported} - known)
+            if unknown:
+                result.warnings.append(f"{message}: {', '.join(unknown)}")
+    return merged
@@ -0,0 +1,111 @@
+"""Plan oluşturmanın arka planda (ayrı bir iş parçacığında) yürütülmesi.
+
+PlanJob, build_plan'ı bir iş parçacığında çalıştırır; tamamlanan satırları,
+ilerleme oranını ve aşamayı arayüzün okuyabileceği alanlarda tutar.
+İptal, ilerleme geri çağrısında PlanCancelled fırlatılarak yapılır; bu
+yüzden iş bir sonraki satırda (iyileştirmede birkaç yüz hamle içinde) durur.
+Streamlit'e bağlı değildir.
+"""
+import threading
+import time
+
+from roster_engine import PlanCancelled, PlanConfig, RosterError, build_plan, expand_scenarios
+
+# İş durumları
+RUNNING = "running"
+DONE = "done"
+CANCELLED = "cancelled"
+FAILED = "failed"
+
+
+class PlanJob:
+    """Tek bir plan oluşturma işi.
+
+    Arayüz iş parçacığı yalnızca okur: state, progress (0-1), phase,
+    partial_rows (tamamlanan satırlar), result, cached, error. Planlama
+    iş parçacığı bu alanları günceller; list.append ve atamalar atomik
+    olduğundan kilit gerekmez.
+    """
+
+    def __init__(self, config: PlanConfig, cache=None, profiler=None):
+        self.config = config
+        self.cache = cache
+        self.profiler = profiler
+        self.state = RUNNING
+        self.progress = 0.0
+        self.phase = "Hazırlanıyor"
+        self.partial_rows = []
+        self.result = None
+        self.cached = False
+        self.error = None
+        self.started_at = None
+        self.finished_at = None
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="roster-plan-job", daemon=True)
+        self._total_rows = 0
+        self._improves = config.improve_seconds > 0
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """İptal ister; iş bir sonraki ilerleme bildiriminde durur."""
+        self._cancel.set()
+
+    def wait(self, timeout=None):
+        """İş bitene kadar (en fazla timeout saniye) bekler; iş bittiyse True döndürür."""
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    @property
+    def finished(self):
+        return self.state != RUNNING
+
+    @property
+    def elapsed(self):
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    # --- planlama iş parçacığı ---
+    def _on_row(self, row):
+        if self._cancel.is_set():
+            raise PlanCancelled()
+        self.partial_rows.append(row)
+        share = 0.5 if self._improves else 1.0
+        self.progress = share * len(self.partial_rows) / max(1, self._total_rows)
+
+    def _on_tick(self, fraction):
+        if self._cancel.is_set():
+            raise PlanCancelled()
+        self.phase = "İyileştiriliyor"
+        self.progress = 0.5 + 0.5 * fraction
+
+    def _run(self):
+        config = self.config
+        try:
+            self._total_rows = len(expand_scenarios(config.scenarios, config.days_of_week, config.timeslots))
+            self.phase = "Atanıyor"
+            callbacks = {"on_row": self._on_row, "on_tick": self._on_tick}
+            if self.cache is not None:
+                self.result, self.cached = self.cache.get_or_build(config, profiler=self.profiler, **callbacks)
+            else:
+                self.result = build_plan(config, profiler=self.profiler, **callbacks)
+            self.progress = 1.0
+            self.phase = "Tamamlandı"
+            self.state = DONE
+        except PlanCancelled:
+            self.phase = "İptal edildi"
+            self.state = CANCELLED
+        except RosterError as exc:
+            self.error = str(exc)
+            self.phase = "Hata"
+            self.state = FAILED
+        except Exception as exc:  # iş parçacığındaki beklenmeyen hatalar arayüze taşınır
+            self.error = f"Beklenmeyen hata: {exc!r}"
+            self.phase = "Hata"
+            self.state = FAILED
+        finally:
+            self.finished_at = time.perf_counter()
@@ -0,0 +1,263 @@
+"""Streamlit arayüzü için çok oturumlu yük testi aracı.
+
+Streamlit'in uygulama test API'si (streamlit.testing.v1.AppTest) ile
+rosterstreamlit.py'yi tarayıcısız çalıştırır. Her sanal oturum gerçekçi bir
+akış izler: katılımcı ekleme, senaryo satırı ekleme, yöntem seçme, plan
+oluşturma, yeniden planlama ve kişisel program paketi hazırlama. Her
+etkileşim main()'in baştan sona yeniden çalıştırılmasıdır (rerun); adım
+başına rerun süresi yüzdelikleri (p50 / p90 / p95 / p99) ve ayrı bir
+geçişte tracemalloc ile oturum başına kalıcı bellek ölçülür. Sonuçlar
+roster_bench.py ile aynı biçimde JSON olarak yazılır; kayıtlı bir temel
+ölçüme göre p95'i yavaşlayan adımlar işaretlenir.
+
+Oturumlar --concurrency kadar iş parçacığında eşzamanlı yürütülür; tüm
+oturumlar aynı süreçte olduğundan st.cache_resource ile paylaşılan plan
+önbelleği ve kayıt deposu gerçek sunucudaki gibi ortaktır. Kayıt deposu
+geçici bir dizine yazılır.
+
+Kullanım::
+
+    python roster_loadtest.py --sessions 20 --concurrency 4 -o load.json
+    python roster_loadtest.py --quick --baseline load_baseline.json
+    python roster_loadtest.py --baseline load_baseline.json --update-baseline
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+from roster_engine import ASSIGNMENT_METHODS
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rosterstreamlit.py")
+
+PERCENTILES = (50, 90, 95, 99)
+
+# Tek bir rerun için en fazla bekleme süresi (sn)
+RERUN_TIMEOUT = 120
+# Arka plan plan işi bitene kadar en fazla kaç kez yeniden çalıştırılır
+MAX_PLAN_POLLS = 200
+
+# Oturum / eşzamanlılık / bellek oturumu / katılımcı / senaryo satırı varsayılanları
+DEFAULT_SETTINGS = {"sessions": 20, "concurrency": 4, "memory_sessions": 5, "participants": 12, "scenario_rows": 8}
+QUICK_SETTINGS = {"sessions": 4, "concurrency": 2, "memory_sessions": 2, "participants": 8, "scenario_rows": 4}
+
+# Bu süreden kısa p95 değerleri gürültü sayılır ve gerileme olarak işaretlenmez (sn)
+MIN_REGRESSION_SECONDS = 0.02
+
+
+class SessionFlow:
+    """Tek bir sanal oturum; her adım bir rerun'dır ve süresi samples'a eklenir.
+
+    samples: [(adım adı, saniye), ...]
+    """
+
+    def __init__(self, index, participants=12, scenario_rows=8, improve_seconds=0.0, bundle=True):
+        self.index = index
+        self.participants = participants
+        self.scenario_rows = scenario_rows
+        self.improve_seconds = improve_seconds
+        self.bundle = bundle
+        self.samples = []
+        self.at = AppTest.from_file(APP_PATH, default_timeout=RERUN_TIMEOUT)
+
+    def _timed(self, step, action):
+        start = time.perf_counter()
+        action()
+        self.samples.append((step, time.perf_counter() - start))
+        if self.at.exception:
+            raise RuntimeError(f"Oturum {self.index}, {step}: {self.at.exception[0].value}")
+
+    def run(self):
+        at = self.at
+        methods = list(ASSIGNMENT_METHODS)
+        self._timed("initial", at.run)
+        # Oturumlar farklı boyutlarla başlar; aynı yapılandırmalar paylaşılan plan önbelleğinden gelir
+        for _ in range(self.participants + self.index % 5):
+            self._timed("add_participant", at.button(key="add_participant_btn").click().run)
+        self._timed("scenario_count", at.number_input(key="bulk_add_scenario_count")
+                    .set_value(self.scenario_rows).run)
+        self._timed("add_scenarios", at.button(key="add_new_scenario_btn").click().run)
+        if self.improve_seconds:
+            self._timed("improve_seconds", at.number_input(key="improve_seconds")
+                        .set_value(self.improve_seconds).run)
+
+        for step, method in (("create_plan", methods[self.index % len(methods)]),
+                             ("replan", methods[(self.index + 1) % len(methods)])):
+            method_box = next(box for box in at.selectbox if box.label == "Yöntem")
+            self._timed("select_method", method_box.set_value(method).run)
+            self._timed(step, at.button(key="create_plan_btn").click().run)
+            self._wait_for_plan()
+
+        if self.bundle:
+            self._timed("export_bundle", at.button(key="bundle_btn").click().run)
+        return self
+
+    def _wait_for_plan(self):
+        # Uzun işler arka planda sürer; arayüz her yoklamada yeniden çalıştırılır
+        for _ in range(MAX_PLAN_POLLS):
+            if "plan_job" not in self.at.session_state:
+                return
+            time.sleep(0.05)
+            self._timed("plan_poll", self.at.run)
+        raise RuntimeError(f"Oturum {self.index}: plan işi bitmedi.")
+
+
+def percentiles(seconds):
+    """Süre listesi için count / mean / p50..p99 / max sözlüğü (sn)."""
+    values = np.asarray(seconds, dtype=np.float64)
+    stats = {"count": int(values.size), "mean": float(values.mean()), "max": float(values.max())}
+    for q, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+        stats[f"p{q}"] = float(value)
+    return stats
+
+
+def run_latency(sessions, concurrency, **flow_kwargs):
+    """Oturumları eşzamanlı yürütür; (adım -> süre istatistikleri, toplam süre) döndürür."""
+    def one(index):
+        return SessionFlow(index, **flow_kwargs).run().samples
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        all_samples = [s for samples in pool.map(one, range(sessions)) for s in samples]
+    wall = time.perf_counter() - start
+
+    by_step = {}
+    for step, seconds in all_samples:
+        by_step.setdefault(step, []).append(seconds)
+    steps = {step: percentiles(values) for step, values in by_step.items()}
+    steps["all"] = percentiles([seconds for _, seconds in all_samples])
+    return steps, wall
+
+
+def run_memory(sessions, **flow_kwargs):
+    """Oturumları sırayla, tracemalloc açıkken yürütür; oturum başına kalıcı bellek (bayt) listesi döndürür.
+
+    Oturumlar ölçüm boyunca canlı tutulur; böylece her oturumun kalıcı
+    bellek farkı, sunucuda açık kalan bir oturumun maliyetine karşılık gelir.
+    Süreler bu geçişte ölçülmez (tracemalloc yavaşlatır).
+    """
+    alive = []
+    retained = []
+    tracemalloc.start()
+    try:
+        for index in range(sessions):
+            before = tracemalloc.get_traced_memory()[0]
+            alive.append(SessionFlow(index, **flow_kwargs).run())
+            retained.append(tracemalloc.get_traced_memory()[0] - before)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return retained, peak
+
+
+def _format_step(step, stats):
+    return (f"{step:<18} n={stats['count']:<5} p50={stats['p50'] * 1000:8.1f} ms "
+            f"p95={stats['p95'] * 1000:8.1f} ms p99={stats['p99'] * 1000:8.1f} ms "
+            f"max={stats['max'] * 1000:8.1f} ms")
+
+
+def find_regressions(steps, baseline, tolerance):
+    """Temel ölçüme göre p95'i (1 + tolerance) katından fazla artan adımları döndürür."""
+    regressions = []
+    for step, stats in steps.items():
+        base = baseline.get(step)
+        if base is None:
+            continue
+        slower = stats["p95"] > base["p95"] * (1 + tolerance)
+        if slower and stats["p95"] - base["p95"] > MIN_REGRESSION_SECONDS:
+            regressions.append({"step": step, "p95": stats["p95"], "baseline_p95": base["p95"],
+                                "ratio": stats["p95"] / base["p95"]})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Roster Streamlit arayüzü için çok oturumlu yük testi.")
+    parser.add_argument("-o", "--output", help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--quick", action="store_true", help="Az oturum ve küçük akışla çalıştır")
+    parser.add_argument("--sessions", type=int, help="Süre ölçümündeki oturum sayısı")
+    parser.add_argument("--concurrency", type=int, help="Eşzamanlı oturum sayısı")
+    parser.add_argument("--memory-sessions", type=int, help="Bellek ölçümündeki oturum sayısı (0 = ölçme)")
+    parser.add_argument("--participants", type=int, help="Oturum başına eklenecek katılımcı sayısı")
+    parser.add_argument("--scenario-rows", type=int, help="Oturum başına eklenecek senaryo satırı")
+    parser.add_argument("--improve-seconds", type=float, default=0.0,
+                        help="Plan iyileştirme süresi (arka plan işini ve yoklamayı da ölçer)")
+    parser.add_argument("--no-bundle", action="store_true", help="Kişisel program paketini hazırlama")
+    parser.add_argument("--baseline", help="Karşılaştırılacak temel ölçüm JSON dosyası")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Gerileme eşiği (0.25 = %%25 daha yavaş)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Sonuçları --baseline dosyasına temel ölçüm olarak yaz")
+    args = parser.parse_args(argv)
+
+    # Açıkça verilen değerler --quick varsayılanlarından önce gelir
+    for name, value in (QUICK_SETTINGS if args.quick else DEFAULT_SETTINGS).items():
+        if getattr(args, name) is None:
+            setattr(args, name, value)
+    flow_kwargs = {"participants": args.participants, "scenario_rows": args.scenario_rows,
+                   "improve_seconds": args.improve_seconds, "bundle": not args.no_bundle}
+
+    with tempfile.TemporaryDirectory(prefix="roster_loadtest_") as tmp:
+        # Yük testi gerçek kayıt deposuna ve disk önbelleğine yazmaz
+        os.environ["ROSTER_DB_PATH"] = os.path.join(tmp, "roster.db")
+        os.environ.pop("ROSTER_PLAN_CACHE_DIR", None)
+        steps, wall = run_latency(args.sessions, args.concurrency, **flow_kwargs)
+        memory = None
+        if args.memory_sessions > 0:
+            retained, peak = run_memory(args.memory_sessions, **flow_kwargs)
+            memory = {"sessions": len(retained), "retained_bytes": retained,
+                      "mean_bytes": float(np.mean(retained)), "max_bytes": int(max(retained)),
+                      "peak_bytes": int(peak)}
+
+    for step, stats in steps.items():
+        print(_format_step(step, stats), file=sys.stderr)
+    reruns = steps["all"]["count"]
+    print(f"{args.sessions} oturum, {reruns} rerun, {wall:.1f} sn ({reruns / wall:.1f} rerun/sn, "
+          f"eşzamanlılık {args.concurrency})", file=sys.stderr)
+    if memory is not None:
+        print(f"Oturum başına bellek: ortalama {memory['mean_bytes'] / 1e6:.2f} MB, "
+              f"en fazla {memory['max_bytes'] / 1e6:.2f} MB", file=sys.stderr)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "settings": {"sessions": args.sessions, "concurrency": args.concurrency, **flow_kwargs},
+        "wall_seconds": wall,
+        "steps": steps,
+        "memory": memory,
+    }
+
+    regressions = []
+    if args.baseline and not args.update_baseline:
+        try:
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)["steps"]
+        except (OSError, ValueError, KeyError) as exc:
+            print(f"Temel ölçüm okunamadı: {exc}", file=sys.stderr)
+            return 2
+        regressions = find_regressions(steps, baseline, args.tolerance)
+        report["regressions"] = regressions
+        for r in regressions:
+            print(f"GERİLEME: {r['step']} p95 {r['p95'] * 1000:.1f} ms (temel: {r['baseline_p95'] * 1000:.1f} ms, "
+                  f"x{r['ratio']:.2f})", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.baseline and args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""Sıcak yollar için hafif zamanlayıcı ve sayaçlar.
+
+Profiler, ölçümleri sınırlı boyutlu (kayan) bir tamponda tutar; Streamlit
+oturumu başına bir tane oluşturulup plan oluşturma, dışa aktarma ve
+arayüz bölümlerinin sürelerini toplamak için kullanılır. Streamlit'e bağlı
+değildir; motor (roster_engine) da aynı nesneyi kullanabilir.
+"""
+import json
+import time
+from collections import Counter, deque
+from contextlib import contextmanager, nullcontext
+
+import numpy as np
+
+
+class Profiler:
+    """Aşama süreleri (ms) için kayan tampon ve olay sayaçları."""
+
+    def __init__(self, maxlen=1000):
+        self.events = deque(maxlen=maxlen)
+        self.counters = Counter()
+        self._lap_start = time.perf_counter()
+
+    def record(self, phase, ms):
+        self.events.append({"phase": phase, "ms": ms, "ts": time.time()})
+
+    @contextmanager
+    def timer(self, phase):
+        """with bloğunun süresini phase adıyla kaydeder."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, (time.perf_counter() - start) * 1000.0)
+
+    def reset_lap(self):
+        """lap() ölçümünün başlangıcını şimdiye alır."""
+        self._lap_start = time.perf_counter()
+
+    def lap(self, phase):
+        """Bir önceki lap / reset_lap çağrısından bu yana geçen süreyi phase adıyla kaydeder.
+
+        Uzun kod bloklarını girintilemeden ardışık bölümlere ayırmak için kullanılır.
+        """
+        now = time.perf_counter()
+        self.record(phase, (now - self._lap_start) * 1000.0)
+        self._lap_start = now
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    def clear(self):
+        self.events.clear()
+        self.counters.clear()
+
+    def summary(self):
+        """Aşama başına çağrı sayısı, son / ortalama / p50 / p95 / en yüksek süre (ms)."""
+        by_phase = {}
+        # Arka plan işi olay eklerken deque üzerinde dolaşılmaz; önce kopyası alınır
+        for event in list(self.events):
+            by_phase.setdefault(event["phase"], []).append(event["ms"])
+        rows = []
+        for phase, values in by_phase.items():
+            arr = np.asarray(values)
+            rows.append({
+                "phase": phase,
+                "calls": len(values),
+                "last_ms": round(values[-1], 2),
+                "mean_ms": round(float(arr.mean()), 2),
+                "p50_ms": round(float(np.percentile(arr, 50)), 2),
+                "p95_ms": round(float(np.percentile(arr, 95)), 2),
+                "max_ms": round(float(arr.max()), 2),
+            })
+        rows.sort(key=lambda r: r["phase"])
+        return rows
+
+    def to_json(self):
+        """Özet, sayaçlar ve ham olaylar JSON metni olarak."""
+        return json.dumps({
+            "summary": self.summary(),
+            "counters": dict(self.counters),
+            "events": list(self.events),
+        }, ensure_ascii=False, indent=2)
+
+
+def phase(profiler, name):
+    """profiler None ise hiçbir şey yapmayan, değilse süre ölçen bağlam yöneticisi."""
+    return profiler.timer(name) if profiler is not None else nullcontext()
@@ -0,0 +1,202 @@
+"""Yapılandırmaların ve oluşturulan planların yerel SQLite veritabanında saklanması.
+
+Plan hücreleri (katılımcı, sektör, gün, ...) tek tabloda satır satır
+tutulur; katılımcı, sektör, gün ve plan tarihi üzerindeki indeksler
+"ATC7 son 12 haftada SEF'te kaç kez görev aldı" gibi geçmiş sorgularını
+yıllarca veri biriktiğinde de milisaniyeler içinde yanıtlar.
+"""
+import json
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+
+from roster_table import PlanTable
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS configs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    saved_at TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS plans (
+    id INTEGER PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    plan_date TEXT NOT NULL,
+    method TEXT,
+    objective REAL,
+    config_name TEXT,
+    boards TEXT NOT NULL,
+    participants TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS assignments (
+    plan_id INTEGER NOT NULL REFERENCES plans(id) ON DELETE CASCADE,
+    row_idx INTEGER NOT NULL,
+    plan_date TEXT NOT NULL,
+    day TEXT NOT NULL,
+    slot TEXT NOT NULL,
+    scenario TEXT NOT NULL,
+    board TEXT NOT NULL,
+    participant TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_assign_participant ON assignments(participant, board, plan_date);
+CREATE INDEX IF NOT EXISTS idx_assign_board ON assignments(board, plan_date);
+CREATE INDEX IF NOT EXISTS idx_assign_day ON assignments(day, plan_date);
+CREATE INDEX IF NOT EXISTS idx_assign_plan ON assignments(plan_id, row_idx);
+CREATE INDEX IF NOT EXISTS idx_plans_date ON plans(plan_date);
+"""
+
+# executemany ile tek seferde gönderilen satır sayısı
+INSERT_BATCH_SIZE = 10000
+
+
+class RosterStore:
+    """Roster yapılandırmaları ve plan geçmişi için SQLite deposu.
+
+    Tek bağlantı tüm Streamlit oturumlarınca (iş parçacıklarınca) paylaşılır;
+    işlemler ve sorgular _lock ile sıraya konur, böylece bir oturumun commit /
+    rollback'i başka bir oturumun yarım kalmış işlemini etkilemez.
+    """
+
+    def __init__(self, path="roster.db"):
+        self.path = path
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    # --- yapılandırmalar ---
+    def save_config(self, name, config):
+        """Yapılandırmayı (JSON'a çevrilebilir dict) adıyla kaydeder; aynı ad varsa üzerine yazar."""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO configs(name, saved_at, data) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET saved_at=excluded.saved_at, data=excluded.data",
+                (name, datetime.now().isoformat(timespec="seconds"), json.dumps(config, ensure_ascii=False)),
+            )
+
+    def load_config(self, name):
+        """Kayıtlı yapılandırmayı döndürür; yoksa None."""
+        with self._lock:
+            row = self.conn.execute("SELECT data FROM configs WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def list_configs(self):
+        with self._lock:
+            return [r[0] for r in self.conn.execute("SELECT name FROM configs ORDER BY name")]
+
+    # --- planlar ---
+    def save_plan(self, plan_data, participants, boards, plan_date=None, method=None,
+                  objective=None, config_name=None):
+        """Planı ve tüm hücrelerini tek işlemde, toplu (batched) ekleme ile kaydeder; plan id'sini döndürür.
+
+        plan_date, planın ait olduğu haftanın / dönemin tarihidir (varsayılan: bugün);
+        geçmiş sorguları bu tarihe göre yapılır.
+        """
+        plan_date = (plan_date or date.today()).isoformat()
+        with self._lock, self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO plans(created_at, plan_date, method, objective, config_name, boards, participants) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (datetime.now().isoformat(timespec="seconds"), plan_date, method, objective, config_name,
+                 json.dumps(list(boards), ensure_ascii=False),
+                 json.dumps(list(participants), ensure_ascii=False)),
+            )
+            plan_id = cur.lastrowid
+
+            batch = []
+            for row_idx, (day, slot, sc_name, assigned) in enumerate(plan_data):
+                for b_name, p in zip(boards, assigned):
+                    if p is None:
+                        continue
+                    batch.append((plan_id, row_idx, plan_date, day, slot, sc_name, b_name, p))
+                if len(batch) >= INSERT_BATCH_SIZE:
+                    self._insert_assignments(batch)
+                    batch = []
+            if batch:
+                self._insert_assignments(batch)
+        return plan_id
+
+    def _insert_assignments(self, batch):
+        self.conn.executemany(
+            "INSERT INTO assignments(plan_id, row_idx, plan_date, day, slot, scenario, board, participant) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            batch,
+        )
+
+    def list_plans(self, limit=100):
+        """Son kaydedilen planların özet bilgilerini (dict listesi) döndürür."""
+        keys = ["id", "created_at", "plan_date", "method", "objective", "config_name"]
+        with self._lock:
+            cur = self.conn.execute(
+                "SELECT id, created_at, plan_date, method, objective, config_name FROM plans "
+                "ORDER BY id DESC LIMIT ?", (limit,))
+            return [dict(zip(keys, r)) for r in cur]
+
+    def load_plan(self, plan_id, days_of_week=(), timeslots=()):
+        """Kayıtlı planı PlanTable olarak döndürür; yoksa None.
+
+        days_of_week / timeslots verilirse gün ve zaman kategorileri bu sırayla
+        kurulur (planda hiç geçmeyen zaman aralıkları da korunur); ardışıklık
+        ve boşluk analizleri komşu zaman aralıklarını bu sıradan bulur.
+        """
+        with self._lock:
+            meta = self.conn.execute(
+                "SELECT boards, participants FROM plans WHERE id = ?", (plan_id,)).fetchone()
+            cells = [] if meta is None else self.conn.execute(
+                "SELECT row_idx, day, slot, scenario, board, participant FROM assignments "
+                "WHERE plan_id = ? ORDER BY row_idx", (plan_id,)).fetchall()
+        if meta is None:
+            return None
+        boards = json.loads(meta[0])
+        participants = json.loads(meta[1])
+        b_index = {b: i for i, b in enumerate(boards)}
+
+        rows = []
+        current_idx = None
+        for row_idx, day, slot, sc_name, b_name, p in cells:
+            if row_idx != current_idx:
+                rows.append((day, slot, sc_name, [None] * len(boards)))
+                current_idx = row_idx
+            rows[-1][3][b_index[b_name]] = p
+        return PlanTable.from_rows(rows, participants, boards, days_of_week, timeslots)
+
+    def delete_plan(self, plan_id):
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM plans WHERE id = ?", (plan_id,))
+
+    # --- geçmiş sorguları ---
+    def count_assignments(self, participant, board=None, since=None, weeks=None):
+        """Katılımcının (isteğe bağlı olarak belirli bir sektörde) görev sayısı.
+
+        since (date) veya weeks (bugünden geriye hafta sayısı) verilirse yalnızca
+        bu tarihten itibaren olan planlar sayılır.
+        """
+        if weeks is not None:
+            since = date.today() - timedelta(weeks=weeks)
+        query = "SELECT COUNT(*) FROM assignments WHERE participant = ?"
+        params = [participant]
+        if board is not None:
+            query += " AND board = ?"
+            params.append(board)
+        if since is not None:
+            query += " AND plan_date >= ?"
+            params.append(since.isoformat())
+        with self._lock:
+            return self.conn.execute(query, params).fetchone()[0]
+
+    def board_history(self, participant, since=None):
+        """Katılımcının sektör bazlı görev sayıları: {sektör: sayı}."""
+        query = "SELECT board, COUNT(*) FROM assignments WHERE participant = ?"
+        params = [participant]
+        if since is not None:
+            query += " AND plan_date >= ?"
+            params.append(since.isoformat())
+        query += " GROUP BY board"
+        with self._lock:
+            return dict(self.conn.execute(query, params).fetchall())
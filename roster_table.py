@@ -0,0 +1,158 @@
+"""Planın sütunlu (columnar) ve tamsayı kodlu gösterimi.
+
+Gün, zaman, senaryo ve katılımcı adları birer kez kategori listelerinde
+tutulur; plan satırları NumPy tamsayı dizilerindeki kodlardan oluşur.
+PlanTable, (gün, zaman, senaryo, [katılımcılar]) satırlarını döndüren
+eski plan_data listesiyle aynı şekilde dolaşılabilir.
+"""
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+# Atanmamış / eksik hücre kodu
+EMPTY = -1
+
+
+def encode_categories(values, categories):
+    """Değerleri kategori kodlarına çevirir; listede olmayanları kategorilere ekler."""
+    index = {c: i for i, c in enumerate(categories)}
+    codes = np.empty(len(values), dtype=np.int32)
+    for i, v in enumerate(values):
+        code = index.get(v)
+        if code is None:
+            code = index[v] = len(categories)
+            categories.append(v)
+        codes[i] = code
+    return codes
+
+
+class PlanTable:
+    """Roster planının sütunlu gösterimi.
+
+    days / slots / scenario_names / participants / boards kategori listeleridir;
+    day_codes, slot_codes, scenario_codes satır başına birer kod,
+    assignments ise satır x sektör boyutlu katılımcı kodu matrisidir
+    (EMPTY = boş hücre). row_lengths, satırların kaynak plandaki uzunluğudur.
+    participants, planı oluştururken verilen listeyle başlar; listede olmayan
+    adlar (ör. sonradan silinmiş katılımcılar) sona eklenir.
+    """
+
+    __slots__ = ("days", "slots", "scenario_names", "participants", "boards",
+                 "day_codes", "slot_codes", "scenario_codes", "assignments", "row_lengths")
+
+    def __init__(self, days, slots, scenario_names, participants, boards,
+                 day_codes, slot_codes, scenario_codes, assignments, row_lengths=None):
+        self.days = days
+        self.slots = slots
+        self.scenario_names = scenario_names
+        self.participants = participants
+        self.boards = boards
+        self.day_codes = day_codes
+        self.slot_codes = slot_codes
+        self.scenario_codes = scenario_codes
+        self.assignments = assignments
+        if row_lengths is None:
+            row_lengths = np.full(len(day_codes), len(boards), dtype=np.int32)
+        self.row_lengths = row_lengths
+
+    @classmethod
+    def from_rows(cls, plan_data, participants, boards, days_of_week=(), timeslots=()):
+        """(gün, zaman, senaryo, [katılımcılar]) satırlarından tablo oluşturur.
+
+        Sektör sayısından kısa satırlar EMPTY ile doldurulur, uzun satırlar kesilir.
+        """
+        if isinstance(plan_data, PlanTable):
+            return plan_data
+        rows = list(plan_data)
+        n_rows = len(rows)
+        n_boards = len(boards)
+
+        days = list(days_of_week)
+        slots = list(timeslots)
+        scenario_names = []
+        participant_cats = list(participants)
+        day_codes = encode_categories([r[0] for r in rows], days)
+        slot_codes = encode_categories([r[1] for r in rows], slots)
+        scenario_codes = encode_categories([r[2] for r in rows], scenario_names)
+
+        row_lengths = np.fromiter((len(r[3]) for r in rows), dtype=np.int32, count=n_rows)
+        p_index = {p: i for i, p in enumerate(participant_cats)}
+        flat = []
+        for (_, _, _, assigned) in rows:
+            for p in assigned[:n_boards]:
+                code = p_index.get(p)
+                if code is None:
+                    code = p_index[p] = len(participant_cats)
+                    participant_cats.append(p)
+                flat.append(code)
+            flat.extend([EMPTY] * (n_boards - len(assigned)))
+        assignments = np.array(flat, dtype=np.int32).reshape(n_rows, n_boards)
+
+        return cls(days, slots, scenario_names, participant_cats, list(boards),
+                   day_codes, slot_codes, scenario_codes, assignments, row_lengths)
+
+    # --- plan_data listesiyle uyumluluk ---
+    def __len__(self):
+        return len(self.day_codes)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def row(self, i):
+        """i. satırı (gün, zaman, senaryo, [katılımcılar]) olarak döndürür; boş hücreler None olur."""
+        participants = self.participants
+        codes = self.assignments[i, :self.row_lengths[i]].tolist()
+        assigned = [participants[c] if c != EMPTY else None for c in codes]
+        return (self.days[self.day_codes[i]], self.slots[self.slot_codes[i]],
+                self.scenario_names[self.scenario_codes[i]], assigned)
+
+    # --- görünümler ve özetler ---
+    def to_frame(self):
+        """Gün / Zaman / Senaryo ve sektör sütunlarından oluşan DataFrame.
+
+        Sütunlar mevcut kod dizileri üzerine kurulan pandas Categorical'lardır;
+        adlar satır başına kopyalanmaz.
+        """
+        columns = {
+            "Gün": pd.Categorical.from_codes(self.day_codes, self.days),
+            "Zaman": pd.Categorical.from_codes(self.slot_codes, self.slots),
+            "Senaryo": pd.Categorical.from_codes(self.scenario_codes, self.scenario_names),
+        }
+        for b_idx, b_name in enumerate(self.boards):
+            columns[b_name] = pd.Categorical.from_codes(self.assignments[:, b_idx], self.participants)
+        return pd.DataFrame(columns)
+
+    def board_counts(self):
+        """Katılımcı x sektör görev sayıları matrisi (tek bir bincount ile)."""
+        n_parts = len(self.participants)
+        n_boards = len(self.boards)
+        mask = self.assignments != EMPTY
+        cells = self.assignments[mask].astype(np.int64) * n_boards + np.nonzero(mask)[1]
+        counts = np.bincount(cells, minlength=n_parts * n_boards)
+        return counts.reshape(n_parts, n_boards)
+
+    def counts_for(self, participants, boards):
+        """Verilen katılımcı ve sektör listeleri için görev sayıları matrisi.
+
+        Tabloda olmayan katılımcı / sektörler için sayılar 0'dır.
+        """
+        counts = self.board_counts()
+        p_index = {p: i for i, p in enumerate(self.participants)}
+        b_index = {b: i for i, b in enumerate(self.boards)}
+        rows = np.array([p_index.get(p, -1) for p in participants], dtype=np.int64)
+        cols = np.array([b_index.get(b, -1) for b in boards], dtype=np.int64)
+        padded = np.zeros((counts.shape[0] + 1, counts.shape[1] + 1), dtype=counts.dtype)
+        padded[:-1, :-1] = counts
+        return padded[rows][:, cols]
+
+    def digest(self):
+        """Tablo içeriği için özet (hash); dizilerin baytları doğrudan hash'lenir."""
+        h = hashlib.blake2b(digest_size=16)
+        for cats in (self.days, self.slots, self.scenario_names, self.participants, self.boards):
+            h.update("\x1f".join(map(str, cats)).encode("utf-8"))
+            h.update(b"\x1e")
+        for arr in (self.day_codes, self.slot_codes, self.scenario_codes, self.assignments, self.row_lengths):
+            h.update(np.ascontiguousarray(arr).tobytes())
+        return h.hexdigest()
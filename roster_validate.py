@@ -0,0 +1,221 @@
+"""Oluşturulan, içe aktarılan veya kayıttan yüklenen planların vektörel doğrulanması.
+
+Tüm denetimler PlanTable'ın kod dizileri üzerinde tek geçişte NumPy ile
+yapılır; Python döngüsü yalnızca zaman aralığı ve dinlenme penceresi
+sayısı kadardır. Sonuç, her ihlalin bir satır olduğu bir DataFrame'dir;
+arayüz bunu doğrudan gösterir.
+"""
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from roster_analytics import presence_matrix
+from roster_constraints import Constraints
+from roster_table import EMPTY, PlanTable
+
+# İhlal türleri
+DUPLICATE = "Satırda tekrar"
+ROW_LENGTH = "Satır uzunluğu"
+EMPTY_CELL = "Boş hücre"
+UNKNOWN_PARTICIPANT = "Bilinmeyen katılımcı"
+UNKNOWN_BOARD = "Bilinmeyen sektör"
+UNAVAILABLE = "Uygun değil"
+DAILY_CAP = "Günlük sınır"
+TOTAL_CAP = "Toplam sınır"
+CONSECUTIVE = "Ardışık sınır"
+REST = "Dinlenme"
+
+REPORT_COLUMNS = ["Tür", "Satır", "Gün", "Zaman", "Senaryo", "Sektör", "Katılımcı", "Ayrıntı"]
+
+
+@dataclass
+class ValidationReport:
+    """Doğrulama sonucu; violations, REPORT_COLUMNS sütunlu ihlal tablosudur.
+
+    Satır, plandaki 1 tabanlı satır numarasıdır; gün düzeyindeki ihlallerde
+    (günlük / toplam sınır, ardışık görev, dinlenme) boştur.
+    """
+    violations: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=REPORT_COLUMNS))
+
+    @property
+    def ok(self):
+        return self.violations.empty
+
+    def counts(self):
+        """{ihlal türü: sayı}; türler ilk görüldükleri sırayla."""
+        return self.violations["Tür"].value_counts(sort=False).to_dict()
+
+    def summary(self):
+        if self.ok:
+            return "Plan geçerli."
+        return ", ".join(f"{kind}: {n}" for kind, n in self.counts().items())
+
+
+def _names(categories, codes):
+    """Kodları adlara çevirir; EMPTY kodlar None olur."""
+    lookup = np.array(list(categories) + [None], dtype=object)
+    codes = np.asarray(codes, dtype=np.int64)
+    return lookup[np.where(codes == EMPTY, len(categories), codes)]
+
+
+def _positions(categories, order):
+    """categories içindeki her değerin order listesindeki sırası; listede olmayanlar sona."""
+    index = {v: i for i, v in enumerate(order)}
+    extra = iter(range(len(order), len(order) + len(categories)))
+    return np.array([index[v] if v in index else next(extra) for v in categories], dtype=np.int64)
+
+
+def _lookup(categories, order):
+    """categories -> order indeksleri; listede olmayanlar -1."""
+    index = {v: i for i, v in enumerate(order)}
+    return np.array([index.get(v, -1) for v in categories], dtype=np.int64)
+
+
+class _Collector:
+    """İhlal sütunlarını tür başına dizi olarak biriktirir; sonunda tek DataFrame'e çevirir."""
+
+    def __init__(self, table):
+        self.table = table
+        self.frames = []
+
+    def cells(self, kind, rows, board_codes, participant_codes, detail=""):
+        if not len(rows):
+            return
+        table = self.table
+        rows = np.asarray(rows, dtype=np.int64)
+        self.frames.append(pd.DataFrame({
+            "Tür": kind,
+            "Satır": rows + 1,
+            "Gün": _names(table.days, table.day_codes[rows]),
+            "Zaman": _names(table.slots, table.slot_codes[rows]),
+            "Senaryo": _names(table.scenario_names, table.scenario_codes[rows]),
+            "Sektör": _names(table.boards, board_codes) if board_codes is not None else None,
+            "Katılımcı": _names(table.participants, participant_codes) if participant_codes is not None else None,
+            "Ayrıntı": detail,
+        }))
+
+    def days(self, kind, day_codes, slot_codes, participant_codes, details):
+        if not len(participant_codes):
+            return
+        table = self.table
+        self.frames.append(pd.DataFrame({
+            "Tür": kind,
+            "Satır": None,
+            "Gün": _names(table.days, day_codes) if day_codes is not None else None,
+            "Zaman": _names(table.slots, slot_codes) if slot_codes is not None else None,
+            "Senaryo": None,
+            "Sektör": None,
+            "Katılımcı": _names(table.participants, participant_codes),
+            "Ayrıntı": details,
+        }))
+
+    def report(self):
+        if not self.frames:
+            return ValidationReport()
+        return ValidationReport(pd.concat(self.frames, ignore_index=True)[REPORT_COLUMNS])
+
+
+def validate_plan(plan_data, participants, boards, days_of_week=(), timeslots=(), constraints=None,
+                  max_total=0, max_consecutive=0) -> ValidationReport:
+    """Planı güncel listelere ve kısıtlara göre denetler; ValidationReport döndürür.
+
+    Denetimler: aynı satırda birden çok sektöre atanan katılımcı, sektör
+    sayısıyla uyuşmayan satırlar, boş hücreler, listede olmayan katılımcı ve
+    sektörler; constraints (roster_constraints.Constraints) verilirse
+    uygunluk, günlük görev sınırı ve dinlenme kuralı; max_total (katılımcı
+    başına toplam görev) ve max_consecutive (aynı gün arka arkaya en fazla
+    zaman aralığı) sınırları (0 = kapalı). Ardışıklık zaman aralıklarının
+    timeslots sırasına göre, aynı zaman aralığındaki birden çok satır tek
+    görev sayılarak denetlenir.
+    """
+    table = PlanTable.from_rows(plan_data, participants, boards, days_of_week, timeslots)
+    # Kaynak satırlardaki None / "" adları da boş hücre sayılır
+    blank = np.array([p is None or p == "" for p in table.participants] + [True], dtype=bool)
+    if blank[:-1].any():
+        table = PlanTable(table.days, table.slots, table.scenario_names, table.participants, table.boards,
+                          table.day_codes, table.slot_codes, table.scenario_codes,
+                          np.where(blank[table.assignments], EMPTY, table.assignments), table.row_lengths)
+    out = _Collector(table)
+    assignments = table.assignments
+    width = assignments.shape[1]
+    filled = assignments != EMPTY
+
+    # Satırda tekrar: sıralanmış satırda eşit komşular (ilk geçiş hariç her tekrar bir ihlal)
+    order = np.argsort(assignments, axis=1, kind="stable")
+    ordered = np.take_along_axis(assignments, order, axis=1)
+    dup_rows, dup_cols = np.nonzero((ordered[:, 1:] == ordered[:, :-1]) & (ordered[:, 1:] != EMPTY))
+    dup_boards = order[dup_rows, dup_cols + 1]
+    out.cells(DUPLICATE, dup_rows, dup_boards, assignments[dup_rows, dup_boards])
+
+    # Satır uzunluğu ve boş hücreler (satır sonundaki dolgu hücreleri boş sayılmaz)
+    bad_rows = np.nonzero(table.row_lengths != len(boards))[0]
+    out.cells(ROW_LENGTH, bad_rows, None, None,
+              [f"{n} hücre, {len(boards)} sektör" for n in table.row_lengths[bad_rows]])
+    in_row = np.arange(width)[None, :] < table.row_lengths[:, None]
+    empty_rows, empty_cols = np.nonzero(~filled & in_row)
+    out.cells(EMPTY_CELL, empty_rows, empty_cols, None)
+
+    # Listede olmayan katılımcı ve sektörler
+    participant_set = set(participants)
+    known = np.array([p in participant_set for p in table.participants] + [True], dtype=bool)
+    unknown_rows, unknown_cols = np.nonzero(filled & ~known[assignments])
+    out.cells(UNKNOWN_PARTICIPANT, unknown_rows, unknown_cols, assignments[unknown_rows, unknown_cols])
+    board_set = set(boards)
+    for b_idx, b_name in enumerate(table.boards):
+        if b_name not in board_set and filled[:, b_idx].any():
+            rows = np.nonzero(filled[:, b_idx])[0][:1]
+            out.cells(UNKNOWN_BOARD, rows, [b_idx], None, f"{int(filled[:, b_idx].sum())} hücre")
+
+    n_parts, n_days = len(table.participants), len(table.days)
+    cell_rows = np.nonzero(filled)[0]
+    cell_parts = assignments[filled].astype(np.int64)
+
+    # Toplam ve günlük görev sayıları
+    if max_total:
+        load = np.bincount(cell_parts, minlength=n_parts)
+        over = np.nonzero(load > max_total)[0]
+        out.days(TOTAL_CAP, None, None, over, [f"{n} görev > {max_total}" for n in load[over]])
+    constraints = constraints if constraints is not None else Constraints()
+    if constraints.max_per_day:
+        per_day = np.bincount(table.day_codes[cell_rows].astype(np.int64) * n_parts + cell_parts,
+                              minlength=n_days * n_parts).reshape(n_days, n_parts)
+        over_days, over_parts = np.nonzero(per_day > constraints.max_per_day)
+        out.days(DAILY_CAP, over_days, None, over_parts,
+                 [f"{n} görev > {constraints.max_per_day}" for n in per_day[over_days, over_parts]])
+
+    # Uygunluk: hücrenin (katılımcı, gün, zaman) kodları kısıt matrisinin eksenlerine çevrilir
+    if constraints.availability is not None and cell_rows.size:
+        p_map = _lookup(table.participants, constraints.participants)[cell_parts]
+        d_map = _lookup(table.days, constraints.days)[table.day_codes[cell_rows]]
+        s_map = _lookup(table.slots, constraints.slots)[table.slot_codes[cell_rows]]
+        mapped = (p_map >= 0) & (d_map >= 0) & (s_map >= 0)
+        blocked = np.zeros(cell_rows.size, dtype=bool)
+        blocked[mapped] = ~constraints.availability[p_map[mapped], d_map[mapped], s_map[mapped]]
+        out.cells(UNAVAILABLE, cell_rows[blocked], np.nonzero(filled)[1][blocked], cell_parts[blocked])
+
+    # Ardışık görev ve dinlenme: gün x zaman x katılımcı görev matrisi, zamanlar timeslots sırasıyla
+    rest = constraints.min_rest_slots
+    if (max_consecutive or rest) and cell_rows.size:
+        slot_order = np.argsort(_positions(table.slots, timeslots), kind="stable")
+        presence = presence_matrix(table)[:, slot_order, :]
+        if max_consecutive:
+            run = np.zeros_like(presence[:, 0, :], dtype=np.int64)
+            hits = []
+            for s in range(presence.shape[1]):
+                run = np.where(presence[:, s, :], run + 1, 0)
+                # Sınır aşıldığı zaman aralığında bir kez bildirilir
+                d_idx, p_idx = np.nonzero(run == max_consecutive + 1)
+                hits.append((d_idx, np.full(len(d_idx), slot_order[s]), p_idx))
+            d_idx, s_idx, p_idx = (np.concatenate(parts) for parts in zip(*hits))
+            out.days(CONSECUTIVE, d_idx, s_idx, p_idx, f"{max_consecutive} zaman aralığından fazla")
+        if rest:
+            hits = []
+            for gap in range(1, min(rest, presence.shape[1] - 1) + 1):
+                d_idx, s_idx, p_idx = np.nonzero(presence[:, gap:, :] & presence[:, :-gap, :])
+                hits.append((d_idx, slot_order[s_idx + gap], p_idx))
+            if hits:
+                d_idx, s_idx, p_idx = (np.concatenate(parts) for parts in zip(*hits))
+                out.days(REST, d_idx, s_idx, p_idx, f"en az {rest} boş zaman aralığı gerekli")
+
+    return out.report()
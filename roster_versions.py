@@ -0,0 +1,247 @@
+"""Plan sürüm geçmişi ve sürümler arası satır / hücre farkı.
+
+Her sürüm, satırlarının demetlerinden (tuple) oluşur. Satırlar geçmiş
+genelinde ortak bir havuzda tutulur (interning): iki sürümde aynı olan
+satır bellekte tek bir nesnedir. Böylece yeniden planlamada değişmeyen
+satırlar kopyalanmaz ve fark hesaplanırken aynı nesneyi gösteren satırlar
+karşılaştırılmadan atlanır; yalnızca değişen satırlar hücre hücre
+(vektörel) karşılaştırılır. Streamlit'e bağlı değildir.
+"""
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_VERSIONS = 20
+
+# Hücre farkı türleri
+CHANGED = "Değişti"
+ADDED = "Eklendi"
+REMOVED = "Silindi"
+
+DIFF_COLUMNS = ["Tür", "Satır", "Gün", "Zaman", "Senaryo", "Sektör", "Önceki", "Yeni"]
+
+# (gün, zaman, senaryo_adı, (sektör sırasına göre katılımcılar))
+VersionRow = Tuple[str, str, str, Tuple[Optional[str], ...]]
+
+
+@dataclass(frozen=True)
+class PlanVersion:
+    """Geçmişteki tek bir plan sürümü; rows havuzdaki ortak satır nesneleridir."""
+    number: int
+    label: str
+    boards: Tuple[str, ...]
+    rows: Tuple[VersionRow, ...]
+    created_at: datetime = field(default_factory=datetime.now)
+
+    def __len__(self):
+        return len(self.rows)
+
+
+class PlanHistory:
+    """Oturumdaki plan sürümleri; en fazla max_versions sürüm tutulur, en eskisi düşer.
+
+    Satır havuzu başvuru sayılarıyla tutulur; düşen sürümlerin yalnızca
+    başka sürümde kullanılmayan satırları havuzdan silinir.
+    """
+
+    def __init__(self, max_versions=DEFAULT_MAX_VERSIONS):
+        self.max_versions = max_versions
+        self.versions: List[PlanVersion] = []
+        self._pool = {}
+        self._refs = Counter()
+        self._next_number = 1
+
+    def __len__(self):
+        return len(self.versions)
+
+    def __iter__(self):
+        return iter(self.versions)
+
+    @property
+    def latest(self) -> Optional[PlanVersion]:
+        return self.versions[-1] if self.versions else None
+
+    def get(self, number) -> Optional[PlanVersion]:
+        for version in self.versions:
+            if version.number == number:
+                return version
+        return None
+
+    @property
+    def stored_rows(self):
+        """Havuzdaki farklı satır sayısı (tüm sürümlerin toplam satır sayısından azdır)."""
+        return len(self._pool)
+
+    def record(self, plan_data, boards, label="") -> PlanVersion:
+        """Planı yeni sürüm olarak ekler; son sürümle aynıysa son sürümü döndürür.
+
+        plan_data, (gün, zaman, senaryo, [katılımcılar]) satırları veya PlanTable olabilir.
+        """
+        pool = self._pool
+        rows = []
+        for (day, slot, sc_name, assigned) in plan_data:
+            row = (day, slot, sc_name, tuple(assigned))
+            rows.append(pool.setdefault(row, row))
+        rows = tuple(rows)
+        boards = tuple(boards)
+
+        latest = self.latest
+        if latest is not None and latest.boards == boards and latest.rows == rows:
+            # Yeni satırlar havuza eklenmiş olabilir; hepsi son sürümde de kullanıldığından başvuruları vardır
+            return latest
+        version = PlanVersion(self._next_number, label, boards, rows)
+        self._next_number += 1
+        self._refs.update(set(rows))
+        self.versions.append(version)
+        while len(self.versions) > self.max_versions:
+            self._release(self.versions.pop(0))
+        return version
+
+    def _release(self, version):
+        for row in set(version.rows):
+            self._refs[row] -= 1
+            if self._refs[row] <= 0:
+                del self._refs[row]
+                self._pool.pop(row, None)
+
+
+@dataclass
+class PlanDiff:
+    """İki sürüm arasındaki fark.
+
+    changes: DIFF_COLUMNS sütunlu hücre farkları; Satır yeni sürümdeki 1
+    tabanlı satır numarasıdır (silinen satırlarda boş). Eklenen / silinen
+    satır ve sektörlerin hücreleri de ayrı ayrı listelenir.
+    cell_mask: yeni sürüm satırları x sektörleri boyutunda, değişen veya
+    yeni eklenen hücrelerde True olan bool matris.
+    """
+    old: PlanVersion
+    new: PlanVersion
+    changes: pd.DataFrame
+    cell_mask: np.ndarray
+    changed_rows: int = 0
+    added_rows: int = 0
+    removed_rows: int = 0
+
+    @property
+    def changed_cells(self):
+        return len(self.changes)
+
+    def summary(self):
+        if self.changes.empty:
+            return "Değişiklik yok."
+        return (f"{self.changed_cells} hücre, {self.changed_rows} satır değişti; "
+                f"{self.added_rows} satır eklendi, {self.removed_rows} satır silindi.")
+
+    def for_participant(self, participant):
+        """Katılımcının kaybettiği (Önceki) veya kazandığı (Yeni) görevler."""
+        changes = self.changes
+        return changes[(changes["Önceki"] == participant) | (changes["Yeni"] == participant)]
+
+
+def _row_keys(rows):
+    """Satır eşleme anahtarları: (gün, zaman, senaryo, aynı üçlünün kaçıncı tekrarı)."""
+    seen = Counter()
+    keys = []
+    for (day, slot, sc_name, _) in rows:
+        label = (day, slot, sc_name)
+        keys.append((day, slot, sc_name, seen[label]))
+        seen[label] += 1
+    return keys
+
+
+def _cells(rows, indices, width):
+    """Seçilen satırların hücreleri, width sütuna None ile tamamlanmış nesne matrisi."""
+    matrix = np.full((len(indices), width + 1), None, dtype=object)
+    for out_idx, row_idx in enumerate(indices):
+        assigned = rows[row_idx][3][:width]
+        matrix[out_idx, :len(assigned)] = assigned
+    return matrix
+
+
+def diff_versions(old: PlanVersion, new: PlanVersion) -> PlanDiff:
+    """İki sürümü satır ve hücre düzeyinde karşılaştırır.
+
+    Satırlar (gün, zaman, senaryo, tekrar sırası) anahtarıyla eşlenir;
+    sektörler adlarıyla eşlenir. Aynı havuz nesnesini paylaşan satırlar
+    karşılaştırılmaz; kalan satır çiftlerinin ortak sektörleri tek bir
+    vektörel karşılaştırmayla denetlenir.
+    """
+    old_index = {key: i for i, key in enumerate(_row_keys(old.rows))}
+    new_keys = _row_keys(new.rows)
+    pairs = [(old_index.pop(key, None), new_idx) for new_idx, key in enumerate(new_keys)]
+    removed = sorted(old_index.values())
+    added = [new_idx for old_idx, new_idx in pairs if old_idx is None]
+    # Sektörler aynıysa aynı havuz nesnesini gösteren satırlar değişmemiştir
+    same_boards = old.boards == new.boards
+    changed = [(old_idx, new_idx) for old_idx, new_idx in pairs
+               if old_idx is not None and (not same_boards or old.rows[old_idx] is not new.rows[new_idx])]
+
+    old_boards = {b: i for i, b in enumerate(old.boards)}
+    new_width, old_width = len(new.boards), len(old.boards)
+    # Yeni sektör sırasına göre eski sütun indeksleri; eski sürümde olmayan sektörler boş sütuna (old_width)
+    column_map = np.array([old_boards.get(b, old_width) for b in new.boards], dtype=np.int64)
+    kept_boards = set(new.boards)
+    dropped_boards = [i for b, i in old_boards.items() if b not in kept_boards]
+
+    frames = []
+    cell_mask = np.zeros((len(new.rows), new_width), dtype=bool)
+
+    def collect(kind, new_rows, row_source, boards, before, after):
+        if len(before):
+            row_source = list(row_source)
+            frames.append(pd.DataFrame({
+                "Tür": kind,
+                "Satır": [None if r is None else r + 1 for r in new_rows],
+                "Gün": [r[0] for r in row_source],
+                "Zaman": [r[1] for r in row_source],
+                "Senaryo": [r[2] for r in row_source],
+                "Sektör": boards,
+                "Önceki": before,
+                "Yeni": after,
+            }))
+
+    if changed:
+        old_idx = [o for o, _ in changed]
+        new_idx = np.array([n for _, n in changed], dtype=np.int64)
+        before_all = _cells(old.rows, old_idx, old_width)
+        before = before_all[:, column_map]
+        after = _cells(new.rows, new_idx, new_width)[:, :new_width]
+        diff_rows, diff_cols = np.nonzero(before != after)
+        cell_mask[new_idx[diff_rows], diff_cols] = True
+        kinds = np.where(column_map[diff_cols] == old_width, ADDED, CHANGED)
+        for kind in (CHANGED, ADDED):
+            hit = kinds == kind
+            rows = new_idx[diff_rows[hit]]
+            collect(kind, rows.tolist(), (new.rows[r] for r in rows),
+                    [new.boards[c] for c in diff_cols[hit]], before[diff_rows[hit], diff_cols[hit]],
+                    after[diff_rows[hit], diff_cols[hit]])
+        # Yeni sürümde olmayan sektörlerdeki eski atamalar
+        if dropped_boards:
+            dropped = before_all[:, dropped_boards]
+            d_rows, d_cols = np.nonzero(dropped != None)  # noqa: E711 (nesne dizisinde eleman bazlı)
+            collect(REMOVED, new_idx[d_rows].tolist(), (new.rows[new_idx[r]] for r in d_rows),
+                    [old.boards[dropped_boards[c]] for c in d_cols], dropped[d_rows, d_cols],
+                    [None] * len(d_rows))
+
+    if added:
+        cells = _cells(new.rows, added, new_width)[:, :new_width]
+        a_rows, a_cols = np.nonzero(cells != None)  # noqa: E711
+        cell_mask[added, :] = True
+        collect(ADDED, [added[r] for r in a_rows], (new.rows[added[r]] for r in a_rows),
+                [new.boards[c] for c in a_cols], [None] * len(a_rows), cells[a_rows, a_cols])
+    if removed:
+        cells = _cells(old.rows, removed, old_width)[:, :old_width]
+        r_rows, r_cols = np.nonzero(cells != None)  # noqa: E711
+        collect(REMOVED, [None] * len(r_rows), (old.rows[removed[r]] for r in r_rows),
+                [old.boards[c] for c in r_cols], cells[r_rows, r_cols], [None] * len(r_rows))
+
+    changes = (pd.concat(frames, ignore_index=True)[DIFF_COLUMNS] if frames
+               else pd.DataFrame(columns=DIFF_COLUMNS))
+    return PlanDiff(old=old, new=new, changes=changes, cell_mask=cell_mask,
+                    changed_rows=int(cell_mask[[n for _, n in changed]].any(axis=1).sum()) if changed else 0,
+                    added_rows=len(added), removed_rows=len(removed))
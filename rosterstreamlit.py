@@ -1,10 +1,52 @@
+import os
+import time
 import streamlit as st
-import openpyxl
-import random
-from openpyxl.styles import PatternFill
+from datetime import date
 from io import BytesIO
+import numpy as np
 import pandas as pd
 
+from roster_engine import (ASSIGNMENT_METHODS, PlanConfig, RosterError, expand_scenarios, partition_plan,
+                           plan_horizon, repair_plan)
+from roster_export import XLSX_MIME, plan_digest, write_horizon_workbook, write_roster_workbook
+from roster_analytics import plan_analytics
+from roster_bundle import ZIP_MIME, write_participant_bundle
+from roster_cache import PlanCache, config_key
+from roster_constraints import Constraints
+from roster_jobs import CANCELLED, FAILED, PlanJob
+from roster_import import IMPORT_KINDS, merge_lists, read_csv, read_workbook
+from roster_profile import Profiler
+from roster_store import RosterStore
+from roster_table import PlanTable
+from roster_validate import validate_plan
+from roster_versions import PlanHistory, diff_versions
+
+# SQLite veritabanı yolu
+ROSTER_DB_PATH = os.environ.get("ROSTER_DB_PATH", "roster.db")
+
+# Oturum başına tutulacak en fazla performans ölçümü
+PROFILER_BUFFER_SIZE = 2000
+
+# Önbellekte tutulacak en fazla Excel dosyası sayısı (en eski kullanılan silinir)
+EXPORT_CACHE_SIZE = 16
+
+# Tüm oturumların paylaştığı plan önbelleğinin boyutu ve (isteğe bağlı) disk dizini
+PLAN_CACHE_SIZE = 64
+PLAN_CACHE_DIR = os.environ.get("ROSTER_PLAN_CACHE_DIR") or None
+
+# Arka plan plan işi: düğmeye basıldığında beklenecek süre, ilerleme yenileme aralığı (sn)
+# ve ilerleme panelinde gösterilecek son satır sayısı
+PLAN_JOB_INLINE_WAIT = 0.5
+PLAN_JOB_POLL_SECONDS = 0.5
+PARTIAL_ROWS_SHOWN = 20
+
+# Oturum başına tutulacak plan sürümü sayısı ve değişen hücrelerin arayüzdeki vurgusu
+PLAN_HISTORY_SIZE = 20
+CHANGED_CELL_CSS = "background-color: #ffd966; font-weight: bold"
+
+# Kısıt yokken kullanılan ayarlar
+DEFAULT_CONSTRAINTS = {"unavailable": [], "max_per_day": 0, "no_double_booking": False, "min_rest_slots": 0}
+
 # -------------------------------------------------------------------------
 # 1) Session State Başlatma
 # -------------------------------------------------------------------------
@@ -47,20 +89,42 @@ def initialize_session_states():
 
     # Mevcut atama yöntemleri
     if "assignment_methods" not in st.session_state:
-        st.session_state.assignment_methods = [
-            "Random",
-            "Round Robin",
-            "Balanced",
-            "Constraint (Latin Square)"
-        ]
+        st.session_state.assignment_methods = list(ASSIGNMENT_METHODS)
 
     # Varsayılan seçili atama yöntemi
     if "selected_method" not in st.session_state:
         st.session_state.selected_method = "Round Robin"
 
-    # Plan verileri
+    # Plan verileri (PlanTable; plan yoksa boş liste)
     if "plan_data" not in st.session_state:
         st.session_state.plan_data = []
+    # Oturumdaki planı üreten yöntem ve adalet hedefi (kayıtta kullanılır)
+    if "plan_source" not in st.session_state:
+        st.session_state.plan_source = {"method": None, "objective": None}
+
+    # Plan sürümleri (değişmeyen satırlar sürümler arasında paylaşılır, bkz. roster_versions)
+    if "plan_history" not in st.session_state:
+        st.session_state.plan_history = PlanHistory(PLAN_HISTORY_SIZE)
+
+    # Oturum başına performans ölçümleri (kayan tampon)
+    if "profiler" not in st.session_state:
+        st.session_state.profiler = Profiler(maxlen=PROFILER_BUFFER_SIZE)
+
+    # Son plandan bu yana yeniden adlandırılan sektörler: {plandaki_ad: güncel_ad}
+    if "board_renames" not in st.session_state:
+        st.session_state.board_renames = {}
+
+    # Oluşturulan planların yöntem karşılaştırma satırları
+    if "method_comparison" not in st.session_state:
+        st.session_state.method_comparison = []
+
+    # Uygunluk ve görev kuralları (bkz. roster_constraints.Constraints.from_dict)
+    if "constraints" not in st.session_state:
+        st.session_state.constraints = dict(DEFAULT_CONSTRAINTS)
+
+    # Bölgelere ayrıştırılmış çözüm için yetkinlikler: {katılımcı: [bölge veya sektör adları]}
+    if "qualifications" not in st.session_state:
+        st.session_state.qualifications = {}
 
 # -------------------------------------------------------------------------
 # 2) Katılımcılar
@@ -96,12 +160,22 @@ def add_board(new_board_name):
     elif new_board_name in st.session_state.boards:
         st.warning("Bu sektör zaten mevcut.")
 
+def record_board_rename(old_name, new_name):
+    """Plandaki sektör adı -> güncel ad eşlemesini tutar (Planı Onar için)."""
+    renames = st.session_state.board_renames
+    for plan_name, current_name in renames.items():
+        if current_name == old_name:
+            renames[plan_name] = new_name
+            return
+    renames[old_name] = new_name
+
 def edit_board(old_name, new_name):
     """Mevcut bir sektörün adını günceller."""
     if old_name in st.session_state.boards:
         if new_name and new_name not in st.session_state.boards:
             idx = st.session_state.boards.index(old_name)
             st.session_state.boards[idx] = new_name
+            record_board_rename(old_name, new_name)
             st.success(f"Sektör '{old_name}' -> '{new_name}' olarak güncellendi.")
         else:
             st.warning("Yeni sektör adı boş veya zaten mevcut.")
@@ -211,144 +285,325 @@ def add_scenario():
     default_t = st.session_state.timeslots[0] if st.session_state.timeslots else "Zaman?"
     st.session_state.scenarios.append([default_s, default_d, default_t, 1])
 
-def remove_scenario(index):
-    """Belirli bir indeksteki senaryoyu siler."""
-    if 0 <= index < len(st.session_state.scenarios):
-        st.session_state.scenarios.pop(index)
+def add_scenarios(count):
+    """Varsayılan değerlerle birden çok senaryo satırı ekler."""
+    for _ in range(count):
+        add_scenario()
+
+def duplicate_scenarios(indices):
+    """Seçilen senaryo satırlarının kopyalarını listenin sonuna ekler."""
+    st.session_state.scenarios.extend(
+        list(st.session_state.scenarios[i]) for i in indices
+        if 0 <= i < len(st.session_state.scenarios)
+    )
+
+def remove_scenarios(indices):
+    """Seçilen senaryo satırlarını tek seferde siler."""
+    selected = set(indices)
+    st.session_state.scenarios = [
+        sc for i, sc in enumerate(st.session_state.scenarios) if i not in selected
+    ]
+
+SCENARIO_COLUMNS = ["Senaryo", "Gün", "Zaman", "Tekrar"]
+
+def refresh_scenario_editor():
+    """Senaryo tablosunu oturumdaki senaryo listesinden yeniden kurar.
+
+    Senaryolar tablo dışında (toplu işlem, içe aktarma vb.) değiştiğinde
+    çağrılmalıdır; tablonun düzenleme geçmişi sıfırlanır.
+    """
+    base = pd.DataFrame([list(sc) for sc in st.session_state.scenarios], columns=SCENARIO_COLUMNS)
+    base.insert(0, "Seç", False)
+    st.session_state.scenario_editor_base = base
+    st.session_state.scenario_editor_version = st.session_state.get("scenario_editor_version", 0) + 1
+
+def scenarios_from_editor(edited):
+    """Düzenlenmiş tablodan [senaryo_adı, gün, zaman, tekrar] listesi üretir; boş hücreleri varsayılanla doldurur."""
+    default_s = st.session_state.standard_scenarios[0] if st.session_state.standard_scenarios else "Senaryo?"
+    default_d = st.session_state.days_of_week[0] if st.session_state.days_of_week else "Gün?"
+    default_t = st.session_state.timeslots[0] if st.session_state.timeslots else "Zaman?"
+    scenarios = []
+    for sc_name, sc_day, sc_slot, sc_rep in edited[SCENARIO_COLUMNS].itertuples(index=False):
+        scenarios.append([
+            sc_name if isinstance(sc_name, str) and sc_name else default_s,
+            sc_day if isinstance(sc_day, str) and sc_day else default_d,
+            sc_slot if isinstance(sc_slot, str) and sc_slot else default_t,
+            int(sc_rep) if pd.notna(sc_rep) else 1,
+        ])
+    return scenarios
+
+def apply_scenario_bulk_action(action, arg):
+    """Toplu ekle / çoğalt / sil butonlarının geri çağrısı; ardından tabloyu yeniden kurar."""
+    action(arg)
+    refresh_scenario_editor()
+
+@st.fragment
+def scenario_editor():
+    """Senaryoları tek bir düzenlenebilir tabloda gösterir.
+
+    Fragment içinde çalıştığı için tablodaki düzenlemeler yalnızca bu bölümü
+    yeniden çalıştırır. Tablo, senaryo listesinin son kurulduğu andaki kopyası
+    (scenario_editor_base) üzerinde çalışır; düzenlemeler her çalıştırmada
+    oturumdaki senaryo listesine yazılır.
+    """
+    st.subheader("Asıl Planlanacak Senaryolar")
+
+    # Seçenek listeleri değişirse tablo anahtarı da değişir; düzenlemeler kaybolmasın diye tabloyu yeniden kur
+    options = (tuple(st.session_state.standard_scenarios), tuple(st.session_state.days_of_week),
+               tuple(st.session_state.timeslots))
+    if st.session_state.get("scenario_editor_options") != options:
+        st.session_state.scenario_editor_options = options
+        refresh_scenario_editor()
+
+    edited = st.data_editor(
+        st.session_state.scenario_editor_base,
+        key=f"scenario_editor_{st.session_state.scenario_editor_version}",
+        num_rows="dynamic",
+        column_config={
+            "Seç": st.column_config.CheckboxColumn("Seç", default=False),
+            "Senaryo": st.column_config.SelectboxColumn("Senaryo Adı", options=list(options[0])),
+            "Gün": st.column_config.SelectboxColumn("Gün", options=list(options[1])),
+            "Zaman": st.column_config.SelectboxColumn("Zaman", options=list(options[2])),
+            "Tekrar": st.column_config.NumberColumn("Tekrar", min_value=1, max_value=20, step=1, default=1),
+        },
+    )
+    st.session_state.scenarios = scenarios_from_editor(edited)
+    selected = [i for i, flag in enumerate(edited["Seç"].tolist()) if flag is True]
+
+    col_add_n, col_add, col_dup, col_del = st.columns([1, 1, 1, 1])
+    with col_add_n:
+        add_count = st.number_input("Eklenecek satır", min_value=1, max_value=500, value=1, step=1,
+                                    key="bulk_add_scenario_count", label_visibility="collapsed")
+    with col_add:
+        st.button("Yeni Senaryo Satırı Ekle", key="add_new_scenario_btn",
+                  on_click=apply_scenario_bulk_action, args=(add_scenarios, int(add_count)))
+    with col_dup:
+        st.button(f"Seçilenleri Çoğalt ({len(selected)})", key="duplicate_scenarios_btn", disabled=not selected,
+                  on_click=apply_scenario_bulk_action, args=(duplicate_scenarios, selected))
+    with col_del:
+        st.button(f"Seçilenleri Sil ({len(selected)})", key="remove_scenarios_btn", disabled=not selected,
+                  on_click=apply_scenario_bulk_action, args=(remove_scenarios, selected))
 
 # -------------------------------------------------------------------------
 # 8) Atama Yöntemleri (Plan Oluşturma)
 # -------------------------------------------------------------------------
-def assign_random(scenario_list, participants, boards):
-    plan_data = []
-    p_copy = participants[:]
-    for (day, slot, sc_name) in scenario_list:
-        random.shuffle(p_copy)
-        assignment = []
-        for b_i in range(len(boards)):
-            assignment.append(p_copy[b_i % len(p_copy)])
-        plan_data.append((day, slot, sc_name, assignment))
-    return plan_data
-
-def assign_round_robin(scenario_list, participants, boards):
-    plan_data = []
-    p_count = len(participants)
-    for s_idx, (day, slot, sc_name) in enumerate(scenario_list):
-        assignment = []
-        for b_i in range(len(boards)):
-            idx = (b_i + s_idx) % p_count
-            assignment.append(participants[idx])
-        plan_data.append((day, slot, sc_name, assignment))
-    return plan_data
-
-def assign_balanced(scenario_list, participants, boards):
-    plan_data = []
-    participant_count = {p: 0 for p in participants}
-    participant_board_count = {(p, b): 0 for p in participants for b in boards}
-
-    for (day, slot, sc_name) in scenario_list:
-        assignment = []
-        for b in boards:
-            best_p = min(participants, key=lambda p: (participant_count[p] + participant_board_count[(p,b)]))
-            assignment.append(best_p)
-            participant_count[best_p] += 1
-            participant_board_count[(best_p, b)] += 1
-        plan_data.append((day, slot, sc_name, assignment))
-    return plan_data
-
-def assign_constraint_latin(scenario_list, participants, boards):
-    n_boards = len(boards)
-    n_parts = len(participants)
-    m_scenario = len(scenario_list)
-
-    # Latin Square yöntemi için, katılımcı sayısı == board sayısı olmalı
-    # ve senaryo sayısı en az board sayısı kadar olmalı
-    if n_boards != n_parts:
-        st.error("Hata: Constraint (Latin Square) için '#participants == #boards' olmalı.")
-        return None
-    if m_scenario < n_boards:
-        st.error("Hata: Constraint (Latin Square) için 'toplam senaryo sayısı >= board sayısı' olmalı.")
-        return None
+def session_plan_config():
+    """Oturumdaki listelerden, seçilen yöntemden ve kısıtlardan PlanConfig oluşturur.
+
+    Listeler kopyalanır: arka plan işi sürerken arayüzde yapılan ekleme /
+    silme işlemleri çalışan işin girdilerini değiştirmez.
+    """
+    constraints = Constraints.from_dict(st.session_state.constraints, st.session_state.participants,
+                                        st.session_state.days_of_week, st.session_state.timeslots)
+    return PlanConfig(
+        participants=list(st.session_state.participants),
+        boards=list(st.session_state.boards),
+        scenarios=[list(sc) for sc in st.session_state.scenarios],
+        days_of_week=list(st.session_state.days_of_week),
+        timeslots=list(st.session_state.timeslots),
+        method=st.session_state.selected_method,
+        improve_seconds=st.session_state.get("improve_seconds", 0.0),
+        seed=st.session_state.get("random_seed"),
+        random_trials=st.session_state.get("random_trials", 1),
+        constraints=None if constraints.is_empty else constraints,
+        decompose=st.session_state.get("decompose_plan", False),
+        qualifications={p: list(names) for p, names in st.session_state.qualifications.items()},
+    )
 
-    plan_data = []
+UNAVAILABLE_COLUMNS = ["Katılımcı", "Gün", "Zaman"]
+
+def constraints_panel():
+    """Uygunluk tablosu ve görev kuralları; değerler oturumdaki constraints sözlüğüne yazılır."""
+    current = st.session_state.constraints
+    # Yapılandırma yüklendiğinde sürüm artar ve alanlar yeni değerlerle yeniden oluşturulur
+    version = st.session_state.get("constraints_editor_version", 0)
+    with st.expander("Kısıtlar (uygunluk ve görev kuralları)"):
+        col_max, col_rest, col_double = st.columns(3)
+        with col_max:
+            max_per_day = st.number_input("Günlük en fazla görev (0 = sınırsız)", min_value=0, max_value=100,
+                                          value=int(current.get("max_per_day", 0)), step=1,
+                                          key=f"constraint_max_per_day_{version}")
+        with col_rest:
+            min_rest = st.number_input("Görevler arası en az boş zaman aralığı", min_value=0, max_value=10,
+                                       value=int(current.get("min_rest_slots", 0)), step=1,
+                                       key=f"constraint_min_rest_{version}")
+        with col_double:
+            no_double = st.checkbox("Aynı senaryoda bir kişiye tek sektör", key=f"constraint_no_double_{version}",
+                                    value=bool(current.get("no_double_booking", False)))
+
+        st.write("Uygun olmayan katılımcılar (Zaman boşsa tüm gün):")
+        base = pd.DataFrame(current.get("unavailable", []), columns=UNAVAILABLE_COLUMNS)
+        edited = st.data_editor(
+            base,
+            num_rows="dynamic",
+            column_config={
+                "Katılımcı": st.column_config.SelectboxColumn(options=st.session_state.participants, required=True),
+                "Gün": st.column_config.SelectboxColumn(options=st.session_state.days_of_week, required=True),
+                "Zaman": st.column_config.SelectboxColumn(options=st.session_state.timeslots),
+            },
+            hide_index=True,
+            key=f"unavailable_editor_{version}",
+        )
+    unavailable = [
+        [p_name, day, slot if isinstance(slot, str) else ""]
+        for p_name, day, slot in edited[UNAVAILABLE_COLUMNS].itertuples(index=False)
+        if isinstance(p_name, str) and isinstance(day, str)
+    ]
+    st.session_state.constraints = {"unavailable": unavailable, "max_per_day": int(max_per_day),
+                                    "no_double_booking": bool(no_double), "min_rest_slots": int(min_rest)}
 
-    # İlk n_boards satır => Latin kare
-    for row in range(n_boards):
-        if row >= m_scenario:
-            break
-        (day, slot, sc_name) = scenario_list[row]
-        assignment = []
-        for col in range(n_boards):
-            part_idx = (row + col) % n_boards
-            assignment.append(participants[part_idx])
-        plan_data.append((day, slot, sc_name, assignment))
-
-    # Kalan senaryolar
-    participant_usage = {p: n_boards for p in participants}
-    for row in range(n_boards, m_scenario):
-        (day, slot, sc_name) = scenario_list[row]
-        available = [p for p in participants if participant_usage[p] < m_scenario]
-        if len(available) < n_boards:
-            st.error(f"Kalan senaryolarda yetersiz katılımcı kaldı (satır={row}).")
-            return None
-        random.shuffle(available)
-        chosen = available[:n_boards]
-        for p in chosen:
-            participant_usage[p] += 1
-        plan_data.append((day, slot, sc_name, chosen))
-    return plan_data
+@st.cache_resource
+def get_plan_cache():
+    """Tüm oturumların paylaştığı, boyutu sınırlı plan önbelleği."""
+    return PlanCache(max_entries=PLAN_CACHE_SIZE, directory=PLAN_CACHE_DIR)
 
 def create_plan():
-    boards = st.session_state.boards
-    participants = st.session_state.participants
-    scenarios = st.session_state.scenarios
-    days_of_week = st.session_state.days_of_week
-    timeslots = st.session_state.timeslots
-
-    if not boards:
-        st.error("En az bir sektör (Board) olmalı.")
-        return
-    if not participants:
-        st.error("En az bir katılımcı olmalı.")
+    """Oturumdaki yapılandırmayla plan oluşturma işini arka planda başlatır.
+
+    Aynı yapılandırma önbellekten gelir. Kısa işler PLAN_JOB_INLINE_WAIT
+    saniye içinde biterse sonuç hemen uygulanır; uzun işlerin ilerlemesi
+    plan_job_panel'de gösterilir. Aynı anda oturum başına tek iş çalışır.
+    """
+    running = st.session_state.get("plan_job")
+    if running is not None and not running.finished:
+        st.info("Süren bir plan işi var; bitmesini bekleyin veya iptal edin.")
         return
-    if not scenarios:
-        st.error("En az bir senaryo satırı olmalı.")
+    job = PlanJob(session_plan_config(), cache=get_plan_cache(), profiler=st.session_state.profiler)
+    st.session_state.plan_job = job.start()
+    if job.wait(PLAN_JOB_INLINE_WAIT):
+        finish_plan_job()
+
+def finish_plan_job():
+    """Biten arka plan işinin sonucunu (veya hatasını) oturuma uygular."""
+    job = st.session_state.pop("plan_job")
+    if job.state == FAILED:
+        st.error(job.error)
+    elif job.state == CANCELLED:
+        st.warning(f"Plan oluşturma iptal edildi ({len(job.partial_rows)} satır tamamlanmıştı).")
+    else:
+        apply_plan_result(job.config, job.result, job.cached)
+
+def apply_plan_result(config, result, cached=False):
+    """Oluşturulan planı oturuma yazar; analiz ve yöntem karşılaştırma satırını ekler."""
+    profiler = st.session_state.profiler
+    with profiler.timer("plan.table"):
+        st.session_state.plan_data = PlanTable.from_rows(
+            result.rows, config.participants, config.boards, config.days_of_week, config.timeslots
+        )
+    st.session_state.plan_source = {"method": result.method, "objective": result.objective}
+    record_plan_version(result.method)
+    st.session_state.board_renames = {}
+    with profiler.timer("plan.analytics"):
+        analytics = plan_analytics(st.session_state.plan_data)
+    st.session_state.method_comparison.append({
+        "Yöntem": result.method,
+        "Adalet hedefi": round(result.objective, 4),
+        "Gini": round(analytics.gini, 4),
+        "Yük varyansı": round(analytics.load_variance, 4),
+        "Ardışık toplam": int(analytics.per_participant["Ardışık"].sum()),
+        "Boşluk toplam": int(analytics.per_participant["Boşluk"].sum()),
+    })
+    seed_info = f", tohum: {result.seed}" if result.seed is not None else ""
+    cache_info = ", önbellekten" if cached else ""
+    st.success(f"Plan oluşturuldu! (Yöntem: {result.method}, adalet hedefi: {result.objective:.3f}"
+               f"{seed_info}{cache_info})")
+
+def record_plan_version(label):
+    """Oturumdaki planı sürüm geçmişine ekler (son sürümle aynıysa yeni sürüm açılmaz)."""
+    plan_data = st.session_state.plan_data
+    if plan_data:
+        with st.session_state.profiler.timer("plan.version"):
+            st.session_state.plan_history.record(plan_data, plan_data.boards, label)
+
+def repair_current_plan():
+    """Mevcut planı güncel katılımcı / sektör / senaryo listelerine göre onarır; diğer atamalar değişmez."""
+    plan_table = PlanTable.from_rows(st.session_state.plan_data, st.session_state.participants,
+                                     st.session_state.boards)
+    scenario_slots = expand_scenarios(st.session_state.scenarios, st.session_state.days_of_week,
+                                      st.session_state.timeslots)
+    try:
+        result = repair_plan(plan_table, st.session_state.participants, st.session_state.boards,
+                             scenario_slots, st.session_state.board_renames,
+                             constraints=session_plan_config().constraints)
+    except RosterError as exc:
+        st.error(str(exc))
         return
 
-    # 1) Tekrarlı senaryoları genişlet
-    expanded_scenarios = []
-    for (sc_name, sc_day, sc_slot, sc_rep) in scenarios:
-        for _ in range(sc_rep):
-            expanded_scenarios.append((sc_day, sc_slot, sc_name))
-
-    # 2) Sıralama
-    def day_key(day_str):
-        return days_of_week.index(day_str) if day_str in days_of_week else 9999
-    def slot_key(slot_str):
-        return timeslots.index(slot_str) if slot_str in timeslots else 9999
-
-    expanded_scenarios.sort(key=lambda x: (day_key(x[0]), slot_key(x[1]), x[2]))
-
-    # 3) Atama
-    method = st.session_state.selected_method
-    if method == "Random":
-        plan_data = assign_random(expanded_scenarios, participants, boards)
-    elif method == "Round Robin":
-        plan_data = assign_round_robin(expanded_scenarios, participants, boards)
-    elif method == "Balanced":
-        plan_data = assign_balanced(expanded_scenarios, participants, boards)
-    elif method == "Constraint (Latin Square)":
-        plan_data = assign_constraint_latin(expanded_scenarios, participants, boards)
-    else:
-        plan_data = assign_random(expanded_scenarios, participants, boards)
+    st.session_state.plan_data = result.table
+    # Onarılan hücreler yöntemin hedefini değiştirir; kayıtlı hedef artık geçerli değildir
+    method = st.session_state.plan_source["method"]
+    st.session_state.plan_source = {"method": f"{method} + Onarım" if method else "Onarım", "objective": None}
+    record_plan_version("Onarım")
+    st.session_state.board_renames = {}
+    st.success(f"Plan onarıldı: {result.repaired_cells} hücre yeniden atandı.")
+
+def create_horizon_plan(weeks):
+    """Art arda weeks haftayı, sayaçları haftadan haftaya devrederek planlar ve Excel'e akıtır.
+
+    Haftalar üretilirken doğrudan çalışma kitabına yazılır; oturumda yalnızca
+    Excel baytları ve haftalık hedefler tutulur.
+    """
+    config = session_plan_config()
+    profiler = st.session_state.profiler
+    weekly = []
+
+    def tracked_weeks():
+        for result in plan_horizon(config, weeks, profiler=profiler):
+            weekly.append({"Hafta": result.week + 1, "Adalet hedefi (kümülatif)": round(result.objective, 4)})
+            yield result
 
-    if plan_data is not None:
-        st.session_state.plan_data = plan_data
-        st.success(f"Plan oluşturuldu! (Yöntem: {method})")
+    excel_data = BytesIO()
+    try:
+        with profiler.timer("horizon.build_export"):
+            write_horizon_workbook(excel_data, tracked_weeks(), config.boards, config.participants)
+    except RosterError as exc:
+        st.error(str(exc))
+        return
+    st.session_state.horizon_export = {"weeks": weekly, "xlsx": excel_data.getvalue()}
+    st.success(f"{weeks} haftalık plan oluşturuldu (yöntem: {config.method}).")
+
+@st.fragment(run_every=PLAN_JOB_POLL_SECONDS)
+def plan_job_panel():
+    """Süren plan işinin ilerlemesi, iptal düğmesi ve şimdiye kadar atanan satırlar.
+
+    Yalnızca bu bölüm periyodik olarak yeniden çizilir; sayfanın geri kalanı
+    kullanılabilir kalır. İş bitince tüm sayfa yeniden çalıştırılır.
+    """
+    job = st.session_state.get("plan_job")
+    if job is None:
+        return
+    if job.finished:
+        st.rerun()
+
+    rows = job.partial_rows
+    st.progress(min(1.0, job.progress), text=f"{job.phase}: {len(rows)} satır, {job.elapsed:.1f} sn")
+    st.button("İptal", key="cancel_plan_job_btn", on_click=job.cancel)
+    if rows:
+        recent = rows[-PARTIAL_ROWS_SHOWN:]
+        st.dataframe(pd.DataFrame([[day, slot, sc_name] + list(assigned)
+                                   for (day, slot, sc_name, assigned) in recent],
+                                  columns=["Gün", "Zaman", "Senaryo"] + list(job.config.boards)))
 
 # -------------------------------------------------------------------------
 # 9) Excel'e Aktarma
 # -------------------------------------------------------------------------
+@st.cache_data(max_entries=EXPORT_CACHE_SIZE, show_spinner=False)
+def excel_bytes(digest, _plan_data, _boards, _participants, _profiler=None, diff_key=None, _diff=None):
+    """Çalışma kitabını bayt olarak üretir; sonuç içerik özeti (digest) ile önbelleğe alınır.
+
+    Alt çizgiyle başlayan parametreler Streamlit tarafından hash'lenmez;
+    önbellek anahtarı digest ve (değişiklikler vurgulanıyorsa) karşılaştırılan
+    önceki sürümün içerik özetidir (diff_key).
+    """
+    excel_data = BytesIO()
+    if _profiler is not None:
+        _profiler.count("export.cache_miss")
+        with _profiler.timer("export.workbook"):
+            write_roster_workbook(excel_data, _plan_data, _boards, _participants, diff=_diff)
+    else:
+        write_roster_workbook(excel_data, _plan_data, _boards, _participants, diff=_diff)
+    return excel_data.getvalue()
+
 def export_to_excel():
     """Plan verilerini Excel olarak indirilebilecek hale getir."""
     plan_data = st.session_state.plan_data
@@ -359,86 +614,334 @@ def export_to_excel():
         st.error("Önce 'Plan Oluştur' butonuna basın.")
         return
 
-    wb = openpyxl.Workbook()
-    ws_plan = wb.active
-    ws_plan.title = "Roster Plan"
-
-    # Başlıklar
-    ws_plan.cell(row=1, column=1).value = "Gün"
-    ws_plan.cell(row=1, column=2).value = "Zaman"
-    ws_plan.cell(row=1, column=3).value = "Senaryo"
-    for i, b_name in enumerate(boards, start=4):
-        ws_plan.cell(row=1, column=i).value = b_name
-
-    color_palette = [
-        "FFB6C1", "87CEFA", "98FB98", "FFA07A", "DDA0DD", "F0E68C",
-        "FFA500", "B0E0E6", "FFD700", "90EE90", "FF69B4", "6495ED"
-    ]
-    participant_color = {}
-    for i, p in enumerate(participants):
-        participant_color[p] = color_palette[i % len(color_palette)]
-
-    row_idx = 2
-    for (day, slot, sc_name, assigned) in plan_data:
-        ws_plan.cell(row=row_idx, column=1).value = day
-        ws_plan.cell(row=row_idx, column=2).value = slot
-        ws_plan.cell(row=row_idx, column=3).value = sc_name
-        for col_idx, p in enumerate(assigned, start=4):
-            ws_plan.cell(row=row_idx, column=col_idx).value = p
-            fill_color = participant_color.get(p, "FFFFFF")
-            fill = PatternFill(start_color=fill_color, end_color=fill_color, fill_type="solid")
-            ws_plan.cell(row=row_idx, column=col_idx).fill = fill
-        row_idx += 1
-
-    # Summary sayfası
-    ws_summary = wb.create_sheet("Summary")
-    ws_summary.cell(row=1, column=1).value = "Katılımcı"
-    for i, b_name in enumerate(boards, start=2):
-        ws_summary.cell(row=1, column=i).value = b_name
-    last_col = len(boards) + 2
-    ws_summary.cell(row=1, column=last_col).value = "Toplam"
-
-    participant_board_counts = {p: {b: 0 for b in boards} for p in participants}
-    for (_, _, _, assigned) in plan_data:
-        for b_idx, p in enumerate(assigned):
-            b_name = boards[b_idx]
-            participant_board_counts[p][b_name] += 1
-
-    row_idx = 2
-    for p in participants:
-        ws_summary.cell(row=row_idx, column=1).value = p
-        fill_color = participant_color.get(p, "FFFFFF")
-        fill = PatternFill(start_color=fill_color, end_color=fill_color, fill_type="solid")
-        ws_summary.cell(row=row_idx, column=1).fill = fill
-
-        total_count = 0
-        for col_idx, b in enumerate(boards, start=2):
-            c = participant_board_counts[p][b]
-            ws_summary.cell(row=row_idx, column=col_idx).value = c
-            total_count += c
-        ws_summary.cell(row=row_idx, column=last_col).value = total_count
-        row_idx += 1
-
-    # Byte olarak kaydet ve download_button ile sun
-    excel_data = BytesIO()
-    wb.save(excel_data)
-    excel_data.seek(0)
+    # Byte olarak kaydet (aynı içerik önbellekten gelir) ve download_button ile sun
+    profiler = st.session_state.profiler
+    with profiler.timer("export.digest"):
+        digest = plan_digest(plan_data, boards, participants)
+    profiler.count("export.requests")
+    diff = current_plan_diff() if st.session_state.get("export_highlight_changes", True) else None
+    if diff is not None and diff.changes.empty:
+        diff = None
+    # Sürüm numaraları oturuma özgüdür; paylaşılan önbellekte anahtar, önceki sürümün içerik özetidir
+    diff_key = plan_digest(diff.old.rows, diff.old.boards, ()) if diff is not None else None
+    excel_data = excel_bytes(digest, plan_data, boards, participants, profiler, diff_key, diff)
 
     st.download_button(
         label="Excel olarak indir",
         data=excel_data,
         file_name="roster_plan.xlsx",
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        mime=XLSX_MIME
+    )
+
+def export_participant_bundle():
+    """Her katılımcı için kişisel program (Excel/CSV + iCalendar) dosyalarını tek zip olarak sunar."""
+    st.write("**Kişisel programlar**")
+    col_start, col_fmt, col_ics = st.columns(3)
+    with col_start:
+        week_start = st.date_input("Hafta başlangıcı (ilk gün)", value=date.today(), key="bundle_week_start")
+    with col_fmt:
+        fmt = st.radio("Biçim", ["xlsx", "csv"], horizontal=True, key="bundle_format")
+    with col_ics:
+        include_ical = st.checkbox("iCalendar (.ics) ekle", value=True, key="bundle_ical")
+
+    # Plan değiştiyse eski paket gösterilmez
+    digest = plan_digest(st.session_state.plan_data, st.session_state.boards, st.session_state.participants)
+    if st.button("Kişisel Programları Hazırla", key="bundle_btn"):
+        bundle = BytesIO()
+        with st.session_state.profiler.timer("export.bundle"):
+            count = write_participant_bundle(
+                bundle, st.session_state.plan_data, st.session_state.boards, st.session_state.participants,
+                week_start, st.session_state.days_of_week, fmt=fmt, include_ical=include_ical)
+        st.session_state.participant_bundle = {"digest": digest, "zip": bundle.getvalue()}
+        st.success(f"{count} katılımcı için dosyalar hazırlandı.")
+
+    prepared = st.session_state.get("participant_bundle")
+    if prepared and prepared["digest"] == digest:
+        st.download_button(
+            label="Kişisel programları zip olarak indir",
+            data=prepared["zip"],
+            file_name="roster_kisisel_programlar.zip",
+            mime=ZIP_MIME,
+            key="download_bundle_btn"
+        )
+
+# -------------------------------------------------------------------------
+# 10) Adalet Analizi
+# -------------------------------------------------------------------------
+def show_analytics_panel(plan_table):
+    """Plan için katılımcı yükü, sektör kapsama, Gini / varyans, ardışık görev ve boşluk analizini gösterir."""
+    analytics = plan_analytics(plan_table)
+
+    col_gini, col_load_var, col_cov_var = st.columns(3)
+    col_gini.metric("Gini (görev yükü)", f"{analytics.gini:.3f}")
+    col_load_var.metric("Yük varyansı", f"{analytics.load_variance:.3f}")
+    col_cov_var.metric("Sektör kapsama varyansı", f"{analytics.coverage_variance:.3f}")
+
+    col_load, col_cov = st.columns([1, 2])
+    with col_load:
+        st.write("**Katılımcı Yükü**")
+        st.dataframe(analytics.per_participant)
+    with col_cov:
+        st.write("**Sektör Kapsama Matrisi**")
+        st.dataframe(analytics.coverage)
+    st.bar_chart(analytics.per_participant["Görev"])
+
+    if st.session_state.method_comparison:
+        st.write("**Yöntem Karşılaştırması**")
+        st.dataframe(pd.DataFrame(st.session_state.method_comparison))
+
+def plan_validation_report(plan_table):
+    """Gösterilen planın doğrulama raporu (bkz. roster_validate.validate_plan).
+
+    Plan, listeler, kısıtlar veya doğrulama sınırları değişmedikçe yeniden
+    hesaplanmaz; böylece plan oluşturma, onarma, içe aktarma ve kayıttan
+    yükleme sonrasındaki ilk çizimde kendiliğinden çalışır.
+    """
+    config = session_plan_config()
+    max_total = st.session_state.get("validation_max_total", 0)
+    max_consecutive = st.session_state.get("validation_max_consecutive", 0)
+    key = (plan_table.digest(), config_key(config), max_total, max_consecutive)
+    cached = st.session_state.get("plan_validation")
+    if cached is not None and cached["key"] == key:
+        return cached["report"]
+    with st.session_state.profiler.timer("plan.validate"):
+        report = validate_plan(plan_table, config.participants, config.boards, config.days_of_week,
+                               config.timeslots, constraints=config.constraints,
+                               max_total=max_total, max_consecutive=max_consecutive)
+    st.session_state.plan_validation = {"key": key, "report": report}
+    return report
+
+def validation_panel(plan_table):
+    """Plan doğrulama özeti, ihlal tablosu ve yalnızca doğrulamada kullanılan sınırlar."""
+    report = plan_validation_report(plan_table)
+    if not report.ok:
+        st.warning(f"Planda {len(report.violations)} ihlal var: {report.summary()}")
+    with st.expander("Plan doğrulama" + (": ihlal yok" if report.ok else "")):
+        col_total, col_consecutive = st.columns(2)
+        col_total.number_input("Katılımcı başına en fazla görev (0 = kapalı)", min_value=0, value=0, step=1,
+                               key="validation_max_total")
+        col_consecutive.number_input("Aynı gün arka arkaya en fazla zaman aralığı (0 = kapalı)", min_value=0,
+                                     value=0, step=1, key="validation_max_consecutive")
+        if not report.ok:
+            st.dataframe(report.violations, hide_index=True)
+
+def version_label(version):
+    return f"v{version.number} {version.label} ({version.created_at:%H:%M:%S})"
+
+def current_plan_diff():
+    """Seçilen eski sürümle son sürüm arasındaki fark; sürümler değişmedikçe yeniden hesaplanmaz.
+
+    Karşılaştırılacak sürüm yoksa None döner.
+    """
+    history = st.session_state.plan_history
+    latest = history.latest
+    base = history.get(st.session_state.get("plan_compare_base"))
+    if latest is None or len(history) < 2:
+        return None
+    if base is None or base is latest:
+        base = history.versions[-2]
+    cached = st.session_state.get("plan_diff")
+    if cached is not None and cached["key"] == (base.number, latest.number):
+        return cached["diff"]
+    with st.session_state.profiler.timer("plan.diff"):
+        diff = diff_versions(base, latest)
+    st.session_state.plan_diff = {"key": (base.number, latest.number), "diff": diff}
+    return diff
+
+def versions_panel(plan_table):
+    """Plan sürümleri: seçilen sürüme göre değişen hücreler vurgulanır, katılımcı bazında süzülebilir."""
+    history = st.session_state.plan_history
+    if len(history) < 2:
+        return
+    with st.expander(f"Plan sürümleri ({len(history)} sürüm, {history.stored_rows} farklı satır)"):
+        older = [v.number for v in history.versions[:-1]][::-1]
+        st.selectbox("Karşılaştırılacak sürüm", older, key="plan_compare_base",
+                     format_func=lambda n: version_label(history.get(n)),
+                     help=f"Son sürüm: {version_label(history.latest)}")
+        diff = current_plan_diff()
+        st.write(diff.summary())
+        if diff.changes.empty:
+            return
+
+        col_only, col_excel = st.columns(2)
+        only_changed = col_only.toggle("Yalnızca değişen satırlar", value=True, key="diff_only_changed")
+        col_excel.toggle("Excel'de değişiklikleri vurgula", value=True, key="export_highlight_changes")
+        mask = diff.cell_mask
+        if mask.shape == (len(plan_table), len(plan_table.boards)):
+            frame = plan_table.to_frame()
+            styles = pd.DataFrame("", index=frame.index, columns=frame.columns)
+            styles[list(plan_table.boards)] = np.where(mask, CHANGED_CELL_CSS, "")
+            if only_changed:
+                keep = mask.any(axis=1)
+                frame, styles = frame[keep], styles[keep]
+            st.dataframe(frame.style.apply(lambda _: styles, axis=None))
+
+        changed_people = sorted(set(diff.changes["Önceki"].dropna()) | set(diff.changes["Yeni"].dropna()))
+        person = st.selectbox("Katılımcının değişen görevleri", ["(Tümü)"] + changed_people,
+                              key="diff_participant")
+        st.dataframe(diff.changes if person == "(Tümü)" else diff.for_participant(person), hide_index=True)
+
+# -------------------------------------------------------------------------
+# 11) Kalıcı Kayıt (SQLite)
+# -------------------------------------------------------------------------
+CONFIG_KEYS = ["participants", "boards", "days_of_week", "timeslots", "standard_scenarios",
+               "scenarios", "selected_method", "constraints", "qualifications"]
+
+@st.cache_resource
+def get_store():
+    """Tüm oturumların paylaştığı SQLite deposu."""
+    return RosterStore(ROSTER_DB_PATH)
+
+def apply_config(config):
+    """Kayıtlı bir yapılandırmayı tek seferde oturuma yükler."""
+    for key in CONFIG_KEYS:
+        if key in config:
+            st.session_state[key] = config[key]
+    refresh_scenario_editor()
+    st.session_state.constraints_editor_version = st.session_state.get("constraints_editor_version", 0) + 1
+
+def store_panel():
+    """Kenar çubuğunda yapılandırma / plan kaydetme, yükleme ve geçmiş sorgusu."""
+    store = get_store()
+    st.sidebar.header("Kayıt")
+
+    config_name = st.sidebar.text_input("Yapılandırma adı", key="store_config_name")
+    if st.sidebar.button("Yapılandırmayı Kaydet", key="store_save_config_btn") and config_name:
+        store.save_config(config_name, {key: st.session_state[key] for key in CONFIG_KEYS})
+        st.sidebar.success(f"'{config_name}' kaydedildi.")
+
+    saved_configs = store.list_configs()
+    if saved_configs:
+        load_name = st.sidebar.selectbox("Kayıtlı yapılandırmalar", saved_configs, key="store_load_config")
+        if st.sidebar.button("Yapılandırmayı Yükle", key="store_load_config_btn"):
+            apply_config(store.load_config(load_name))
+            st.rerun()
+
+    st.sidebar.subheader("Plan Geçmişi")
+    plan_date = st.sidebar.date_input("Plan tarihi (hafta başı)", value=date.today(), key="store_plan_date")
+    if st.session_state.plan_data and st.sidebar.button("Planı Kaydet", key="store_save_plan_btn"):
+        plan_id = store.save_plan(st.session_state.plan_data, st.session_state.participants,
+                                  st.session_state.plan_data.boards, plan_date=plan_date,
+                                  method=st.session_state.plan_source["method"],
+                                  objective=st.session_state.plan_source["objective"],
+                                  config_name=config_name or None)
+        st.sidebar.success(f"Plan #{plan_id} kaydedildi.")
+
+    saved_plans = store.list_plans()
+    if saved_plans:
+        labels = {p["id"]: f"#{p['id']} {p['plan_date']} ({p['method']})" for p in saved_plans}
+        plan_id = st.sidebar.selectbox("Kayıtlı planlar", list(labels), format_func=labels.get,
+                                       key="store_load_plan")
+        if st.sidebar.button("Planı Yükle", key="store_load_plan_btn"):
+            st.session_state.plan_data = store.load_plan(plan_id, st.session_state.days_of_week,
+                                                         st.session_state.timeslots)
+            saved = next(p for p in saved_plans if p["id"] == plan_id)
+            st.session_state.plan_source = {"method": saved["method"], "objective": saved["objective"]}
+            record_plan_version(f"Kayıt #{plan_id}")
+
+    st.sidebar.subheader("Geçmiş Sorgusu")
+    q_participant = st.sidebar.text_input("Katılımcı", key="store_q_participant")
+    q_board = st.sidebar.text_input("Sektör (boş = tümü)", key="store_q_board")
+    q_weeks = st.sidebar.number_input("Son kaç hafta", min_value=1, max_value=520, value=12, key="store_q_weeks")
+    if q_participant:
+        count = store.count_assignments(q_participant, board=q_board or None, weeks=int(q_weeks))
+        where = f" {q_board} sektöründe" if q_board else ""
+        st.sidebar.write(f"{q_participant}, son {int(q_weeks)} haftada{where} **{count}** kez görev aldı.")
+
+def profiling_panel():
+    """Kenar çubuğunda isteğe bağlı performans paneli: aşama süreleri, sayaçlar ve JSON dışa aktarma."""
+    if not st.sidebar.checkbox("Performans paneli", key="show_profiling"):
+        return
+    profiler = st.session_state.profiler
+    st.sidebar.subheader("Performans (ms)")
+    summary = profiler.summary()
+    if summary:
+        st.sidebar.dataframe(pd.DataFrame(summary).set_index("phase"))
+    st.sidebar.write(dict(profiler.counters))
+    st.sidebar.download_button(
+        label="Ölçümleri JSON olarak indir",
+        data=profiler.to_json(),
+        file_name="roster_metrics.json",
+        mime="application/json",
+        key="download_metrics_btn"
     )
+    if st.sidebar.button("Ölçümleri Temizle", key="clear_metrics_btn"):
+        profiler.clear()
+
+# -------------------------------------------------------------------------
+# 12) Toplu İçe Aktarma (Excel / CSV)
+# -------------------------------------------------------------------------
+IMPORT_KIND_LABELS = {
+    "participants": "Katılımcılar",
+    "boards": "Sektörler",
+    "days_of_week": "Günler",
+    "timeslots": "Zaman Aralıkları",
+    "standard_scenarios": "Standart Senaryolar",
+    "scenarios": "Senaryolar",
+}
+
+def run_import():
+    """Yüklenen dosyayı okur; hata yoksa tüm listeleri oturuma tek seferde uygular (on_click)."""
+    uploaded = st.session_state.get("import_file")
+    if uploaded is None:
+        return
+    profiler = st.session_state.profiler
+    with profiler.timer("import.read"):
+        if uploaded.name.lower().endswith(".csv"):
+            result = read_csv(uploaded, st.session_state.import_kind)
+        else:
+            result = read_workbook(uploaded)
+    current = {key: st.session_state[key] for key in IMPORT_KINDS}
+    merged = merge_lists(current, result, replace=st.session_state.import_mode == "Değiştir")
+    profiler.count("import.rows", result.row_count)
+
+    if not result.errors:
+        for key, values in merged.items():
+            st.session_state[key] = values
+        if "scenarios" in merged:
+            refresh_scenario_editor()
+    st.session_state.import_messages = {
+        "errors": result.errors,
+        "warnings": result.warnings,
+        "summary": {IMPORT_KIND_LABELS[k]: len(v) for k, v in result.data.items()},
+    }
+
+def import_panel():
+    """Kenar çubuğunda Excel / CSV'den toplu içe aktarma."""
+    st.sidebar.header("Toplu İçe Aktarma")
+    uploaded = st.sidebar.file_uploader("Excel veya CSV dosyası", type=["xlsx", "csv"], key="import_file")
+    if uploaded is not None and uploaded.name.lower().endswith(".csv"):
+        st.sidebar.selectbox("CSV içeriği", list(IMPORT_KIND_LABELS), format_func=IMPORT_KIND_LABELS.get,
+                             key="import_kind")
+    st.sidebar.radio("Mevcut listeler", ["Ekle", "Değiştir"], horizontal=True, key="import_mode")
+    st.sidebar.button("İçe Aktar", key="import_btn", on_click=run_import, disabled=uploaded is None)
+
+    messages = st.session_state.pop("import_messages", None)
+    if messages is None:
+        return
+    for error in messages["errors"][:20]:
+        st.sidebar.error(error)
+    if len(messages["errors"]) > 20:
+        st.sidebar.error(f"... ve {len(messages['errors']) - 20} hata daha.")
+    if messages["errors"]:
+        st.sidebar.error("Hatalar nedeniyle hiçbir değişiklik uygulanmadı.")
+    else:
+        for warning in messages["warnings"][:20]:
+            st.sidebar.warning(warning)
+        summary = ", ".join(f"{label}: {n}" for label, n in messages["summary"].items())
+        st.sidebar.success(f"İçe aktarıldı ({summary}).")
 
 # -------------------------------------------------------------------------
-# 10) Ana Uygulama (main)
+# 13) Ana Uygulama (main)
 # -------------------------------------------------------------------------
 def main():
     st.set_page_config(layout="wide")
     st.title("Roster Planlama")
 
     initialize_session_states()
+    profiler = st.session_state.profiler
+    render_start = time.perf_counter()
+    profiler.reset_lap()
 
     # Üst kısım: katılımcılar, sektörler, günler, zaman aralıkları, standart senaryolar
     col_part, col_board, col_day, col_time, col_std_s = st.columns(5)
@@ -577,54 +1080,12 @@ def main():
             if st.button("Standart Senaryoyu Sil", key="remove_std_scenario_btn"):
                 remove_standard_scenario(remove_std_scen_selected)
 
+    profiler.lap("render.config_columns")
+
     # ------------------ Asıl Planlanacak Senaryolar ------------------
     st.write("---")
-    st.subheader("Asıl Planlanacak Senaryolar")
-    scenarios_copy = st.session_state.scenarios.copy()
-    for idx, scenario in enumerate(scenarios_copy):
-        col_sc1, col_sc2, col_sc3, col_sc4, col_sc5 = st.columns([2,1,1,1,0.5])
-        sc_name, sc_day, sc_slot, sc_rep = scenario
-
-        with col_sc1:
-            new_sc_name = st.selectbox(
-                f"Senaryo Adı [{idx}]",
-                options=st.session_state.standard_scenarios or ["Senaryo?"],
-                index=(st.session_state.standard_scenarios.index(sc_name)
-                       if sc_name in st.session_state.standard_scenarios else 0),
-                key=f"sc_name_{idx}"
-            )
-        with col_sc2:
-            new_day = st.selectbox(
-                f"Gün [{idx}]",
-                options=st.session_state.days_of_week or ["Gün?"],
-                index=(st.session_state.days_of_week.index(sc_day)
-                       if sc_day in st.session_state.days_of_week else 0),
-                key=f"sc_day_{idx}"
-            )
-        with col_sc3:
-            new_slot = st.selectbox(
-                f"Zaman [{idx}]",
-                options=st.session_state.timeslots or ["Zaman?"],
-                index=(st.session_state.timeslots.index(sc_slot)
-                       if sc_slot in st.session_state.timeslots else 0),
-                key=f"sc_slot_{idx}"
-            )
-        with col_sc4:
-            new_rep = st.number_input(
-                f"Tekrar [{idx}]",
-                min_value=1, max_value=20, value=sc_rep, step=1,
-                key=f"sc_rep_{idx}"
-            )
-        with col_sc5:
-            if st.button(f"Sil [{idx}]", key=f"remove_scenario_{idx}"):
-                remove_scenario(idx)
-
-        # Listeyi güncelle
-        if idx < len(st.session_state.scenarios):
-            st.session_state.scenarios[idx] = [new_sc_name, new_day, new_slot, new_rep]
-
-    if st.button("Yeni Senaryo Satırı Ekle", key="add_new_scenario_btn"):
-        add_scenario()
+    scenario_editor()
+    profiler.lap("render.scenarios")
 
     # ------------------ Atama Yöntemi Seçimi & Plan Oluşturma ------------------
     st.write("---")
@@ -636,28 +1097,98 @@ def main():
         if st.session_state.selected_method in st.session_state.assignment_methods else 0,
         key="assignment_method_selectbox"
     )
+    if st.session_state.selected_method == "Random":
+        rand_col1, rand_col2 = st.columns(2)
+        with rand_col1:
+            st.number_input("Deneme sayısı (en iyisi seçilir)", min_value=1, max_value=10000,
+                            value=1, step=1, key="random_trials")
+        with rand_col2:
+            st.number_input("Başlangıç tohumu (seed)", min_value=0, value=0, step=1, key="random_seed")
+    st.number_input(
+        "Yerel arama ile iyileştirme süresi (sn, 0 = kapalı)",
+        min_value=0.0, max_value=60.0, value=0.0, step=1.0,
+        key="improve_seconds"
+    )
+    if st.checkbox("Sektörleri bölgelere ayırıp paralel çöz", key="decompose_plan",
+                   help="Sektörler öneklerine göre (SW*, SE*, ...) bölgelere ayrılır; her bölge kendi "
+                        "katılımcılarıyla ayrı bir süreçte planlanır."):
+        try:
+            partitions = partition_plan(st.session_state.participants, st.session_state.boards,
+                                        st.session_state.qualifications)
+        except RosterError as exc:
+            st.warning(str(exc))
+        else:
+            st.caption(" · ".join(f"{part.name}: {len(part.board_indices)} sektör, "
+                                  f"{len(part.participant_indices)} katılımcı" for part in partitions))
+
+    constraints_panel()
+
+    col_create, col_repair = st.columns([1, 1])
+    job = st.session_state.get("plan_job")
+    if job is not None and job.finished:
+        finish_plan_job()
+        job = None
+    with col_create:
+        if st.button("Plan Oluştur", key="create_plan_btn", disabled=job is not None):
+            create_plan()
+    with col_repair:
+        if st.button("Planı Onar", key="repair_plan_btn", disabled=not st.session_state.plan_data,
+                     help="Yalnızca silinen katılımcı / sektörlerden ve değişen senaryo satırlarından "
+                          "etkilenen hücreleri yeniden atar."):
+            repair_current_plan()
+    if st.session_state.get("plan_job") is not None:
+        plan_job_panel()
+
+    with st.expander("Çok haftalık plan (sayaçlar haftadan haftaya devreder)"):
+        horizon_weeks = st.number_input("Hafta sayısı", min_value=1, max_value=104, value=4, step=1,
+                                        key="horizon_weeks")
+        if st.button("Çok Haftalık Plan Oluştur", key="create_horizon_btn"):
+            create_horizon_plan(int(horizon_weeks))
+        horizon = st.session_state.get("horizon_export")
+        if horizon:
+            st.dataframe(pd.DataFrame(horizon["weeks"]).set_index("Hafta"))
+            st.download_button(
+                label="Çok haftalık planı Excel olarak indir",
+                data=horizon["xlsx"],
+                file_name="roster_horizon.xlsx",
+                mime=XLSX_MIME,
+                key="download_horizon_btn"
+            )
 
-    if st.button("Plan Oluştur", key="create_plan_btn"):
-        create_plan()
+    profiler.lap("render.method_and_actions")
 
     # Eğer plan oluşturulmuşsa, tabloyu göster
     if st.session_state.plan_data:
         st.write("**Oluşturulan Plan**")
-        df_data = []
-        columns = ["Gün", "Zaman", "Senaryo"]
-        columns.extend(st.session_state.boards)
-
-        for (day, slot, sc_name, assigned) in st.session_state.plan_data:
-            df_data.append([day, slot, sc_name] + assigned)
-
-        df = pd.DataFrame(df_data, columns=columns)
-        st.dataframe(df)
+        with profiler.timer("render.dataframe_build"):
+            plan_table = PlanTable.from_rows(st.session_state.plan_data, st.session_state.participants,
+                                             st.session_state.boards)
+            plan_frame = plan_table.to_frame()
+        with profiler.timer("render.st_dataframe"):
+            st.dataframe(plan_frame)
+        validation_panel(plan_table)
+        versions_panel(plan_table)
+
+        if st.toggle("Adalet analizini göster", key="show_analytics"):
+            with profiler.timer("render.analytics"):
+                show_analytics_panel(plan_table)
 
         st.write("Planı Excel formatında indirmek için butona tıklayabilirsiniz:")
-        export_to_excel()
+        with profiler.timer("render.export"):
+            export_to_excel()
+            export_participant_bundle()
+        profiler.reset_lap()
+
+    # Kenar çubuğu: plan oluşturulduktan sonra çizilir ki "Planı Kaydet" hemen görünsün
+    store_panel()
+    import_panel()
+    profiler.lap("render.sidebar")
+    profiler.record("render.total", (time.perf_counter() - render_start) * 1000.0)
+    profiler.count("render.reruns")
+    profiling_panel()
 
 # -------------------------------------------------------------------------
-# 11) Çalıştırma
+# 14) Çalıştırma
 # -------------------------------------------------------------------------
 if __name__ == "__main__":
     main()
\ No newline at end of file